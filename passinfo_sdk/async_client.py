@@ -0,0 +1,400 @@
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from .client import DEFAULT_COMPRESSION_LEVEL, DEFAULT_COMPRESSION_THRESHOLD, _gzip
+from .codec import get_codec
+from .exceptions import PassInfoAPIError, RateLimitError
+from .ratelimit import endpoint_family
+from .retry import RetryPolicy, parse_retry_after
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+class AsyncPassInfoSDKClient:
+    """An asyncio client for interacting with the PassInfo API to send messages.
+
+    This class mirrors ``PassInfoSDKClient`` method for method, with the same
+    arguments, validation rules and return values, but every API call is a
+    coroutine. It lets a single event loop keep thousands of sends in flight
+    without tying up a thread per request.
+
+    All requests share one ``aiohttp`` connection pool. The number of requests
+    in flight at the same time is bounded by ``max_concurrency``; additional
+    calls wait for a free slot instead of opening more connections.
+
+    The async client requires the optional ``aiohttp`` dependency, installed
+    with ``pip install passinfo_sdk[async]``.
+
+    Attributes:
+        api_key (str): The API key for authentication with PassInfo API.
+        client_id (str): Your unique client identifier for the PassInfo platform.
+        base_url (str): The base URL for the PassInfo API endpoints.
+        max_concurrency (int): The maximum number of requests in flight at once.
+
+    Example:
+        >>> async def main():
+        ...     async with AsyncPassInfoSDKClient(
+        ...         api_key="your-api-key",
+        ...         client_id="your-client-id"
+        ...     ) as client:
+        ...         responses = await asyncio.gather(*[
+        ...             client.send_message("Hello!", contact, "MyApp")
+        ...             for contact in ["1234567890", "0987654321"]
+        ...         ])
+        >>> asyncio.run(main())
+    """
+
+    def __init__(self, api_key, client_id, base_url="https://api.passinfo.net",
+                 max_connections=DEFAULT_MAX_CONNECTIONS, max_connections_per_host=0,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, keep_alive=True, timeout=None,
+                 retry_policy=None, circuit_breaker=None, rate_limiter=None, codec=None,
+                 compression=True, compression_threshold=DEFAULT_COMPRESSION_THRESHOLD,
+                 compression_level=DEFAULT_COMPRESSION_LEVEL):
+        """Initialize a new asynchronous PassInfo SDK client instance.
+
+        Args:
+            api_key (str): The API key used for authentication with the PassInfo API.
+            client_id (str): Your unique client identifier provided by PassInfo.
+            base_url (str, optional): The base URL for the PassInfo API endpoints.
+                Defaults to "https://api.passinfo.net".
+            max_connections (int, optional): The total size of the connection pool.
+                Defaults to 100.
+            max_connections_per_host (int, optional): The maximum number of
+                connections to a single host. 0 means no per-host limit beyond
+                ``max_connections``. Defaults to 0.
+            max_concurrency (int, optional): The maximum number of requests in
+                flight at the same time. Defaults to 100.
+            keep_alive (bool, optional): Whether connections are kept open between
+                requests. Defaults to True.
+            timeout (float, optional): Total timeout in seconds for each request.
+                Defaults to None (no timeout).
+            retry_policy (RetryPolicy, optional): Controls how transient failures
+                are retried. Defaults to ``RetryPolicy()``.
+            circuit_breaker (CircuitBreaker, optional): A breaker that makes requests
+                fail fast while the API is degraded. Defaults to None (disabled).
+            rate_limiter (RateLimiter, optional): A client-side rate limiter applied
+                to every request. Waiting for a token never blocks the event loop.
+                Defaults to None.
+            codec (str or JSONCodec, optional): The JSON library used to encode
+                request bodies and decode responses. Defaults to the fastest
+                one installed.
+            compression (bool, optional): Gzip large request bodies and accept
+                compressed responses, falling back to uncompressed bodies if
+                the API answers 415. See ``PassInfoSDKClient``. Defaults to True.
+            compression_threshold (int, optional): The smallest request body, in
+                bytes, that is compressed. Defaults to 8192.
+            compression_level (int, optional): The gzip level, from 1 (fastest)
+                to 9 (smallest). Defaults to 6.
+
+        Raises:
+            ImportError: If ``aiohttp`` is not installed.
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncPassInfoSDKClient requires aiohttp. "
+                "Install it with: pip install passinfo_sdk[async]"
+            )
+        self.api_key = api_key
+        self.base_url = base_url
+        self.client_id = client_id
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.max_concurrency = max_concurrency
+        self.keep_alive = keep_alive
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.codec = get_codec(codec)
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+        self._compress_requests = compression
+        self._session = None
+        self._semaphore = None
+        self._headers = None
+        self._headers_key = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the shared connection pool.
+
+        The client can still be used after ``close()``; a new pool is opened on
+        the next request.
+        """
+        # The semaphore is left in place for requests still in flight; it is
+        # only replaced when the next session is opened.
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+
+    def _get_session(self):
+        # Created lazily so that the pool is bound to the running event loop.
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                force_close=not self.keep_alive,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=None if self.compression else {"Accept-Encoding": "identity"},
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _auth_headers(self):
+        key = (self.api_key, self.client_id)
+        if self._headers_key != key:
+            self._headers = {
+                "Api-Key": str(self.api_key),
+                "Client-Id": str(self.client_id),
+                "Content-Type": 'application/json',
+                "Accept": 'application/json'
+            }
+            self._headers_key = key
+        return self._headers
+
+    async def _make_request(self, method, endpoint, params=None, data=None, headers=None):
+        """Makes an HTTP request to the PassInfo API endpoint.
+
+        This is the asynchronous counterpart of ``PassInfoSDKClient._make_request``
+        and accepts the same arguments. The call waits for a free concurrency slot
+        before the request is sent.
+
+        Transient failures are retried according to ``retry_policy``, and the
+        request is refused up front while ``circuit_breaker`` is open. Bodies
+        are encoded and decoded with ``codec``, and large bodies are compressed
+        as described for ``compression``.
+
+        Raises:
+            PassInfoAPIError: Raised when the API request fails for any reason,
+                including a response body that is empty or not valid JSON.
+            CircuitOpenError: Raised without contacting the API while the circuit
+                breaker is open.
+
+        Returns:
+            dict: The parsed JSON response from the API.
+        """
+        # Taken together, so that a concurrent close() cannot leave this
+        # request without its concurrency slot.
+        session = self._get_session()
+        semaphore = self._semaphore
+        url = f"{self.base_url}/{endpoint}"
+
+        if data is not None and not isinstance(data, bytes):
+            data = self.codec.dumps(data)
+        body = data
+        if body is not None and self._compress_requests and len(body) >= self.compression_threshold:
+            compressed = _gzip(body, self.compression_level)
+            if len(compressed) < len(body):
+                body = compressed
+        if body is not data:
+            headers = {**(headers or {}), "Content-Encoding": "gzip"}
+
+        policy = self.retry_policy
+        breaker = self.circuit_breaker
+        attempt = 0
+
+        while True:
+            if self.rate_limiter is not None:
+                await self._acquire_rate_limit(endpoint)
+            if session.closed:
+                raise PassInfoAPIError(status_code=500, message="API request failed: the client was closed")
+            if breaker is not None:
+                breaker.before_request()
+            delay = None
+            content = None
+            refused_gzip = False
+            async with semaphore:
+                try:
+                    async with session.request(
+                        method=method,
+                        url=url,
+                        headers={**self._auth_headers(), **headers} if headers else self._auth_headers(),
+                        params=params,
+                        data=body,
+                    ) as response:
+                        status_code = response.status
+                        if breaker is not None:
+                            if status_code >= 500:
+                                breaker.record_failure()
+                            else:
+                                breaker.record_success()
+                        if status_code == 415 and body is not data:
+                            refused_gzip = True
+                        elif status_code not in policy.retry_statuses:
+                            content = await response.read()
+                        elif policy.should_retry(attempt, method, endpoint, status_code=status_code):
+                            delay = policy.backoff(attempt, parse_retry_after(response.headers.get('Retry-After')))
+                        if content is None and delay is None and not refused_gzip:
+                            raise PassInfoAPIError(
+                                status_code=status_code,
+                                message=f"API request failed with status {status_code}"
+                            )
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if breaker is not None:
+                        breaker.record_failure()
+                    connect_error = isinstance(e, aiohttp.ClientConnectorError)
+                    if policy.should_retry(attempt, method, endpoint, error=e, connect_error=connect_error):
+                        delay = policy.backoff(attempt)
+                    if delay is None:
+                        raise PassInfoAPIError(
+                            status_code=getattr(e, 'status', 500),
+                            message=f"API request failed: {str(e)}"
+                        )
+            if refused_gzip:
+                # The API does not accept compressed bodies: stop compressing.
+                self._compress_requests = False
+                body = data
+                headers = {key: value for key, value in headers.items() if key != "Content-Encoding"} or None
+                continue
+            if content is not None:
+                # A body that doesn't decode is a bad response, not a transport error.
+                try:
+                    return self.codec.loads(content)
+                except ValueError as e:
+                    raise PassInfoAPIError(
+                        status_code=status_code if status_code >= 400 else 500,
+                        message=f"API request failed: {str(e)}"
+                    )
+            # Back off outside the semaphore so waiting retries don't hold a slot.
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _acquire_rate_limit(self, endpoint):
+        limiter = self.rate_limiter
+        deadline = None if limiter.timeout is None else asyncio.get_running_loop().time() + limiter.timeout
+        while True:
+            wait = limiter.reserve(endpoint)
+            if wait == 0:
+                return
+            if not limiter.blocking or (deadline is not None and asyncio.get_running_loop().time() + wait > deadline):
+                raise RateLimitError(family=endpoint_family(endpoint), retry_after=wait)
+            await asyncio.sleep(wait)
+
+    async def send_message(self, message, contact, sender_name):
+        """Send a single message to a specific contact.
+
+        See ``PassInfoSDKClient.send_message`` for details on arguments, errors
+        and the returned response.
+        """
+        if message is None:
+            raise PassInfoAPIError(status_code=400, message="Message is required.")
+        elif contact is None:
+            raise PassInfoAPIError(status_code=400, message="Contact is required.")
+        elif sender_name is None:
+            raise PassInfoAPIError(status_code=400, message="Sender name is required.")
+
+        data = dict(
+            message=message,
+            contact=contact,
+            senderName=sender_name,
+        )
+        return await self._make_request(method='POST', endpoint='v1/message/single_message', data=data)
+
+    async def send_message_bulk(self, message, sender_name, contacts):
+        """Send a message to multiple contacts in a single API call.
+
+        See ``PassInfoSDKClient.send_message_bulk`` for details on arguments,
+        errors and the returned response.
+        """
+        if message is None:
+            raise PassInfoAPIError(status_code=400, message="Message is required.")
+        elif contacts is None or len(contacts) == 0:
+            raise PassInfoAPIError(status_code=400, message="Contacts are required.")
+        elif sender_name is None:
+            raise PassInfoAPIError(status_code=400, message="Sender name is required.")
+
+        data = dict(
+            message=message,
+            contacts=contacts,
+            senderName=sender_name,
+        )
+        return await self._make_request(method='POST', endpoint='v1/message/send_bulk_contacts_messages', data=data)
+
+    async def send_message_group(self, message, sender_name, group_id):
+        """Send a message to a predefined group of contacts.
+
+        See ``PassInfoSDKClient.send_message_group`` for details on arguments,
+        errors and the returned response.
+        """
+        if message is None:
+            raise PassInfoAPIError(status_code=400, message="Message is required.")
+        elif sender_name is None:
+            raise PassInfoAPIError(status_code=400, message="Sender name is required.")
+        elif group_id is None:
+            raise PassInfoAPIError(status_code=400, message="Group ID is required.")
+
+        data = dict(
+            message=message,
+            senderName=sender_name,
+        )
+        return await self._make_request(method='POST', endpoint=f'v1/message/send_message_to_group/{group_id}', data=data)
+
+    async def get_message_status(self, message_id):
+        """Retrieve the status of a previously sent message.
+
+        See ``PassInfoSDKClient.get_message_status`` for details on arguments,
+        errors and the returned response.
+        """
+        if message_id is None:
+            raise PassInfoAPIError(status_code=400, message="Message ID is required.")
+
+        return await self._make_request(method='GET', endpoint=f'v1/message/get_single_status/{message_id}')
+
+    async def get_message_status_bulk(self, batch_id):
+        """Retrieve the status of multiple messages sent in a single batch.
+
+        See ``PassInfoSDKClient.get_message_status_bulk`` for details on
+        arguments, errors and the returned response.
+        """
+        if batch_id is None:
+            raise PassInfoAPIError(status_code=400, message="Batch ID is required.")
+
+        return await self._make_request(method='GET', endpoint=f'v1/message/get_bulk_status/{batch_id}')
+
+    async def get_sms_count(self) -> int:
+        """Get the remaining SMS credit balance for the account.
+
+        Returns:
+            int: The number of SMS credits remaining in the account. Returns 0 if
+                the request fails or if there are no credits available.
+        """
+        try:
+            response = await self._make_request(
+                method='GET',
+                endpoint='v1/user/get_solde'
+            )
+            return response.get('solde', 0)
+        except Exception:
+            return 0
+
+    async def renew_api_key(self):
+        """Generate a new API key for the account.
+
+        See ``PassInfoSDKClient.renew_api_key`` for details.
+
+        Returns:
+            dict: The API response containing the newly generated API key, or an
+                empty string if the request fails.
+        """
+        try:
+            response = await self._make_request(
+                method='POST',
+                endpoint='v1/user/renew_api_key'
+            )
+            return response
+        except Exception:
+            return ''
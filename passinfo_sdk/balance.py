@@ -0,0 +1,200 @@
+import threading
+import time
+
+from .exceptions import BalanceUnknownError, PassInfoAPIError
+
+DEFAULT_MAX_AGE = 60.0
+
+
+class BalanceTracker:
+    """A cached SMS credit balance, decremented locally as sends are accepted.
+
+    The tracker reads the balance from the API once, then subtracts the cost
+    of every send accepted through the client (computed from the segment count
+    of the message and the client's ``credits_per_segment``), so balance checks
+    before each batch do not cost a request. The server value is read again:
+
+    - when the cached value is older than ``max_age`` seconds, on the next read;
+    - in the background, once the credits spent locally since the last read
+      reach ``max_drift``, since local accounting drifts from the server's
+      (different tariffs, sends made by other clients...);
+    - every ``refresh_interval`` seconds while ``start()`` is running;
+    - after ``invalidate()``, e.g. after a group send of unknown size.
+
+    When the balance cannot be read, ``balance`` raises ``BalanceUnknownError``
+    instead of returning 0, so an empty account and an unreachable API can be
+    told apart. The tracker is thread-safe.
+
+    Attributes:
+        client (PassInfoSDKClient): The client used to read the balance. Set
+            automatically when the tracker is passed to a client.
+        max_age (float): The seconds a server value is trusted, or None to
+            trust it until the next resync.
+        max_drift (float): The credits spent locally that trigger a background
+            resync, or None.
+        refresh_interval (float): The period of the background refresh started
+            by ``start()``, or None.
+        synced_at (float): When the balance was last read from the API
+            (``time.monotonic()``), or None.
+        spent (float): The credits subtracted locally since that read.
+        refreshes (int): The number of times the balance was read from the API.
+
+    Example:
+        >>> tracker = BalanceTracker(max_age=300, max_drift=5000)
+        >>> client = PassInfoSDKClient('api_key', 'client_id', balance_tracker=tracker,
+        ...                            balance_check='refuse')
+        >>> client.get_balance()          # one request
+        12500
+        >>> client.send_message_bulk('Hello!', 'MyApp', contacts)   # no balance request
+        >>> tracker.balance
+        11500
+    """
+
+    def __init__(self, client=None, max_age=DEFAULT_MAX_AGE, max_drift=None, refresh_interval=None):
+        """Initialize a new BalanceTracker.
+
+        Args:
+            client (PassInfoSDKClient, optional): The client used to read the
+                balance. Defaults to the client the tracker is passed to.
+            max_age (float, optional): The seconds a server value is trusted.
+                Defaults to 60.
+            max_drift (float, optional): The credits spent locally that trigger
+                a background resync. Defaults to None (no drift resync).
+            refresh_interval (float, optional): The period of the background
+                refresh thread started by ``start()``. Defaults to ``max_age``.
+        """
+        self.client = client
+        self.max_age = max_age
+        self.max_drift = max_drift
+        self.refresh_interval = refresh_interval
+        self.synced_at = None
+        self.spent = 0
+        self.refreshes = 0
+        self._value = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._resyncing = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def known(self):
+        """bool: True if a balance is cached and not older than ``max_age``."""
+        with self._lock:
+            return self._fresh()
+
+    def _fresh(self):
+        if self._value is None:
+            return False
+        return self.max_age is None or time.monotonic() - self.synced_at < self.max_age
+
+    @property
+    def balance(self):
+        """float: The current balance, read from the API if the cached value is missing or stale.
+
+        Raises:
+            BalanceUnknownError: If the balance has to be read and the request fails.
+        """
+        with self._lock:
+            if self._fresh():
+                return self._value
+        return self.refresh()
+
+    def peek(self):
+        """Return the cached balance, however old, or None. Never makes a request."""
+        with self._lock:
+            return self._value
+
+    def refresh(self):
+        """Read the balance from the API now.
+
+        Credits debited while the request is in flight are subtracted from the
+        value returned by the API, as the server may not have counted them yet.
+        This can briefly underestimate the balance, never overestimate it.
+
+        Raises:
+            BalanceUnknownError: If the request fails.
+
+        Returns:
+            float: The new balance.
+        """
+        if self.client is None:
+            raise BalanceUnknownError("The balance tracker has no client to read the balance with.")
+        with self._refresh_lock:
+            with self._lock:
+                spent_before = self.spent
+            try:
+                value = self.client._fetch_balance()
+            except PassInfoAPIError as e:
+                raise BalanceUnknownError(f"The SMS balance could not be read: {e}") from e
+            with self._lock:
+                self._value = value - (self.spent - spent_before)
+                self.spent = 0
+                self.synced_at = time.monotonic()
+                self.refreshes += 1
+                return self._value
+
+    def debit(self, credits):
+        """Subtract ``credits`` spent by an accepted send from the cached balance.
+
+        Does nothing while no balance is cached. Starts a background resync
+        once the credits spent since the last read reach ``max_drift``.
+        """
+        with self._lock:
+            if self._value is None:
+                return
+            self._value -= credits
+            self.spent += credits
+            resync = (self.max_drift is not None and self.spent >= self.max_drift
+                      and not self._resyncing)
+            if resync:
+                self._resyncing = True
+        if resync:
+            threading.Thread(target=self._resync, name='passinfo-balance-resync', daemon=True).start()
+
+    def invalidate(self):
+        """Forget the cached balance, so that the next read goes to the API."""
+        with self._lock:
+            self._value = None
+            self.synced_at = None
+            self.spent = 0
+
+    def _resync(self):
+        try:
+            self.refresh()
+        except BalanceUnknownError:
+            pass
+        finally:
+            with self._lock:
+                self._resyncing = False
+
+    def start(self):
+        """Refresh the balance in a background thread every ``refresh_interval`` seconds."""
+        interval = self.refresh_interval or self.max_age
+        if interval is None:
+            raise ValueError("refresh_interval or max_age is required to refresh in the background")
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while True:
+                try:
+                    self.refresh()
+                except BalanceUnknownError:
+                    pass
+                if self._stop.wait(interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name='passinfo-balance-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __repr__(self):
+        return f"<BalanceTracker balance={self.peek()} spent={self.spent}>"
@@ -0,0 +1,249 @@
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .codec import BulkPayload
+from .exceptions import PassInfoAPIError
+from .phone import DedupeResult
+from .utils import iter_records
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RECIPIENT_COLUMN = "phone_number"
+
+
+class BulkChunk:
+    """A slice of a bulk recipient list and the outcome of sending it.
+
+    Attributes:
+        index (int): The position of the chunk in the original recipient list,
+            starting at 0.
+        contacts (list): The contacts of the chunk. Only failed chunks keep their
+            contacts after sending, so that they can be resent.
+        size (int): The number of contacts in the chunk.
+        response (dict): The API response for the chunk, or None if it failed.
+        error (Exception): The error raised while sending the chunk, or None.
+    """
+
+    def __init__(self, index, contacts):
+        self.index = index
+        self.contacts = contacts
+        self.size = len(contacts)
+        self.response = None
+        self.error = None
+
+    @property
+    def ok(self):
+        """bool: True if the chunk was accepted by the API."""
+        return self.error is None and self.response is not None
+
+    def __repr__(self):
+        state = "ok" if self.ok else f"failed: {self.error}"
+        return f"<BulkChunk #{self.index} ({self.size} contacts, {state})>"
+
+
+class BulkSendResult:
+    """The merged outcome of a chunked bulk send.
+
+    Responses are folded in as chunks complete, so the result only holds a
+    small summary per successful chunk; the contacts of failed chunks are kept
+    in ``failed_chunks`` so they can be passed back to
+    ``PassInfoSDKClient.resend_failed_chunks``.
+
+    Attributes:
+        message (str): The message that was sent.
+        sender_name (str): The sender name used for the send.
+        total_contacts (int): The number of contacts in all chunks.
+        sent_contacts (int): The number of contacts in accepted chunks.
+        successful_sends (int): The sum of ``successful_sends`` over all responses.
+        failed_sends (int): The sum of ``failed_sends`` over all responses.
+        batch_ids (list): The batch IDs returned for the accepted chunks, in
+            chunk order.
+        responses (list): The raw API responses of the accepted chunks, in
+            chunk order.
+        failed_chunks (list): The ``BulkChunk`` objects that could not be sent.
+        normalization (DedupeResult): The invalid inputs and duplicate count
+            dropped by the client's ``phone_normalizer``, if any.
+        estimate (CostEstimate): The planned cost computed by the client's
+            balance check, or None.
+        truncated (bool): True if the balance check left recipients out, None
+            if it could not tell (lazy input with 'truncate').
+    """
+
+    def __init__(self, message, sender_name):
+        self.message = message
+        self.sender_name = sender_name
+        self.total_contacts = 0
+        self.sent_contacts = 0
+        self.successful_sends = 0
+        self.failed_sends = 0
+        self.failed_chunks = []
+        self.normalization = DedupeResult()
+        self.estimate = None
+        self.truncated = False
+        self._responses = {}
+
+    @property
+    def ok(self):
+        """bool: True if every chunk was accepted by the API."""
+        return not self.failed_chunks
+
+    @property
+    def responses(self):
+        return [self._responses[index] for index in sorted(self._responses)]
+
+    @property
+    def batch_ids(self):
+        return [
+            response['batch_id'] for response in self.responses
+            if isinstance(response, dict) and response.get('batch_id') is not None
+        ]
+
+    def add(self, chunk):
+        """Fold the outcome of a sent chunk into the result."""
+        self.total_contacts += chunk.size
+        if not chunk.ok:
+            self.failed_chunks.append(chunk)
+            self.failed_chunks.sort(key=lambda failed: failed.index)
+            return
+        response = chunk.response
+        self.sent_contacts += chunk.size
+        self._responses[chunk.index] = response
+        if isinstance(response, dict):
+            self.successful_sends += _as_int(response.get('successful_sends'))
+            self.failed_sends += _as_int(response.get('failed_sends'))
+
+    def __repr__(self):
+        return (
+            f"<BulkSendResult {self.sent_contacts}/{self.total_contacts} contacts sent, "
+            f"{len(self.failed_chunks)} failed chunks>"
+        )
+
+
+def _as_int(value):
+    return value if isinstance(value, int) else 0
+
+
+def _is_failure(response):
+    if not isinstance(response, dict):
+        return False
+    return response.get('success') is False or response.get('status') in ('error', 'failed')
+
+
+def _accepted(response):
+    # Whether the API accepted a send: 4xx bodies are returned, not raised.
+    return (response is not None and not _is_failure(response)
+            and not (isinstance(response, dict) and 'error' in response))
+
+
+def iter_recipients(source, column=DEFAULT_RECIPIENT_COLUMN, format=None):
+    """Lazily extract recipient phone numbers from a source.
+
+    Args:
+        source: Either a path to a CSV, NDJSON or JSON file, or any iterable
+            of phone number strings, dicts, ``Contact`` objects or row sequences.
+        column (str, optional): The field holding the phone number in dict
+            records and CSV files with a header row. Defaults to 'phone_number'.
+        format (str, optional): The file format ('csv', 'ndjson' or 'json')
+            when ``source`` is a path. Detected from the extension when omitted.
+
+    Raises:
+        ValueError: If the CSV file has a header without ``column``.
+
+    Yields:
+        str: The next non-empty recipient.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = iter_records(source, format=format, column=column)
+    for record in source:
+        if isinstance(record, str):
+            recipient = record
+        elif isinstance(record, dict):
+            recipient = record.get(column)
+        elif isinstance(record, (list, tuple)):
+            recipient = record[0] if record else None
+        else:
+            recipient = getattr(record, column, None)
+        if recipient is None:
+            continue
+        recipient = str(recipient).strip()
+        if recipient:
+            yield recipient
+
+
+def iter_chunks(contacts, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Split an iterable of contacts into ``BulkChunk`` objects.
+
+    The iterable is consumed lazily, one chunk at a time.
+
+    Args:
+        contacts (iterable): The contacts to split.
+        chunk_size (int, optional): The maximum number of contacts per chunk.
+            Defaults to 1000.
+
+    Yields:
+        BulkChunk: The next chunk of contacts.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    iterator = iter(contacts)
+    for index in itertools.count():
+        batch = list(itertools.islice(iterator, chunk_size))
+        if not batch:
+            return
+        yield BulkChunk(index, batch)
+
+
+def send_chunk(client, message, sender_name, chunk, payload=None):
+    """Send a single chunk as one bulk send request and record the outcome.
+
+    API errors are stored on the chunk instead of being raised. ``payload`` is
+    the pre-encoded ``BulkPayload`` shared by the chunks of a send.
+    """
+    try:
+        response = client._send_bulk(message, sender_name, chunk.contacts, payload)
+    except PassInfoAPIError as e:
+        chunk.error = e
+        return chunk
+    if not _accepted(response):
+        chunk.error = PassInfoAPIError(
+            status_code=400,
+            message=f"Chunk {chunk.index} was rejected by the API: {response}"
+        )
+        chunk.response = None
+        return chunk
+    chunk.response = response
+    chunk.contacts = None
+    return chunk
+
+
+def dispatch_chunks(client, message, sender_name, chunks, max_workers=DEFAULT_MAX_WORKERS):
+    """Send chunks concurrently on a worker pool.
+
+    At most ``max_workers`` chunks are in flight, and new chunks are only pulled
+    from ``chunks`` when a slot frees up, so memory stays bounded even for very
+    large or lazily generated recipient lists.
+
+    Args:
+        client (PassInfoSDKClient): The client used to send the chunks.
+        message (str): The message to send.
+        sender_name (str): The sender name to use.
+        chunks (iterable): The ``BulkChunk`` objects to send.
+        max_workers (int, optional): The number of chunks sent in parallel.
+            Defaults to 8.
+
+    Yields:
+        BulkChunk: Each chunk once it has been sent, in completion order.
+    """
+    payload = BulkPayload(message, sender_name, client.codec)
+    chunks = iter(chunks)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for chunk in itertools.islice(chunks, max_workers):
+            pending.add(executor.submit(send_chunk, client, message, sender_name, chunk, payload))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            for chunk in itertools.islice(chunks, len(done)):
+                pending.add(executor.submit(send_chunk, client, message, sender_name, chunk, payload))
@@ -0,0 +1,313 @@
+import collections
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+from .codec import get_codec
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_DISK_ENTRIES = 10000
+
+# Read-mostly endpoints cached by default, with their time to live in seconds.
+# Message statuses and the SMS balance change with every send and are not cached.
+DEFAULT_TTLS = {
+    'v1/groupe/get_all_my_groupes': 300.0,
+    'v1/contact/all_my_contacts': 60.0,
+}
+
+# The cached endpoints whose content a mutation may change, by mutation prefix.
+# Mutations that match no rule clear the whole cache.
+DEFAULT_INVALIDATIONS = {
+    'v1/groupe/': ('v1/groupe/', 'v1/contact/'),
+    'v1/contact/': ('v1/contact/', 'v1/groupe/'),
+    'v1/message/': ('v1/user/get_solde',),
+    'v1/user/': ('v1/user/',),
+}
+
+
+def _longest_prefix(rules, endpoint):
+    match = None
+    for prefix in rules:
+        if endpoint.startswith(prefix) and (match is None or len(prefix) > len(match)):
+            match = prefix
+    return match
+
+
+class CacheEntry:
+    """A cached API response.
+
+    Attributes:
+        endpoint (str): The endpoint the response was read from.
+        body (bytes): The raw JSON body of the response.
+        etag (str): The response's ETag header, or None.
+        last_modified (str): The response's Last-Modified header, or None.
+        expires_at (float): When the entry stops being fresh (epoch seconds).
+    """
+
+    __slots__ = ('endpoint', 'body', 'etag', 'last_modified', 'expires_at')
+
+    def __init__(self, endpoint, body, etag, last_modified, expires_at):
+        self.endpoint = endpoint
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self):
+        """bool: True while the entry can be served without contacting the API."""
+        return time.time() < self.expires_at
+
+    @property
+    def revalidatable(self):
+        """bool: True if the API can confirm a stale entry with a 304 response."""
+        return self.etag is not None or self.last_modified is not None
+
+    def conditional_headers(self):
+        """Return the If-None-Match / If-Modified-Since headers for this entry."""
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def value(self):
+        """Return the decoded response. Each call returns a new object."""
+        return get_codec().loads(self.body)
+
+
+class ResponseCache:
+    """An LRU cache of GET responses with per-endpoint TTLs.
+
+    Only endpoints listed in ``ttls`` are cached. A fresh entry is returned
+    without contacting the API. Once its TTL has passed, an entry that came with
+    an ``ETag`` or ``Last-Modified`` header is revalidated with a conditional
+    request: a ``304 Not Modified`` answer renews it without downloading the body
+    again. Mutations (POST, PUT, DELETE...) sent through a client using the cache
+    drop the entries they may affect, e.g. ``add_contact_to_group`` drops the
+    cached groups and contact pages.
+
+    Entries live in memory, bounded to ``max_entries`` with least-recently-used
+    eviction. When ``path`` is given, they are also written to a SQLite file, so
+    that they survive restarts and can be shared by several processes; entries
+    evicted from memory are reloaded from disk on their next use.
+
+    The cache is thread-safe and can be shared between clients. Entries are
+    keyed by client ID, so accounts never see each other's data.
+
+    Attributes:
+        ttls (dict): Seconds to live by endpoint prefix. The longest matching
+            prefix applies.
+        invalidations (dict): The cached endpoint prefixes dropped by each
+            mutation prefix.
+        max_entries (int): The number of entries kept in memory.
+        path (str): The SQLite file of the disk layer, or None.
+        hits (int): Requests answered from a fresh entry.
+        revalidations (int): Stale entries renewed by a 304 response.
+        misses (int): Cacheable requests that downloaded a response.
+        evictions (int): Entries evicted from memory.
+        invalidated (int): Entries dropped by mutations or ``invalidate()``.
+
+    Example:
+        >>> cache = ResponseCache(ttls={'v1/groupe/get_all_my_groupes': 600}, path='passinfo-cache.db')
+        >>> api = PassInfoAPI('your-api-key', 'your-client-id', cache=cache)
+        >>> groups = api.get_user_groups()   # downloaded
+        >>> groups = api.get_user_groups()   # served from the cache
+        >>> cache.stats()
+        {'hits': 1, 'revalidations': 0, 'misses': 1, ...}
+    """
+
+    def __init__(self, ttls=None, max_entries=DEFAULT_MAX_ENTRIES, path=None,
+                 max_disk_entries=DEFAULT_MAX_DISK_ENTRIES, invalidations=None):
+        """Initialize a new ResponseCache.
+
+        Args:
+            ttls (dict, optional): Seconds to live by endpoint prefix. Defaults to
+                5 minutes for groups and 1 minute for contact pages.
+            max_entries (int, optional): The number of entries kept in memory.
+                Defaults to 1024.
+            path (str, optional): A SQLite file used as a second, persistent
+                layer. Defaults to None (memory only).
+            max_disk_entries (int, optional): The number of entries kept on disk;
+                the oldest are removed first. Defaults to 10000.
+            invalidations (dict, optional): Overrides the cached endpoint prefixes
+                dropped by each mutation prefix.
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.invalidations = dict(DEFAULT_INVALIDATIONS if invalidations is None else invalidations)
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._disk_writes = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, body BLOB NOT NULL, "
+                "etag TEXT, last_modified TEXT, expires_at REAL NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidated = 0
+
+    def close(self):
+        """Close the disk layer, if any. The memory layer stays usable."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, endpoint):
+        """Return the TTL of ``endpoint`` in seconds, or None if it is not cached."""
+        prefix = _longest_prefix(self.ttls, endpoint)
+        return None if prefix is None else self.ttls[prefix]
+
+    def key(self, client_id, endpoint, params=None):
+        """Return the cache key of a GET request, or None if it is not cacheable."""
+        if self.ttl_for(endpoint) is None:
+            return None
+        query = urlencode(sorted(params.items()), doseq=True) if params else ''
+        return f"{client_id}|{endpoint}?{query}"
+
+    def get(self, key):
+        """Return the entry stored under ``key``, fresh or stale, or None.
+
+        Fresh entries count as hits; callers report the outcome of requests sent
+        for stale or missing entries with ``revalidated()`` or ``store()``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                entry = self._load(key)
+                if entry is not None:
+                    self._remember(key, entry)
+            if entry is None:
+                return None
+            if entry.fresh:
+                self.hits += 1
+            elif not entry.revalidatable:
+                self._forget(key)
+                return None
+            return entry
+
+    def store(self, key, endpoint, body, headers):
+        """Cache a 200 response body, unless its headers forbid it.
+
+        Args:
+            key (str): The key returned by ``key()``.
+            endpoint (str): The endpoint of the request.
+            body (bytes): The raw response body.
+            headers (Mapping): The response headers.
+
+        Returns:
+            CacheEntry: The new entry, or None if the response was not cached.
+        """
+        with self._lock:
+            self.misses += 1
+            if 'no-store' in (headers.get('Cache-Control') or '').lower():
+                self._forget(key)
+                return None
+            entry = CacheEntry(
+                endpoint, bytes(body), headers.get('ETag'), headers.get('Last-Modified'),
+                time.time() + self.ttl_for(endpoint),
+            )
+            self._remember(key, entry)
+            self._save(key, entry)
+            return entry
+
+    def revalidated(self, key, entry, headers=None):
+        """Renew ``entry`` after the API confirmed it with a 304 response."""
+        with self._lock:
+            self.revalidations += 1
+            if headers is not None and headers.get('ETag'):
+                entry.etag = headers.get('ETag')
+            entry.expires_at = time.time() + self.ttl_for(entry.endpoint)
+            self._remember(key, entry)
+            self._save(key, entry)
+        return entry
+
+    def invalidate(self, prefix=''):
+        """Drop every entry whose endpoint starts with ``prefix`` (all by default).
+
+        Returns:
+            int: The number of entries dropped from memory.
+        """
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry.endpoint.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            if self._db is not None:
+                self._db.execute(
+                    "DELETE FROM responses WHERE substr(endpoint, 1, ?) = ?", (len(prefix), prefix)
+                )
+            self.invalidated += len(keys)
+        return len(keys)
+
+    def invalidate_for(self, endpoint):
+        """Drop the entries a mutation sent to ``endpoint`` may have changed."""
+        rule = _longest_prefix(self.invalidations, endpoint)
+        if rule is None:
+            return self.invalidate()
+        return sum(self.invalidate(prefix) for prefix in self.invalidations[rule])
+
+    def stats(self):
+        """Return the hit, revalidation, miss, eviction and size counters as a dict."""
+        lookups = self.hits + self.revalidations + self.misses
+        return {
+            'hits': self.hits,
+            'revalidations': self.revalidations,
+            'misses': self.misses,
+            'hit_ratio': (self.hits + self.revalidations) / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidated': self.invalidated,
+            'entries': len(self._entries),
+        }
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _forget(self, key):
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def _load(self, key):
+        row = self._db.execute(
+            "SELECT endpoint, body, etag, last_modified, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return CacheEntry(*row) if row is not None else None
+
+    def _save(self, key, entry):
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (key, endpoint, body, etag, last_modified, expires_at, stored_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, entry.endpoint, entry.body, entry.etag, entry.last_modified, entry.expires_at, time.time()),
+        )
+        self._disk_writes += 1
+        if self._disk_writes % 100 == 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            )
@@ -0,0 +1,349 @@
+import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+from . import bulk
+from .exceptions import PassInfoAPIError
+from .ratelimit import RateLimiter, SEND
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROGRESS_INTERVAL = 1.0
+
+# Messages sent by the workers on the results queue.
+_CHUNK = 0
+_DONE = 1
+_CRASHED = 2
+
+
+class CampaignResult(bulk.BulkSendResult):
+    """The merged outcome of a campaign sent by ``CampaignRunner``.
+
+    Chunks are merged exactly as in ``send_message_bulk_chunked``, so failed
+    chunks can be sent again with ``PassInfoSDKClient.resend_failed_chunks``.
+
+    Attributes:
+        processes (int): The number of worker processes used.
+        shards (dict): The number of contacts sent by each worker, by worker index.
+        worker_errors (list): (worker index, error) for each worker that stopped
+            on an unexpected error.
+        duration (float): The duration of the campaign in seconds.
+    """
+
+    def __init__(self, message, sender_name, processes):
+        super().__init__(message, sender_name)
+        self.processes = processes
+        self.shards = dict.fromkeys(range(processes), 0)
+        self.worker_errors = []
+        self.duration = 0.0
+
+    @property
+    def throughput(self):
+        """float: The contacts sent per second."""
+        return self.sent_contacts / self.duration if self.duration else 0.0
+
+    def __repr__(self):
+        return (
+            f"<CampaignResult {self.sent_contacts}/{self.total_contacts} contacts sent by "
+            f"{self.processes} processes in {self.duration:.1f}s, {len(self.failed_chunks)} failed chunks>"
+        )
+
+
+def _report(shard, chunk):
+    # Accepted chunks travel back without their contacts; failed ones keep
+    # them so they can be resent, and carry their error as plain values.
+    if chunk.ok:
+        return _CHUNK, shard, chunk.index, chunk.size, chunk.response, None, None
+    error = chunk.error
+    return (_CHUNK, shard, chunk.index, chunk.size, None,
+            (getattr(error, 'status_code', 500), str(getattr(error, 'message', error))), chunk.contacts)
+
+
+def _run_worker(shard, api_key, client_id, client_options, rate, rate_dir, message, sender_name,
+                threads, tasks, results):
+    # Runs in each worker process: one pooled client sending the chunks it
+    # pulls from the task queue on ``threads`` threads until it gets None.
+    from .client import PassInfoSDKClient
+
+    try:
+        options = dict(client_options)
+        if rate is not None:
+            options['rate_limiter'] = RateLimiter(limits={SEND: rate}, shared_dir=rate_dir)
+        with PassInfoSDKClient(api_key, client_id, **options) as client:
+            chunks = (bulk.BulkChunk(index, contacts) for index, contacts in iter(tasks.get, None))
+            for chunk in bulk.dispatch_chunks(client, message, sender_name, chunks, threads):
+                results.put(_report(shard, chunk))
+    except Exception as e:
+        logger.exception("Campaign worker %d stopped", shard)
+        results.put((_CRASHED, shard, f"{type(e).__name__}: {e}"))
+        return
+    results.put((_DONE, shard))
+
+
+class CampaignRunner:
+    """Sends a bulk campaign from a pool of worker processes.
+
+    A single process spends most of a large send encoding request bodies,
+    parsing responses and keeping books, and tops out at one core well before
+    the network does. The runner reads the recipients in the parent process,
+    cuts them into chunks and hands them out through a bounded queue to
+    ``processes`` workers. Each worker has its own pooled
+    ``PassInfoSDKClient`` sending ``threads`` chunks at a time, so throughput
+    grows with the number of cores. Workers pull chunks as they free up, which
+    balances the shards on their own.
+
+    With ``rate`` set, every worker draws from one send budget stored in a
+    ``FileTokenBucket``, so the whole pool stays under ``rate`` requests per
+    second. Workers report each chunk back on a results queue as a small tuple
+    (accepted chunks travel without their contacts); the parent merges them
+    into a ``CampaignResult`` and reports progress as it goes.
+
+    A worker that dies mid-send loses the chunks it was holding: they are
+    listed as failed chunks (status code 500) and may or may not have been
+    sent. Use an ``Outbox`` when sends must survive crashes exactly once.
+
+    Attributes:
+        processes (int): The number of worker processes.
+        threads (int): The number of chunks each worker sends in parallel.
+        rate (float): The send requests per second shared by all workers, or None.
+
+    Example:
+        >>> runner = CampaignRunner('api_key', 'client_id', processes=4, rate=200)
+        >>> result = runner.run('Soldes ce week-end !', 'MyApp', 'recipients.csv',
+        ...                     progress=lambda result: print(result.sent_contacts))
+        >>> print(result.throughput, "contacts/s")
+        >>> if not result.ok:
+        ...     result = client.resend_failed_chunks(result)
+    """
+
+    def __init__(self, api_key, client_id, processes=None, threads=bulk.DEFAULT_MAX_WORKERS, rate=None,
+                 rate_dir=None, client_options=None, start_method=None,
+                 progress_interval=DEFAULT_PROGRESS_INTERVAL):
+        """Initialize a new CampaignRunner.
+
+        Args:
+            api_key (str): The API key used by the workers.
+            client_id (str): The client ID used by the workers.
+            processes (int, optional): The number of worker processes. Defaults
+                to the number of CPUs.
+            threads (int, optional): The number of chunks each worker sends in
+                parallel. Defaults to 8.
+            rate (float, optional): The send requests per second allowed for
+                the whole pool. Defaults to None (not limited).
+            rate_dir (str, optional): The directory holding the shared token
+                buckets. Defaults to a temporary directory, removed after each
+                run. Point runners on the same host at one directory to share
+                the budget between them.
+            client_options (dict, optional): Keyword arguments for each
+                worker's ``PassInfoSDKClient`` (``base_url``, ``retry_policy``,
+                ``codec``...). They must be picklable. Defaults to None.
+            start_method (str, optional): The multiprocessing start method
+                ('fork', 'spawn' or 'forkserver'). Defaults to the platform's.
+            progress_interval (float, optional): The seconds between two
+                progress reports. Defaults to 1.
+
+        Raises:
+            ValueError: If processes or threads is lower than 1.
+        """
+        processes = processes or os.cpu_count() or 1
+        if processes < 1 or threads < 1:
+            raise ValueError("processes and threads must be at least 1")
+        self.api_key = api_key
+        self.client_id = client_id
+        self.processes = processes
+        self.threads = threads
+        self.rate = rate
+        self.rate_dir = rate_dir
+        self.client_options = dict(client_options or {})
+        self.progress_interval = progress_interval
+        self._context = multiprocessing.get_context(start_method)
+
+    def run(self, message, sender_name, recipients, chunk_size=bulk.DEFAULT_CHUNK_SIZE,
+            column=bulk.DEFAULT_RECIPIENT_COLUMN, format=None, normalizer=None, progress=None):
+        """Send a message to every recipient using the worker pool.
+
+        Args:
+            message (str): The content of the message to be sent to every recipient.
+            sender_name (str): The name that will appear as the sender of the message.
+            recipients: A path to a CSV or NDJSON file, or any iterable of phone
+                numbers, dicts or ``Contact`` objects. Read lazily.
+            chunk_size (int, optional): The maximum number of recipients per
+                bulk request. Defaults to 1000.
+            column (str, optional): The field holding the phone number in dict
+                records and CSV headers. Defaults to 'phone_number'.
+            format (str, optional): 'csv' or 'ndjson' when ``recipients`` is a
+                path. Detected from the file extension when omitted.
+            normalizer (PhoneNormalizer, optional): Normalizes the numbers and
+                drops invalid and duplicate ones before they are sharded.
+            progress (callable, optional): Called with the ``CampaignResult``
+                every ``progress_interval`` seconds while the campaign runs,
+                and once at the end.
+
+        Raises:
+            PassInfoAPIError: If message, sender_name or recipients is None, or
+                if there are no recipients (status_code=400).
+
+        Returns:
+            CampaignResult: The merged outcome of the campaign.
+        """
+        if message is None:
+            raise PassInfoAPIError(status_code=400, message="Message is required.")
+        elif recipients is None:
+            raise PassInfoAPIError(status_code=400, message="Contacts are required.")
+        elif sender_name is None:
+            raise PassInfoAPIError(status_code=400, message="Sender name is required.")
+
+        started = time.monotonic()
+        result = CampaignResult(message, sender_name, self.processes)
+        contacts = bulk.iter_recipients(recipients, column=column, format=format)
+        if normalizer is not None:
+            contacts = normalizer.iter_unique(contacts, result.normalization)
+        chunks = bulk.iter_chunks(contacts, chunk_size)
+
+        rate_dir = self.rate_dir
+        temporary_dir = None
+        if self.rate is not None and rate_dir is None:
+            rate_dir = temporary_dir = tempfile.mkdtemp(prefix='passinfo-campaign-')
+        try:
+            self._run(message, sender_name, chunks, rate_dir, result, progress)
+        finally:
+            if temporary_dir is not None:
+                shutil.rmtree(temporary_dir, ignore_errors=True)
+        result.duration = time.monotonic() - started
+        if progress is not None:
+            progress(result)
+        if result.total_contacts == 0:
+            raise PassInfoAPIError(status_code=400, message="Contacts are required.")
+        return result
+
+    def _run(self, message, sender_name, chunks, rate_dir, result, progress):
+        context = self._context
+        tasks = context.Queue(maxsize=self.processes * self.threads * 2)
+        results = context.Queue()
+        workers = [
+            context.Process(
+                target=_run_worker,
+                args=(shard, self.api_key, self.client_id, self.client_options, self.rate, rate_dir,
+                      message, sender_name, self.threads, tasks, results),
+                name=f"passinfo-campaign-{shard}",
+                daemon=True,
+            )
+            for shard in range(self.processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        # Chunks handed out and not reported yet, to account for those held
+        # by a worker that dies.
+        in_flight = {}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    tasks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def feed():
+            try:
+                for chunk in chunks:
+                    with lock:
+                        in_flight[chunk.index] = chunk.contacts
+                    if not put((chunk.index, chunk.contacts)):
+                        return
+                for _ in workers:
+                    put(None)
+            except Exception as e:
+                logger.exception("Reading the campaign recipients failed")
+                result.worker_errors.append((None, f"{type(e).__name__}: {e}"))
+                stop.set()
+
+        feeder = threading.Thread(target=feed, name="passinfo-campaign-feeder", daemon=True)
+        feeder.start()
+        running = set(range(self.processes))
+        next_report = time.monotonic() + self.progress_interval
+        try:
+            while running:
+                try:
+                    report = results.get(timeout=0.1)
+                except queue.Empty:
+                    report = None
+                    for shard in list(running):
+                        if not workers[shard].is_alive() and results.empty():
+                            running.discard(shard)
+                            result.worker_errors.append(
+                                (shard, f"Worker exited with code {workers[shard].exitcode}"))
+                    if stop.is_set() or not running:
+                        break
+                if report is not None:
+                    kind, shard = report[0], report[1]
+                    if kind == _CHUNK:
+                        self._merge(report, result, in_flight, lock)
+                    else:
+                        running.discard(shard)
+                        if kind == _CRASHED:
+                            result.worker_errors.append((shard, report[2]))
+                if progress is not None and time.monotonic() >= next_report:
+                    next_report = time.monotonic() + self.progress_interval
+                    progress(result)
+        finally:
+            stop.set()
+            feeder.join()
+            for worker in workers:
+                # Workers that reported DONE exit on their own; the others are
+                # only left running on an error or interrupt in the parent.
+                worker.join(timeout=0 if running else 5)
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
+            for chunk_queue in (tasks, results):
+                chunk_queue.cancel_join_thread()
+                chunk_queue.close()
+
+        for index, contacts in sorted(in_flight.items()):
+            chunk = bulk.BulkChunk(index, contacts)
+            chunk.error = PassInfoAPIError(
+                status_code=500,
+                message=f"Chunk {index} was not reported by its worker and may or may not have been sent."
+            )
+            result.add(chunk)
+
+    @staticmethod
+    def _merge(report, result, in_flight, lock):
+        _, shard, index, size, response, error, contacts = report
+        with lock:
+            held = in_flight.pop(index, None)
+        chunk = bulk.BulkChunk(index, contacts if contacts is not None else held or [])
+        chunk.size = size
+        if error is None:
+            chunk.response = response
+            chunk.contacts = None
+            result.shards[shard] += size
+        else:
+            chunk.error = PassInfoAPIError(status_code=error[0], message=error[1])
+        result.add(chunk)
+
+
+def run_campaign(api_key, client_id, message, sender_name, recipients, processes=None,
+                 threads=bulk.DEFAULT_MAX_WORKERS, rate=None, chunk_size=bulk.DEFAULT_CHUNK_SIZE,
+                 client_options=None, progress=None):
+    """Send a campaign with a ``CampaignRunner`` in one call.
+
+    See ``CampaignRunner`` and ``CampaignRunner.run`` for the arguments.
+
+    Example:
+        >>> result = run_campaign('api_key', 'client_id', 'Soldes ce week-end !', 'MyApp',
+        ...                       'recipients.csv', processes=4, rate=200)
+    """
+    runner = CampaignRunner(api_key, client_id, processes=processes, threads=threads, rate=rate,
+                            client_options=client_options)
+    return runner.run(message, sender_name, recipients, chunk_size=chunk_size, progress=progress)
@@ -0,0 +1,438 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import bulk
+from .exceptions import PassInfoAPIError, PassInfoSDKError
+from .metrics import ClientMetrics
+from .outbox import FAILED, PENDING, SENDING, SENT, UNKNOWN, Outbox
+from .phone import PhoneNormalizer
+from .poller import BATCH, BATCH_TERMINAL_STATUSES, MESSAGE, MESSAGE_TERMINAL_STATUSES, StatusPoller
+from .ratelimit import RateLimiter, SEND
+from .utils import detect_file_format, iter_records
+
+ENV_API_KEY = 'PASSINFO_API_KEY'
+ENV_CLIENT_ID = 'PASSINFO_CLIENT_ID'
+ENV_BASE_URL = 'PASSINFO_BASE_URL'
+
+DEFAULT_BASE_URL = "https://api.passinfo.net"
+DEFAULT_STATS_INTERVAL = 2.0
+STATE_SUFFIX = '.passinfo.db'
+
+# Exit codes: some recipients or rows failed, or the run was interrupted.
+EXIT_FAILURES = 1
+EXIT_ERROR = 2
+EXIT_INTERRUPTED = 130
+
+_TERMINAL = {MESSAGE: MESSAGE_TERMINAL_STATUSES, BATCH: BATCH_TERMINAL_STATUSES}
+
+
+class _Stats:
+    """Prints a live statistics line to stderr every ``interval`` seconds.
+
+    Throughput and latency are computed over the last interval from the
+    client's metrics, so they show the current pace rather than an average.
+    """
+
+    def __init__(self, metrics, interval=DEFAULT_STATS_INTERVAL, quiet=False, done=0, stream=None):
+        self.metrics = metrics
+        self.interval = interval
+        self.quiet = quiet
+        self.stream = stream or sys.stderr
+        self.started = time.monotonic()
+        self._first = (self.started, done, 0, 0.0)
+        self._last = self._first
+        self._next = self.started + interval
+
+    def _latency_totals(self):
+        snapshot = self.metrics.snapshot()
+        latency = sum(stats['mean_latency'] * stats['requests']
+                      for stats in snapshot['endpoints'].values() if stats['mean_latency'] is not None)
+        return snapshot['requests'], latency
+
+    def update(self, done, counts, force=False):
+        """Print the statistics line if the interval has elapsed (or ``force``)."""
+        now = time.monotonic()
+        if self.quiet or (not force and now < self._next):
+            return
+        self._next = now + self.interval
+        requests, latency = self._latency_totals()
+        # The final line covers the whole run.
+        last_time, last_done, last_requests, last_latency = self._first if force else self._last
+        self._last = (now, done, requests, latency)
+        elapsed = max(now - last_time, 1e-9)
+        window = requests - last_requests
+        mean = (latency - last_latency) / window * 1000 if window else 0.0
+        parts = ', '.join(f"{count} {name}" for name, count in counts.items())
+        print(f"[{now - self.started:7.1f}s] {parts} | {(done - last_done) / elapsed:.0f}/s, "
+              f"{window / elapsed:.1f} req/s, latency {mean:.0f} ms, {self.metrics.errors} errors",
+              file=self.stream, flush=True)
+
+
+def _client(args, metrics, rate=None, normalizer=None):
+    from .client import PassInfoSDKClient
+
+    if not args.api_key or not args.client_id:
+        raise SystemExit(f"passinfo: credentials are required: pass --api-key and --client-id "
+                         f"or set {ENV_API_KEY} and {ENV_CLIENT_ID}")
+    workers = getattr(args, 'workers', bulk.DEFAULT_MAX_WORKERS)
+    return PassInfoSDKClient(
+        args.api_key, args.client_id, base_url=args.base_url, timeout=args.timeout,
+        pool_maxsize=max(workers, 10), metrics=metrics,
+        rate_limiter=RateLimiter(limits={SEND: rate}) if rate else None, phone_normalizer=normalizer,
+    )
+
+
+def _normalizer(args):
+    if args.country_code is None:
+        return None
+    return PhoneNormalizer(default_country_code=args.country_code)
+
+
+def _campaign_id(args):
+    # Derived from what is sent, so that running the same command again
+    # resumes the same campaign.
+    if args.campaign:
+        return args.campaign
+    data = '\x00'.join((args.message, args.sender, str(args.template)))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+
+def _enqueue(args, outbox, campaign, normalizer):
+    if not args.template:
+        contacts = bulk.iter_recipients(args.recipients, column=args.column, format=args.format)
+        if normalizer is not None:
+            contacts = normalizer.iter_unique(contacts)
+        return outbox.enqueue_bulk(args.message, args.sender, contacts, campaign=campaign)
+
+    from .templates import MessageTemplate, TemplatedSendResult, group_messages
+
+    template = MessageTemplate(args.message)
+    records = iter_records(args.recipients, format=args.format, header=True, column=args.column)
+    if args.column != bulk.DEFAULT_RECIPIENT_COLUMN:
+        records = (dict(record, phone_number=record.get(args.column)) for record in records)
+    report = TemplatedSendResult(template)
+    groups = group_messages(template, records, normalizer, report)
+    for record, reason in report.invalid[:10]:
+        print(f"passinfo: skipped {record!r}: {reason}", file=sys.stderr)
+    if len(report.invalid) > 10:
+        print(f"passinfo: skipped {len(report.invalid) - 10} more recipients", file=sys.stderr)
+    return sum(outbox.enqueue_bulk(text, args.sender, phones, campaign=campaign) for text, phones in groups.items())
+
+
+def command_send(args):
+    """Send a bulk or templated campaign through a resumable outbox."""
+    metrics = ClientMetrics()
+    state = args.state or os.fspath(args.recipients) + STATE_SUFFIX
+    campaign = _campaign_id(args)
+    with _client(args, metrics, args.rate) as client, Outbox(state, batch_size=args.chunk_size) as outbox:
+        if outbox.recovered:
+            print(f"passinfo: {outbox.recovered} recipients were in flight when the last run stopped; "
+                  f"they may have been sent. Check them, then run again with --retry unknown.",
+                  file=sys.stderr)
+        if args.retry:
+            for status in ((FAILED, UNKNOWN) if args.retry == 'all' else (args.retry,)):
+                outbox.requeue(status)
+        # Sending starts while the recipients are still being queued.
+        stats = _Stats(metrics, args.interval, args.quiet, done=outbox.stats()[SENT])
+        outbox.start(client, max_workers=args.workers, poll_interval=0.1)
+        try:
+            added = _enqueue(args, outbox, campaign, _normalizer(args))
+            if not added and not outbox.count(campaign):
+                print(f"passinfo: no recipients found in {args.recipients}", file=sys.stderr)
+                return EXIT_ERROR
+            counts = outbox.stats()
+            print(f"Campaign {campaign}: {added} recipients queued, {counts[SENT]} sent so far "
+                  f"(state in {state})", file=sys.stderr)
+            while counts[PENDING] or counts[SENDING]:
+                time.sleep(0.25)
+                counts = outbox.stats()
+                stats.update(counts[SENT], counts)
+        except KeyboardInterrupt:
+            print("passinfo: interrupted, waiting for the requests in flight...", file=sys.stderr)
+            outbox.stop()
+            counts = outbox.stats()
+            stats.update(counts[SENT], counts, force=True)
+            print("passinfo: run the same command again to resume.", file=sys.stderr)
+            return EXIT_INTERRUPTED
+        outbox.stop()
+        counts = outbox.stats()
+        stats.update(counts[SENT], counts, force=True)
+    if counts[FAILED] or counts[UNKNOWN]:
+        print(f"passinfo: {counts[FAILED]} failed and {counts[UNKNOWN]} unknown recipients; "
+              f"run again with --retry to send them.", file=sys.stderr)
+        return EXIT_FAILURES
+    return 0
+
+
+def _read_export(path):
+    # The last status written for each (kind, id) of an earlier export.
+    statuses = {}
+    if not os.path.exists(path):
+        return statuses
+    for record in iter_records(path):
+        if isinstance(record, dict):
+            statuses[(record.get('kind'), record.get('id'))] = record.get('status')
+    return statuses
+
+
+class _Export:
+    """Appends status records to a CSV or NDJSON file, or writes them to stdout."""
+
+    FIELDS = ('kind', 'id', 'status', 'checked_at', 'response')
+
+    def __init__(self, path=None, as_json=False):
+        self.path = path
+        self.format = detect_file_format(path) if path else ('ndjson' if as_json else 'text')
+        if self.format == 'json':
+            raise ValueError(f"Cannot append statuses to {path!r}; use a .csv or .ndjson file")
+        if path is None:
+            self.handle = sys.stdout
+        else:
+            new = not os.path.exists(path) or os.path.getsize(path) == 0
+            self.handle = open(path, 'a', newline='', encoding='utf-8')
+            if self.format == 'csv' and new:
+                csv.writer(self.handle).writerow(self.FIELDS)
+
+    def write(self, kind, id, status, response):
+        record = (kind, id, status, time.strftime('%Y-%m-%dT%H:%M:%S'), json.dumps(response, default=str))
+        if self.format == 'csv':
+            csv.writer(self.handle).writerow(record)
+        elif self.format == 'ndjson':
+            self.handle.write(json.dumps(dict(zip(self.FIELDS, record[:4]), response=response), default=str) + '\n')
+        else:
+            self.handle.write(f"{kind} {id}: {status}\n")
+        self.handle.flush()
+
+    def close(self):
+        if self.handle is not sys.stdout:
+            self.handle.close()
+
+
+def command_status(args):
+    """Check or watch the delivery status of messages and batches."""
+    batch_ids = list(args.batch_id or ())
+    if args.state:
+        with Outbox(args.state) as outbox:
+            batch_ids.extend(outbox.batch_ids())
+    tracked = [(MESSAGE, id) for id in args.message_id or ()] + [(BATCH, id) for id in batch_ids]
+    if not tracked:
+        raise SystemExit("passinfo: nothing to check; pass --batch-id, --message-id or --state")
+
+    done = {}
+    if args.output:
+        done = _read_export(args.output)
+    remaining = [(kind, id) for kind, id in dict.fromkeys(tracked)
+                 if done.get((kind, id)) not in _TERMINAL[kind]]
+    if len(remaining) < len(tracked):
+        print(f"passinfo: {len(tracked) - len(remaining)} IDs already final in {args.output}", file=sys.stderr)
+
+    metrics = ClientMetrics()
+    export = _Export(args.output, args.json)
+    stats = _Stats(metrics, args.interval, args.quiet)
+    final = 0
+    given_up = 0
+    try:
+        with _client(args, metrics) as client:
+            if args.watch:
+                poller = StatusPoller(client, max_workers=args.workers)
+                events = poller.poll(message_ids=[id for kind, id in remaining if kind == MESSAGE],
+                                     batch_ids=[id for kind, id in remaining if kind == BATCH],
+                                     timeout=args.max_wait)
+                for event in events:
+                    if event.error is None:
+                        export.write(event.kind, event.id, event.status, event.response)
+                        final += event.terminal
+                    elif event.terminal:
+                        print(f"passinfo: {event.kind} {event.id}: {event.error}", file=sys.stderr)
+                        given_up += 1
+                    stats.update(final, {'final': final, 'pending': len(poller.pending)})
+                pending = len(poller.pending) + given_up
+            else:
+                def check(item):
+                    kind, id = item
+                    try:
+                        if kind == MESSAGE:
+                            return item, client.get_message_status(id), None
+                        return item, client.get_message_status_bulk(id), None
+                    except PassInfoAPIError as e:
+                        return item, None, e
+
+                pending = 0
+                with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                    for (kind, id), response, error in executor.map(check, remaining):
+                        if error is not None:
+                            print(f"passinfo: {kind} {id}: {error}", file=sys.stderr)
+                            pending += 1
+                            continue
+                        status = response.get('status') if isinstance(response, dict) else None
+                        status = status.lower() if isinstance(status, str) else status
+                        export.write(kind, id, status, response)
+                        if status in _TERMINAL[kind]:
+                            final += 1
+                        else:
+                            pending += 1
+                        stats.update(final, {'final': final, 'pending': pending})
+    except KeyboardInterrupt:
+        print("passinfo: interrupted; run the same command again to resume.", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    finally:
+        export.close()
+    stats.update(final, {'final': final, 'pending': pending}, force=True)
+    return EXIT_FAILURES if pending else 0
+
+
+def command_import(args):
+    """Import contacts from a CSV or NDJSON file."""
+    from .models import PassInfoAPI
+
+    metrics = ClientMetrics()
+    stats = _Stats(metrics, args.interval, args.quiet)
+    client = _client(args, metrics, normalizer=_normalizer(args))
+    done = [0]
+
+    def progress(row):
+        done[0] += 1
+        stats.update(done[0], {'rows': done[0]})
+
+    with PassInfoAPI(client.api_key, client.client_id, client=client) as api:
+        try:
+            report = api.import_contacts(args.file, group_id=args.group_id, skip_existing=not args.no_skip_existing,
+                                         max_workers=args.workers, format=args.format, progress=progress)
+        except KeyboardInterrupt:
+            print("passinfo: interrupted; run the same command again to resume, contacts already "
+                  "created are skipped.", file=sys.stderr)
+            return EXIT_INTERRUPTED
+    stats.update(done[0], {'rows': done[0]}, force=True)
+    if args.report:
+        report.write_csv(args.report)
+    print(json.dumps(report.stats()) if args.json else report)
+    return 0 if report.ok else EXIT_FAILURES
+
+
+def command_balance(args):
+    """Print the SMS credit balance."""
+    with _client(args, None) as client:
+        balance = client.get_balance()
+    print(json.dumps({'balance': balance}) if args.json else balance)
+    return 0
+
+
+def _add_common(parser):
+    parser.add_argument('--api-key', default=os.environ.get(ENV_API_KEY),
+                        help=f"The API key. Defaults to ${ENV_API_KEY}.")
+    parser.add_argument('--client-id', default=os.environ.get(ENV_CLIENT_ID),
+                        help=f"The client ID. Defaults to ${ENV_CLIENT_ID}.")
+    parser.add_argument('--base-url', default=os.environ.get(ENV_BASE_URL, DEFAULT_BASE_URL),
+                        help=f"The API base URL. Defaults to ${ENV_BASE_URL} or {DEFAULT_BASE_URL}.")
+    parser.add_argument('--timeout', type=float, default=30.0, help="The request timeout in seconds.")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable output.")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Do not print live statistics.")
+    parser.add_argument('--interval', type=float, default=DEFAULT_STATS_INTERVAL,
+                        help="The seconds between two statistics lines.")
+
+
+def build_parser():
+    """Return the argument parser of the ``passinfo`` command."""
+    parser = argparse.ArgumentParser(
+        prog='passinfo',
+        description="Send campaigns, track their delivery and manage contacts on PassInfo.",
+    )
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    send = commands.add_parser(
+        'send', help="send a bulk or templated campaign",
+        description="Send a message to every recipient of a CSV or NDJSON file. Recipients are "
+                    "streamed into a state file (an outbox) and sent from it, so running the same "
+                    "command again after an interruption resumes the campaign without sending "
+                    "twice to anyone.",
+    )
+    send.add_argument('message', help="The message, or the template with --template.")
+    send.add_argument('-s', '--sender', required=True, help="The sender name.")
+    send.add_argument('-r', '--recipients', required=True, help="The CSV or NDJSON recipients file.")
+    send.add_argument('--format', choices=('csv', 'ndjson', 'json'), help="The file format, if not the extension's.")
+    send.add_argument('--column', default=bulk.DEFAULT_RECIPIENT_COLUMN, help="The phone number field.")
+    send.add_argument('--template', action='store_true',
+                      help="Render MESSAGE for each recipient, e.g. 'Bonjour {first_name} !'.")
+    send.add_argument('--country-code', help="Normalize numbers to E.164 with this default country code.")
+    send.add_argument('--campaign', help="The campaign ID. Defaults to a hash of the message and sender.")
+    send.add_argument('--state', help=f"The state file. Defaults to the recipients file + '{STATE_SUFFIX}'.")
+    send.add_argument('--retry', choices=(FAILED, UNKNOWN, 'all'),
+                      help="Send again the recipients that failed or whose outcome is unknown.")
+    send.add_argument('--chunk-size', type=int, default=bulk.DEFAULT_CHUNK_SIZE,
+                      help="The recipients per request.")
+    send.add_argument('-w', '--workers', type=int, default=bulk.DEFAULT_MAX_WORKERS,
+                      help="The requests sent in parallel.")
+    send.add_argument('--rate', type=float, help="The maximum send requests per second.")
+    _add_common(send)
+    send.set_defaults(handler=command_send)
+
+    status = commands.add_parser(
+        'status', help="check or export delivery statuses",
+        description="Check the status of batches and messages once, or watch them until they are "
+                    "final. With --output, statuses are appended to a CSV or NDJSON file and IDs "
+                    "already final in it are skipped on the next run.",
+    )
+    status.add_argument('--batch-id', action='append', help="A batch ID; repeat for several.")
+    status.add_argument('--message-id', action='append', help="A message ID; repeat for several.")
+    status.add_argument('--state', help="Check every batch sent from this send state file.")
+    status.add_argument('--watch', action='store_true', help="Poll until every status is final.")
+    status.add_argument('--max-wait', type=float, help="Stop watching after this many seconds.")
+    status.add_argument('-o', '--output', help="Append the statuses to this CSV or NDJSON file.")
+    status.add_argument('-w', '--workers', type=int, default=16, help="The checks run in parallel.")
+    _add_common(status)
+    status.set_defaults(handler=command_status)
+
+    imports = commands.add_parser(
+        'import', help="import contacts from a file",
+        description="Create the contacts of a CSV or NDJSON file. Contacts already on the account "
+                    "are skipped, so running the same command again resumes an interrupted import.",
+    )
+    imports.add_argument('file', help="The CSV or NDJSON contacts file.")
+    imports.add_argument('--format', choices=('csv', 'ndjson', 'json'), help="The file format, if not the extension's.")
+    imports.add_argument('--group-id', help="Add the contacts to this group.")
+    imports.add_argument('--country-code', help="Normalize numbers to E.164 with this default country code.")
+    imports.add_argument('--no-skip-existing', action='store_true', help="Do not look up existing contacts.")
+    imports.add_argument('--report', help="Write the outcome of every row to this CSV file.")
+    imports.add_argument('-w', '--workers', type=int, default=bulk.DEFAULT_MAX_WORKERS,
+                         help="The contacts created in parallel.")
+    _add_common(imports)
+    imports.set_defaults(handler=command_import)
+
+    balance = commands.add_parser('balance', help="print the SMS credit balance")
+    _add_common(balance)
+    balance.set_defaults(handler=command_balance)
+    return parser
+
+
+def main(argv=None):
+    """Run the ``passinfo`` command.
+
+    Args:
+        argv (list, optional): The command-line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns:
+        int: The exit code: 0 on success, 1 if some recipients, rows or IDs
+            did not succeed, 2 on an error, 130 if interrupted.
+
+    Example:
+        $ export PASSINFO_API_KEY=... PASSINFO_CLIENT_ID=...
+        $ passinfo send "Soldes ce week-end !" --sender MyApp --recipients clients.csv --rate 50
+        $ passinfo status --state clients.csv.passinfo.db --watch --output statuses.csv
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (PassInfoSDKError, OSError, ValueError) as e:
+        print(f"passinfo: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+
+if __name__ == '__main__':
+    sys.exit(main())
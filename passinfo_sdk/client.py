@@ -1,6 +1,47 @@
+import itertools
+import logging
+import threading
+import time
+import zlib
+
 import requests
-import json
-from .exceptions import PassInfoAPIError
+from requests.adapters import HTTPAdapter
+
+from . import bulk
+from .codec import BulkPayload, get_codec
+from .exceptions import BalanceUnknownError, InsufficientCreditsError, PassInfoAPIError
+from .phone import DedupeResult
+from .ratelimit import SEND, endpoint_family
+from .retry import RetryPolicy, parse_retry_after
+from .segments import CostEstimate, message_cost
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+# Request bodies smaller than this are sent uncompressed: below a few
+# kilobytes, gzip saves little and costs a round of CPU for every request.
+DEFAULT_COMPRESSION_THRESHOLD = 8192
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# Pre-send balance check modes.
+REFUSE = 'refuse'
+TRUNCATE = 'truncate'
+
+
+def _wire_length(response):
+    # The size of the response body as received, before decompression.
+    try:
+        return response.raw.tell()
+    except AttributeError:
+        return len(response.content)
+
+
+def _gzip(data, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
 
 class PassInfoSDKClient:
     """A client for interacting with the PassInfo API to send messages.
@@ -15,10 +56,17 @@ class PassInfoSDKClient:
     API interactions. It requires valid API credentials (api_key and client_id) which
     can be obtained from your PassInfo dashboard.
 
+    Requests are sent through a long-lived, pooled HTTP session, so consecutive calls
+    reuse open keep-alive connections instead of performing a new TCP and TLS
+    handshake each time. A single client can be shared between threads. Call
+    ``close()`` (or use the client as a context manager) to release the pooled
+    connections when the client is no longer needed.
+
     Attributes:
         api_key (str): The API key for authentication with PassInfo API.
         client_id (str): Your unique client identifier for the PassInfo platform.
         base_url (str): The base URL for the PassInfo API endpoints.
+        timeout (float or tuple): The timeout applied to every request, or None.
 
     Example:
         >>> # Initialize the client
@@ -41,9 +89,20 @@ class PassInfoSDKClient:
         ...     sender_name="MyApp",
         ...     contacts=contacts
         ... )
+        >>>
+        >>> # Release pooled connections automatically
+        >>> with PassInfoSDKClient("your-api-key", "your-client-id") as client:
+        ...     client.send_message("Hi!", "1234567890", "MyApp")
     """
     
-    def __init__(self, api_key, client_id, base_url="https://api.passinfo.net"):
+    def __init__(self, api_key, client_id, base_url="https://api.passinfo.net",
+                 pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=False, keep_alive=True, timeout=None, retry_policy=None,
+                 circuit_breaker=None, rate_limiter=None, concurrency_limiter=None, cache=None,
+                 metrics=None, phone_normalizer=None, balance_check=None, credits_per_segment=1,
+                 balance_tracker=None, codec=None, compression=True,
+                 compression_threshold=DEFAULT_COMPRESSION_THRESHOLD,
+                 compression_level=DEFAULT_COMPRESSION_LEVEL, duplicate_filter=None):
         """Initialize a new PassInfo SDK client instance.
 
         Args:
@@ -56,23 +115,180 @@ class PassInfoSDKClient:
             base_url (str, optional): The base URL for the PassInfo API endpoints.
                 Use this to specify a different API environment (e.g., staging or testing).
                 Defaults to "https://api.passinfo.net".
+            pool_connections (int, optional): The number of per-host connection pools
+                kept by the session. Defaults to 10.
+            pool_maxsize (int, optional): The maximum number of connections kept open
+                to a single host. Raise this when sharing the client between many
+                threads. Defaults to 10.
+            pool_block (bool, optional): When True, a thread waits for a free
+                connection once ``pool_maxsize`` connections to a host are in use,
+                instead of opening a temporary extra one. Defaults to False.
+            keep_alive (bool, optional): Whether connections are kept open between
+                requests. Set to False to close each connection after its response.
+                Defaults to True.
+            timeout (float or tuple, optional): Connect/read timeout in seconds applied
+                to every request, as accepted by ``requests``. Defaults to None (no
+                timeout).
+            retry_policy (RetryPolicy, optional): Controls how transient failures
+                (rate limiting, server errors, connection errors) are retried.
+                Defaults to ``RetryPolicy()``, which never repeats a message send
+                that the server may already have accepted. Pass
+                ``RetryPolicy(max_retries=0)`` to disable retries.
+            circuit_breaker (CircuitBreaker, optional): A breaker that makes requests
+                fail fast with ``CircuitOpenError`` while the API is degraded. It can
+                be shared between clients. Defaults to None (disabled).
+            rate_limiter (RateLimiter, optional): A client-side rate limiter applied
+                to every request, with separate budgets for sends, status lookups
+                and account calls. It can be shared between clients, and between
+                processes when created with ``shared_dir``. Defaults to None.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): Bounds the
+                number of message sends in flight and adapts that bound (AIMD) to
+                the latency, 429s and server errors observed. Chunked and streaming
+                bulk sends use ``max_limit`` worker threads by default when a
+                limiter is set. Defaults to None.
+            cache (ResponseCache, optional): Caches the responses of read-mostly
+                GET endpoints and revalidates them with ETag / If-Modified-Since.
+                Mutations sent through the client invalidate the entries they
+                may affect. It can be shared between clients. Defaults to None.
+            metrics (ClientMetrics, optional): Records the count, errors, retries
+                and latency of every request. Defaults to None.
+            phone_normalizer (PhoneNormalizer, optional): When set, recipients
+                are converted to canonical E.164 form before sending; bulk sends
+                also drop invalid and duplicate numbers. Defaults to None.
+            balance_check (str, optional): Compare the cost of each send, computed
+                locally from the message encoding and segment count, with the
+                account balance before sending anything. 'refuse' raises
+                ``InsufficientCreditsError`` when the balance is too low;
+                'truncate' sends bulk messages to as many recipients as the
+                balance covers and refuses the rest. Defaults to None (no check).
+            credits_per_segment (float, optional): The credits charged per SMS
+                segment, used by the balance check. Defaults to 1.
+            balance_tracker (BalanceTracker, optional): Caches the balance and
+                decrements it locally as sends are accepted, so that balance
+                checks do not each cost a request. Defaults to None.
+            codec (str or JSONCodec, optional): The JSON library used to encode
+                request bodies and decode responses: 'orjson', 'ujson' or
+                'json'. Defaults to the fastest one installed.
+            compression (bool, optional): Gzip request bodies of at least
+                ``compression_threshold`` bytes, and accept gzip-compressed
+                responses. If the API answers a compressed body with 415
+                Unsupported Media Type, the request is sent again uncompressed
+                and request compression is turned off for the client. Set to
+                False to send and receive everything uncompressed. Defaults to True.
+            compression_threshold (int, optional): The smallest request body, in
+                bytes, that is compressed. Defaults to 8192.
+            compression_level (int, optional): The gzip level, from 1 (fastest)
+                to 9 (smallest). Defaults to 6.
+            duplicate_filter (DuplicateSendFilter, optional): Suppresses or flags
+                single, bulk and group sends identical to one made within its
+                window. Defaults to None.
 
         Example:
             >>> client = PassInfoSDKClient(
             ...     api_key="your-api-key-here",
             ...     client_id="your-client-id",
-            ...     base_url="https://api.passinfo.net"
+            ...     base_url="https://api.passinfo.net",
+            ...     pool_maxsize=50
             ... )
         """
         self.api_key = api_key
         self.base_url = base_url
         self.client_id = client_id
+        self.timeout = timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.cache = cache
+        self.metrics = metrics
+        self.phone_normalizer = phone_normalizer
+        if balance_check not in (None, REFUSE, TRUNCATE):
+            raise ValueError("balance_check must be None, 'refuse' or 'truncate'")
+        self.balance_check = balance_check
+        self.credits_per_segment = credits_per_segment
+        self.balance_tracker = balance_tracker
+        self.codec = get_codec(codec)
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+        self._compress_requests = compression
+        self.duplicate_filter = duplicate_filter
+        if balance_tracker is not None and balance_tracker.client is None:
+            balance_tracker.client = self
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._headers = None
+        self._headers_key = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the pooled HTTP session and release its connections.
+
+        The client can still be used after ``close()``; a new session is opened
+        on the next request.
+        """
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+    @property
+    def session(self):
+        """requests.Session: The pooled session used for all requests, created on first use."""
+        session = self._session
+        if session is None:
+            with self._session_lock:
+                session = self._session
+                if session is None:
+                    session = self._session = self._create_session()
+        return session
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.verify = True
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        if not self.compression:
+            session.headers["Accept-Encoding"] = "identity"
+        return session
+
+    def _auth_headers(self):
+        # Rebuilt only when the credentials change (e.g. after an API key rotation).
+        key = (self.api_key, self.client_id)
+        if self._headers_key != key:
+            self._headers = {
+                "Api-Key": str(self.api_key),
+                "Client-Id": str(self.client_id),
+                "Content-Type": 'application/json',
+                "Accept": 'application/json'
+            }
+            self._headers_key = key
+        return self._headers
         
-    def _make_request(self, method, endpoint, params=None, data=None):
+    def _make_request(self, method, endpoint, params=None, data=None, headers=None):
         """Makes an HTTP request to the PassInfo API endpoint.
 
         This internal method handles all HTTP communication with the PassInfo API,
         including request formatting, header management, and error handling.
+        Transient failures are retried according to ``retry_policy``, and the
+        request is refused up front while ``circuit_breaker`` is open. GET requests
+        to endpoints cached by ``cache`` are answered from it while fresh.
 
         Args:
             method (str): The HTTP method to use for the request (e.g., 'GET', 'POST',
@@ -84,15 +300,23 @@ class PassInfoSDKClient:
             params (dict, optional): URL query parameters to include in the request.
                 These are added to the URL after the '?' character. For example,
                 {'limit': 10, 'offset': 20}. Defaults to None.
-            data (dict, optional): The request body data to send, which will be
-                serialized to JSON. This is typically used for POST/PUT requests
-                to send data to the API. Defaults to None.
+            data (dict or bytes, optional): The request body data to send, which will be
+                serialized to JSON with the client's ``codec``. Bytes are sent as
+                is, e.g. a body built by ``BulkPayload``. This is typically used
+                for POST/PUT requests to send data to the API. Defaults to None.
+            headers (dict, optional): Extra headers sent with the request, e.g.
+                an ``Idempotency-Key``. Defaults to None.
 
         Raises:
             PassInfoAPIError: Raised when the API request fails for any reason,
                 including network errors, authentication failures, or invalid
                 responses. The error will include the HTTP status code (if available)
-                and a descriptive error message.
+                and a descriptive error message. Transient errors are only raised
+                once the retries allowed by ``retry_policy`` are exhausted.
+            CircuitOpenError: Raised without contacting the API while the circuit
+                breaker is open.
+            RateLimitError: Raised without contacting the API when the rate
+                limiter is non-blocking and the endpoint's budget is exhausted.
 
         Returns:
             dict: The parsed JSON response from the API. The exact structure depends
@@ -110,26 +334,165 @@ class PassInfoSDKClient:
             {'status': 'success', 'message_id': '123'}
         """
         
-        headers = {
-            "Api-Key": str(self.api_key),
-            "Client-Id": str(self.client_id),
-            "Content-Type": 'application/json',
-            "Accept": 'application/json'
-        }
-        
         url = f"{self.base_url}/{endpoint}"
 
+        cache = self.cache
+        cache_key = entry = None
+        if cache is not None and method == 'GET':
+            cache_key = cache.key(self.client_id, endpoint, params)
+            if cache_key is not None:
+                entry = cache.get(cache_key)
+                if entry is not None:
+                    if entry.fresh:
+                        if self.metrics is not None:
+                            self.metrics.record_cached(endpoint)
+                        return entry.value()
+                    headers = {**(headers or {}), **entry.conditional_headers()}
+
+        if data is not None and not isinstance(data, bytes):
+            data = self.codec.dumps(data)
+        body = data
+        if body is not None and self._compress_requests and len(body) >= self.compression_threshold:
+            body = self._compress(endpoint, body)
+        if body is not data:
+            headers = {**(headers or {}), "Content-Encoding": "gzip"}
+
+        policy = self.retry_policy
+        breaker = self.circuit_breaker
+        metrics = self.metrics
+        attempt = 0
+
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+            if breaker is not None:
+                breaker.before_request()
+            started = time.monotonic()
+            try:
+                response = self._send(method, url, endpoint, params, body, headers)
+            except requests.exceptions.RequestException as e:
+                if metrics is not None:
+                    metrics.record_request(endpoint, None, time.monotonic() - started)
+                if breaker is not None:
+                    breaker.record_failure()
+                delay = None
+                if policy.should_retry(attempt, method, endpoint, error=e):
+                    delay = policy.backoff(attempt)
+                if delay is not None:
+                    if metrics is not None:
+                        metrics.record_retry(endpoint)
+                    logger.debug("Retrying %s %s in %.2fs after error: %s", method, endpoint, delay, e)
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                logger.warning("PassInfo API request %s %s failed: %s", method, endpoint, e)
+                raise PassInfoAPIError(
+                    status_code=getattr(e.response, 'status_code', 500),
+                    message=f"API request failed: {str(e)}"
+                )
+
+            status_code = response.status_code
+            if metrics is not None:
+                metrics.record_request(endpoint, status_code, time.monotonic() - started)
+                metrics.record_transfer(endpoint, len(body) if body is not None else 0,
+                                        _wire_length(response), len(response.content))
+            if breaker is not None:
+                if status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if status_code == 415 and body is not data:
+                # The API does not accept compressed bodies: stop compressing.
+                logger.warning("PassInfo API refused a gzip request body; request compression is disabled")
+                self._compress_requests = False
+                body = data
+                headers = {key: value for key, value in headers.items() if key != "Content-Encoding"} or None
+                response.close()
+                continue
+            if cache is not None and method != 'GET':
+                cache.invalidate_for(endpoint)
+
+            if status_code in policy.retry_statuses:
+                delay = None
+                if policy.should_retry(attempt, method, endpoint, status_code=status_code):
+                    delay = policy.backoff(attempt, parse_retry_after(response.headers.get('Retry-After')))
+                if delay is not None:
+                    if metrics is not None:
+                        metrics.record_retry(endpoint)
+                    logger.debug("Retrying %s %s in %.2fs after status %s", method, endpoint, delay, status_code)
+                    response.close()
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                raise PassInfoAPIError(
+                    status_code=status_code,
+                    message=f"API request failed with status {status_code}: {response.text[:200]}"
+                )
+
+            if status_code == 304 and entry is not None:
+                return cache.revalidated(cache_key, entry, response.headers).value()
+
+            try:
+                result = self.codec.loads(response.content)
+            except ValueError as e:
+                raise PassInfoAPIError(
+                    status_code=status_code if status_code >= 400 else 500,
+                    message=f"API request failed: {str(e)}"
+                )
+            if cache_key is not None and status_code == 200:
+                cache.store(cache_key, endpoint, response.content, response.headers)
+            return result
+            
+    def _compress(self, endpoint, data):
+        # Returns the gzip-compressed body, or ``data`` itself if compressing
+        # does not make it smaller.
+        started = time.monotonic()
+        compressed = _gzip(data, self.compression_level)
+        if self.metrics is not None:
+            self.metrics.record_compression(endpoint, len(data), len(compressed), time.monotonic() - started)
+        return compressed if len(compressed) < len(data) else data
+
+    def _send(self, method, url, endpoint, params, data, headers=None):
+        if headers:
+            headers = {**self._auth_headers(), **headers}
+        else:
+            headers = self._auth_headers()
+        # Message sends go through the adaptive concurrency limiter, which learns
+        # from each response how many requests the API currently accepts.
+        limiter = self.concurrency_limiter
+        if limiter is None or endpoint_family(endpoint) != SEND:
+            return self.session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                data=data,
+                timeout=self.timeout,
+            )
+        limiter.acquire()
+        started = time.monotonic()
+        congested = True
         try:
-            response = requests.request(method=method, url=url, headers=headers, params=params, json=data, verify=True)
-            # print(response.json())
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(e)
-            raise PassInfoAPIError(
-                status_code=getattr(e.response, 'status_code', 500),
-                message=f"API request failed: {str(e)}"
+            response = self.session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                data=data,
+                timeout=self.timeout,
             )
-            
+            congested = response.status_code == 429 or response.status_code >= 500
+            return response
+        finally:
+            limiter.release(time.monotonic() - started, congested=congested)
+
+    def _dispatch_workers(self, max_workers):
+        if max_workers is not None:
+            return max_workers
+        if self.concurrency_limiter is not None:
+            return self.concurrency_limiter.max_limit
+        return bulk.DEFAULT_MAX_WORKERS
+
     def send_message(self, message, contact, sender_name):
         """Send a single message to a specific contact through the PassInfo platform.
 
@@ -151,6 +514,10 @@ class PassInfoSDKClient:
                 - If contact is None (status_code=400)
                 - If sender_name is None (status_code=400)
                 - If the API request fails (status_code varies)
+            InsufficientCreditsError: If ``balance_check`` is set and the balance
+                does not cover the message.
+            DuplicateSendError: If the ``duplicate_filter`` is in 'suppress' mode
+                and the same send was made within its window.
 
         Returns:
             dict: The API response containing the status of the message send operation.
@@ -172,13 +539,42 @@ class PassInfoSDKClient:
             raise PassInfoAPIError(status_code=400, message="Contact is required.")
         elif sender_name is None:
             raise PassInfoAPIError(status_code=400, message="Sender name is required.")
-        
+        if self.phone_normalizer is not None:
+            normalized = self.phone_normalizer.normalize(contact)
+            if normalized is None:
+                raise PassInfoAPIError(status_code=400, message=f"Invalid phone number: {contact!r}.")
+            contact = normalized
+        return self._filtered_send('single', message, contact, sender_name,
+                                   lambda: self._send_single(message, contact, sender_name))
+
+    def _send_single(self, message, contact, sender_name, check_balance=True):
+        # Callers that checked the cost of a whole send up front pass
+        # check_balance=False to skip the per-message balance lookup.
+        if check_balance and self.balance_check is not None:
+            self.check_credits(self.estimate_cost(message))
         data = dict(
             message=message,
             contact=contact,
             senderName=sender_name,
         )
-        return self._make_request(method='POST', endpoint='v1/message/single_message', data=data)
+        response = self._make_request(method='POST', endpoint='v1/message/single_message', data=data)
+        if bulk._accepted(response):
+            self._debit(message, 1)
+        return response
+
+    def _filtered_send(self, kind, message, target, sender_name, send):
+        # Runs ``send`` through the duplicate filter, if any. Only sends the
+        # API accepted make later repeats duplicates.
+        duplicate_filter = self.duplicate_filter
+        if duplicate_filter is None:
+            return send()
+        fingerprint = duplicate_filter.begin(kind, message, target, sender_name)
+        response = None
+        try:
+            response = send()
+        finally:
+            duplicate_filter.end(fingerprint, bulk._accepted(response))
+        return response
     
     def send_message_bulk(self, message, sender_name, contacts):
         """Send a message to multiple contacts simultaneously through the PassInfo platform.
@@ -194,14 +590,19 @@ class PassInfoSDKClient:
                 to all recipients. This helps recipients identify who sent the message.
             contacts (list): A list of contact identifiers (e.g., phone numbers) who
                 should receive the message. Each contact should be in a format accepted
-                by the PassInfo platform.
+                by the PassInfo platform. With a ``phone_normalizer``, invalid and
+                duplicate numbers are dropped before sending.
 
         Raises:
             PassInfoAPIError: Raised in the following cases:
                 - If message is None (status_code=400)
-                - If contacts is None or empty (status_code=400)
+                - If contacts is None or empty, or holds no valid number (status_code=400)
                 - If sender_name is None (status_code=400)
                 - If the API request fails (status_code varies)
+            InsufficientCreditsError: If ``balance_check`` is set and the balance
+                does not cover the send (or, with 'truncate', a single message).
+            DuplicateSendError: If the ``duplicate_filter`` is in 'suppress' mode
+                and the same send was made within its window.
 
         Returns:
             dict: The API response containing the status of the bulk message send
@@ -225,15 +626,299 @@ class PassInfoSDKClient:
             raise PassInfoAPIError(status_code=400, message="Contacts are required.")
         elif sender_name is None:
             raise PassInfoAPIError(status_code=400, message="Sender name is required.")
-        
-        data = dict(
-            message=message,
-            contacts=contacts,
-            senderName=sender_name,
-        )
-        return self._make_request(method='POST', endpoint='v1/message/send_bulk_contacts_messages', data=data)
+        if self.phone_normalizer is not None:
+            contacts = list(self._normalized_contacts(contacts))
+            if not contacts:
+                raise PassInfoAPIError(status_code=400, message="Contacts hold no valid phone number.")
+        else:
+            contacts = list(contacts)
+
+        def send():
+            recipients = contacts
+            if self.balance_check is not None:
+                recipients = list(self._plan_send(message, recipients)[0])
+            return self._send_bulk(message, sender_name, recipients)
+
+        return self._filtered_send('bulk', message, '\n'.join(map(str, contacts)), sender_name, send)
+
+    def _send_bulk(self, message, sender_name, contacts, payload=None, idempotency_key=None):
+        if payload is None:
+            payload = BulkPayload(message, sender_name, self.codec)
+        data = payload.encode(contacts)
+        headers = {'Idempotency-Key': idempotency_key} if idempotency_key is not None else None
+        response = self._make_request(method='POST', endpoint='v1/message/send_bulk_contacts_messages',
+                                      data=data, headers=headers)
+        if self.balance_tracker is not None and bulk._accepted(response):
+            sent = response.get('successful_sends') if isinstance(response, dict) else None
+            self._debit(message, sent if isinstance(sent, int) else len(contacts))
+        return response
+
+    def estimate_cost(self, message, recipients=1):
+        """Estimate locally the credits needed to send ``message`` to ``recipients`` recipients.
+
+        No request is made: the cost is computed from the encoding (GSM-7 or
+        UCS-2) and segment count of the message, and ``credits_per_segment``.
+        Use ``segments.estimate_messages`` for personalized texts.
+
+        Returns:
+            CostEstimate: The number of messages, segments and credits.
+        """
+        return CostEstimate(self.credits_per_segment).add(message_cost(message), recipients)
+
+    def check_credits(self, estimate):
+        """Check that the account balance covers a planned send.
+
+        Args:
+            estimate (CostEstimate): The cost of the send, e.g. from
+                ``estimate_cost`` or ``segments.estimate_messages``.
+
+        Raises:
+            InsufficientCreditsError: If the balance is lower than the cost.
+            BalanceUnknownError: If the balance cannot be retrieved.
+
+        Returns:
+            float: The balance before the send.
+        """
+        available = self.get_balance()
+        if estimate.credits > available:
+            raise InsufficientCreditsError(required=estimate.credits, available=available)
+        return available
+
+    def _plan_send(self, message, contacts):
+        # Applies the balance check to a one-text send. Returns the contacts to
+        # send, the estimate of what will be sent (None if the count is unknown)
+        # and whether recipients were left out.
+        cost = message_cost(message)
+        per_message = cost.segments * self.credits_per_segment
+        available = self.get_balance()
+        sized = isinstance(contacts, (list, tuple))
+        if self.balance_check == TRUNCATE:
+            affordable = int(available // per_message)
+            if affordable < 1:
+                raise InsufficientCreditsError(required=per_message, available=available)
+            if not sized:
+                return itertools.islice(contacts, affordable), None, None
+            truncated = len(contacts) > affordable
+            if truncated:
+                logger.warning("The balance of %s credits covers %d of %d recipients; the send is truncated",
+                               available, affordable, len(contacts))
+                contacts = contacts[:affordable]
+            return contacts, CostEstimate(self.credits_per_segment).add(cost, len(contacts)), truncated
+        if not sized:
+            contacts = list(contacts)
+        estimate = CostEstimate(self.credits_per_segment).add(cost, len(contacts))
+        if estimate.credits > available:
+            raise InsufficientCreditsError(required=estimate.credits, available=available)
+        return contacts, estimate, False
+
+    def _normalized_contacts(self, contacts, report=None):
+        # Streams the distinct valid numbers of ``contacts`` and logs what was dropped.
+        report = report if report is not None else DedupeResult()
+        yield from self.phone_normalizer.iter_unique(contacts, report)
+        if report.invalid or report.duplicates:
+            logger.warning("Dropped %d invalid and %d duplicate phone numbers from a bulk send",
+                           len(report.invalid), report.duplicates)
     
-    def send_message_group(self, message, sender_name, group_id):
+    def send_message_templated(self, template, sender_name, recipients,
+                               chunk_size=bulk.DEFAULT_CHUNK_SIZE, max_workers=None):
+        """Send a personalized message, rendered from a template, to many recipients.
+
+        Recipients whose rendered messages are identical share bulk requests,
+        so a template with few distinct renderings (e.g. 'Bonjour {first_name}')
+        costs a handful of requests instead of one per recipient. See
+        ``templates.send_templated`` for the details.
+
+        Args:
+            template (MessageTemplate or str): The message template, with named
+                fields in ``str.format`` syntax.
+            sender_name (str): The name that will appear as the sender of the message.
+            recipients (iterable): ``Contact`` objects, dicts holding
+                'phone_number' and the variables, or (recipient, variables) pairs.
+            chunk_size (int, optional): The maximum number of recipients per bulk
+                request. Defaults to 1000.
+            max_workers (int, optional): The number of requests sent in parallel.
+                Defaults to 8, or to the ``max_limit`` of the concurrency limiter.
+
+        Raises:
+            PassInfoAPIError: If sender_name or recipients is None (status_code=400).
+            InsufficientCreditsError: If ``balance_check`` is set and the balance
+                does not cover every rendered message.
+
+        Returns:
+            TemplatedSendResult: The outcome of the send, including the failed
+                requests and the recipients that could not be rendered.
+
+        Example:
+            >>> client = PassInfoSDKClient('api_key', 'client_id')
+            >>> result = client.send_message_templated(
+            ...     template='Bonjour {first_name}, -20% ce soir !',
+            ...     sender_name='MyApp',
+            ...     recipients=api.iter_contacts(page_size=500)
+            ... )
+            >>> print(result.texts, "texts sent in", result.requests, "requests")
+        """
+        from .templates import send_templated
+
+        return send_templated(self, template, sender_name, recipients,
+                              chunk_size=chunk_size, max_workers=max_workers)
+
+    def send_message_bulk_chunked(self, message, sender_name, contacts,
+                                  chunk_size=bulk.DEFAULT_CHUNK_SIZE, max_workers=None):
+        """Send a message to a very large list of contacts in concurrent chunks.
+
+        The contact list is split into chunks of at most ``chunk_size`` contacts.
+        Each chunk is sent with ``send_message_bulk`` on a pool of ``max_workers``
+        threads, and the individual responses are merged into a single result.
+        Only ``max_workers`` chunks are held in flight at a time, so memory use
+        stays bounded regardless of the size of the list.
+
+        A chunk that fails does not stop the others: it is recorded in
+        ``failed_chunks`` on the result and can be sent again with
+        ``resend_failed_chunks``.
+
+        Args:
+            message (str): The content of the message to be sent to every contact.
+            sender_name (str): The name that will appear as the sender of the message.
+            contacts (iterable): The contact identifiers (e.g., phone numbers) who
+                should receive the message. With a ``phone_normalizer``, invalid
+                and duplicate numbers are dropped and listed on the result.
+            chunk_size (int, optional): The maximum number of contacts sent in a
+                single API request. Defaults to 1000.
+            max_workers (int, optional): The number of chunks sent in parallel.
+                Defaults to 8, or to the ``max_limit`` of the concurrency limiter.
+
+        Raises:
+            PassInfoAPIError: Raised in the following cases:
+                - If message is None (status_code=400)
+                - If contacts is None or empty (status_code=400)
+                - If sender_name is None (status_code=400)
+            InsufficientCreditsError: If ``balance_check`` is set and the balance
+                does not cover the send; nothing is sent. With 'refuse', an
+                iterator of contacts is read into a list to be counted first.
+
+        Returns:
+            BulkSendResult: The merged outcome of all chunks, including the batch
+                IDs of the accepted chunks and the chunks that failed.
+
+        Example:
+            >>> client = PassInfoSDKClient('api_key', 'client_id')
+            >>> result = client.send_message_bulk_chunked(
+            ...     message='Join our event tomorrow!',
+            ...     sender_name='MyApp',
+            ...     contacts=campaign_contacts,
+            ...     chunk_size=1000,
+            ...     max_workers=16
+            ... )
+            >>> print(result.batch_ids)
+            ['batch_1', 'batch_2', ...]
+            >>> if not result.ok:
+            ...     result = client.resend_failed_chunks(result)
+        """
+        if message is None:
+            raise PassInfoAPIError(status_code=400, message="Message is required.")
+        elif contacts is None:
+            raise PassInfoAPIError(status_code=400, message="Contacts are required.")
+        elif sender_name is None:
+            raise PassInfoAPIError(status_code=400, message="Sender name is required.")
+
+        result = bulk.BulkSendResult(message, sender_name)
+        if self.phone_normalizer is not None:
+            contacts = self._normalized_contacts(contacts, result.normalization)
+        if self.balance_check is not None:
+            contacts, result.estimate, result.truncated = self._plan_send(message, contacts)
+        chunks = bulk.iter_chunks(contacts, chunk_size)
+        for chunk in bulk.dispatch_chunks(self, message, sender_name, chunks, self._dispatch_workers(max_workers)):
+            result.add(chunk)
+        if result.total_contacts == 0:
+            raise PassInfoAPIError(status_code=400, message="Contacts are required.")
+        return result
+
+    def stream_message_bulk(self, message, sender_name, recipients, batch_size=bulk.DEFAULT_CHUNK_SIZE,
+                            max_workers=None, column=bulk.DEFAULT_RECIPIENT_COLUMN,
+                            format=None):
+        """Stream a bulk send from an iterator or a CSV/NDJSON file.
+
+        Recipients are read lazily and grouped into batches of ``batch_size``.
+        A new batch is only read once one of the ``max_workers`` in-flight
+        batches has completed and its result has been consumed, so memory use
+        stays flat no matter how large the input is. Nothing is sent until the
+        returned iterator is consumed.
+
+        Args:
+            message (str): The content of the message to be sent to every recipient.
+            sender_name (str): The name that will appear as the sender of the message.
+            recipients: A path to a CSV or NDJSON file, or any iterable (list,
+                generator, ...) of phone numbers, dicts or ``Contact`` objects.
+                With a ``phone_normalizer``, invalid and duplicate numbers are
+                skipped.
+            batch_size (int, optional): The maximum number of recipients sent in a
+                single API request. Defaults to 1000.
+            max_workers (int, optional): The number of batches sent in parallel.
+                Defaults to 8, or to the ``max_limit`` of the concurrency limiter.
+            column (str, optional): The field holding the phone number in dict
+                records and CSV headers. Defaults to 'phone_number'.
+            format (str, optional): 'csv' or 'ndjson' when ``recipients`` is a
+                path. Detected from the file extension when omitted.
+
+        Raises:
+            PassInfoAPIError: Raised in the following cases:
+                - If message is None (status_code=400)
+                - If recipients is None (status_code=400)
+                - If sender_name is None (status_code=400)
+            InsufficientCreditsError: If ``balance_check`` is set and the balance
+                does not cover the send. With 'refuse', the recipients are read
+                (and held in memory) up front to be counted; 'truncate' keeps
+                the stream lazy and stops at the last affordable recipient.
+
+        Returns:
+            iterator: Yields a ``BulkChunk`` for each batch as soon as it
+                completes. Failed batches keep their contacts and carry the error.
+
+        Example:
+            >>> client = PassInfoSDKClient('api_key', 'client_id')
+            >>> for batch in client.stream_message_bulk(
+            ...     message='Join our event tomorrow!',
+            ...     sender_name='MyApp',
+            ...     recipients='recipients.csv'
+            ... ):
+            ...     if not batch.ok:
+            ...         log_failed(batch.contacts, batch.error)
+        """
+        if message is None:
+            raise PassInfoAPIError(status_code=400, message="Message is required.")
+        elif recipients is None:
+            raise PassInfoAPIError(status_code=400, message="Contacts are required.")
+        elif sender_name is None:
+            raise PassInfoAPIError(status_code=400, message="Sender name is required.")
+
+        contacts = bulk.iter_recipients(recipients, column=column, format=format)
+        if self.phone_normalizer is not None:
+            contacts = self._normalized_contacts(contacts)
+        if self.balance_check is not None:
+            contacts = self._plan_send(message, contacts)[0]
+        chunks = bulk.iter_chunks(contacts, batch_size)
+        return bulk.dispatch_chunks(self, message, sender_name, chunks, self._dispatch_workers(max_workers))
+
+    def resend_failed_chunks(self, result, max_workers=None):
+        """Send the failed chunks of a previous chunked bulk send again.
+
+        Args:
+            result (BulkSendResult): The result returned by
+                ``send_message_bulk_chunked`` (or by a previous resend).
+            max_workers (int, optional): The number of chunks sent in parallel.
+                Defaults to 8, or to the ``max_limit`` of the concurrency limiter.
+
+        Returns:
+            BulkSendResult: The outcome of the resend. Chunks keep their original
+                index, and chunks that fail again are listed in ``failed_chunks``.
+        """
+        retry = bulk.BulkSendResult(result.message, result.sender_name)
+        chunks = [bulk.BulkChunk(chunk.index, chunk.contacts) for chunk in result.failed_chunks]
+        for chunk in bulk.dispatch_chunks(self, result.message, result.sender_name, chunks, self._dispatch_workers(max_workers)):
+            retry.add(chunk)
+        return retry
+
+    def send_message_group(self, message, sender_name, group_id, group_size=None):
         """Send a message to a predefined group of contacts through the PassInfo platform.
 
         This method sends a message to all contacts that are members of the specified
@@ -247,6 +932,9 @@ class PassInfoSDKClient:
                 to all group members. This helps recipients identify who sent the message.
             group_id (str): The unique identifier of the group to send the message to.
                 This ID can be obtained from your PassInfo dashboard.
+            group_size (int, optional): The number of members of the group, used
+                by the balance check. When omitted, the check only ensures that
+                a single message is affordable. Defaults to None.
 
         Raises:
             PassInfoAPIError: Raised in the following cases:
@@ -254,6 +942,10 @@ class PassInfoSDKClient:
                 - If sender_name is None (status_code=400)
                 - If group_id is None (status_code=400)
                 - If the API request fails (status_code varies)
+            InsufficientCreditsError: If ``balance_check`` is set and the balance
+                does not cover the group.
+            DuplicateSendError: If the ``duplicate_filter`` is in 'suppress' mode
+                and the same send was made within its window.
 
         Returns:
             dict: The API response containing the status of the group message send
@@ -277,12 +969,23 @@ class PassInfoSDKClient:
             raise PassInfoAPIError(status_code=400, message="Sender name is required.")
         elif group_id is None:
             raise PassInfoAPIError(status_code=400, message="Group ID is required.")
-        
+        return self._filtered_send('group', message, group_id, sender_name,
+                                   lambda: self._send_group(message, sender_name, group_id, group_size))
+
+    def _send_group(self, message, sender_name, group_id, group_size):
+        if self.balance_check is not None:
+            self.check_credits(self.estimate_cost(message, group_size or 1))
         data = dict(
             message=message,
             senderName=sender_name,
         )
-        return self._make_request(method='POST', endpoint=f'v1/message/send_message_to_group/{group_id}', data=data)
+        response = self._make_request(method='POST', endpoint=f'v1/message/send_message_to_group/{group_id}', data=data)
+        if self.balance_tracker is not None and bulk._accepted(response):
+            if group_size is None:
+                self.balance_tracker.invalidate()
+            else:
+                self._debit(message, group_size)
+        return response
     
     def get_message_status(self, message_id):
         """Retrieve the status of a previously sent message.
@@ -428,16 +1131,47 @@ class PassInfoSDKClient:
         Note:
             - Regular balance checks are recommended to ensure sufficient credits
             - Consider implementing low balance alerts in your application
-            - A return value of 0 could indicate either no credits or an API error
+            - A return value of 0 could indicate either no credits or an API error;
+              use ``get_balance`` to tell them apart
+            - With a ``balance_tracker``, the cached balance is returned
         """
         try:
-            response = self._make_request(
-                method='GET',
-                endpoint='v1/user/get_solde'
-            )
-            return response.get('solde', 0)
+            return self.get_balance()
         except Exception:
             return 0
+
+    def get_balance(self):
+        """Get the remaining SMS credit balance, raising an error if it is unknown.
+
+        With a ``balance_tracker``, the tracker's cached value is returned and
+        the API is only contacted when it is missing or stale.
+
+        Raises:
+            BalanceUnknownError: If the balance cannot be read from the API.
+
+        Returns:
+            float: The number of SMS credits remaining in the account.
+        """
+        if self.balance_tracker is not None:
+            return self.balance_tracker.balance
+        try:
+            return self._fetch_balance()
+        except PassInfoAPIError as e:
+            raise BalanceUnknownError(f"The SMS balance could not be read: {e}") from e
+
+    def _fetch_balance(self):
+        response = self._make_request(
+            method='GET',
+            endpoint='v1/user/get_solde'
+        )
+        if not isinstance(response, dict) or response.get('solde') is None:
+            raise PassInfoAPIError(status_code=502, message="The API response holds no balance.")
+        return response['solde']
+
+    def _debit(self, message, count):
+        # Records the cost of ``count`` accepted messages in the balance tracker.
+        if self.balance_tracker is not None and count:
+            self.balance_tracker.debit(message_cost(message).segments * self.credits_per_segment * count)
     
     def renew_api_key(self):
         """Generate a new API key for the account.
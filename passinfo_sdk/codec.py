@@ -0,0 +1,172 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+# Fastest first: the default codec is the first one installed.
+PREFERENCE = ('orjson', 'ujson', 'json')
+
+
+class JSONCodec:
+    """Encodes request bodies and decodes response bodies.
+
+    Subclasses wrap one JSON library. ``dumps`` returns compact UTF-8 bytes,
+    ready to be sent as a request body; ``loads`` accepts bytes or str and
+    raises ``ValueError`` on invalid JSON, whatever the library.
+
+    Attributes:
+        name (str): The name of the library, as accepted by ``get_codec``.
+    """
+
+    name = None
+
+    def dumps(self, obj):
+        raise NotImplementedError
+
+    def loads(self, data):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class StdlibJSONCodec(JSONCodec):
+    """The standard library ``json`` module, always available."""
+
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """The ``orjson`` library, several times faster than ``json`` for large bodies.
+
+    Objects ``orjson`` cannot encode (e.g. integers wider than 64 bits) are
+    encoded with the standard library instead.
+    """
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed; pip install passinfo_sdk[fast]")
+        self._fallback = StdlibJSONCodec()
+
+    def dumps(self, obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return self._fallback.dumps(obj)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """The ``ujson`` library."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        if ujson is None:
+            raise ImportError("ujson is not installed; pip install ujson")
+
+    def dumps(self, obj):
+        return ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+_CODECS = {
+    'orjson': OrjsonCodec,
+    'ujson': UjsonCodec,
+    'json': StdlibJSONCodec,
+}
+_default = None
+
+
+def available_codecs():
+    """Return the names of the codecs whose library is installed, fastest first."""
+    installed = {'orjson': orjson is not None, 'ujson': ujson is not None, 'json': True}
+    return [name for name in PREFERENCE if installed[name]]
+
+
+def get_codec(codec=None):
+    """Return a JSON codec.
+
+    Args:
+        codec (str or JSONCodec, optional): 'orjson', 'ujson' or 'json', or a
+            codec instance, returned as is. Defaults to the fastest installed
+            library.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the library of the requested codec is not installed.
+
+    Returns:
+        JSONCodec: The codec.
+
+    Example:
+        >>> get_codec()
+        <OrjsonCodec orjson>
+        >>> get_codec('json').dumps({'message': 'Hello'})
+        b'{"message":"Hello"}'
+    """
+    global _default
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        if _default is None:
+            _default = _CODECS[available_codecs()[0]]()
+        return _default
+    try:
+        factory = _CODECS[codec]
+    except KeyError:
+        raise ValueError(f"Unknown JSON codec {codec!r}; expected one of {', '.join(PREFERENCE)}") from None
+    return factory()
+
+
+class BulkPayload:
+    """A bulk send request body whose constant part is encoded once.
+
+    A chunked bulk send posts the same message and sender name with every
+    chunk; only the contacts change. The body is built as the pre-encoded
+    ``{"message":...,"senderName":...,"contacts":`` prefix, followed by the
+    encoded contact list of the chunk, so a long message is serialized once
+    per send instead of once per chunk.
+
+    Attributes:
+        message (str): The message of the send.
+        sender_name (str): The sender name of the send.
+        prefix (bytes): The encoded constant part of the body.
+
+    Example:
+        >>> payload = BulkPayload('Hello!', 'MyApp')
+        >>> payload.encode(['+224622000001', '+224622000002'])
+        b'{"message":"Hello!","senderName":"MyApp","contacts":["+224622000001","+224622000002"]}'
+    """
+
+    __slots__ = ('message', 'sender_name', 'prefix', 'codec')
+
+    def __init__(self, message, sender_name, codec=None):
+        self.message = message
+        self.sender_name = sender_name
+        self.codec = get_codec(codec)
+        constant = self.codec.dumps({'message': message, 'senderName': sender_name})
+        self.prefix = constant[:-1] + b',"contacts":'
+
+    def encode(self, contacts):
+        """Return the full request body for ``contacts``, as bytes."""
+        return b''.join((self.prefix, self.codec.dumps(contacts), b'}'))
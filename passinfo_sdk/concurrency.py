@@ -0,0 +1,171 @@
+import collections
+import threading
+import time
+
+
+class AdaptiveConcurrencyLimiter:
+    """Adjusts the number of requests in flight from observed API behaviour.
+
+    The limiter implements AIMD (additive increase, multiplicative decrease),
+    as used by TCP congestion control. While requests succeed quickly, the
+    in-flight limit grows by ``increase`` for every ``limit`` completed requests
+    (about one step per round trip). When a request is rate limited (429) or
+    fails with a server or network error, or when the short-term latency rises
+    above ``latency_tolerance`` times the long-term latency (a sign that
+    requests are queueing at the API), the limit is multiplied by
+    ``decrease_factor``. At most one decrease is applied per round
+    trip, so a burst of failures from the same window only counts once.
+
+    The limiter is thread-safe. Callers ``acquire()`` a slot before sending and
+    ``release()`` it with the outcome afterwards; ``acquire()`` blocks while the
+    limit is reached.
+
+    Attributes:
+        min_limit (int): The lowest in-flight limit.
+        max_limit (int): The highest in-flight limit.
+        increase (float): The additive step applied per round trip of successes.
+        decrease_factor (float): The multiplier applied on congestion.
+        latency_tolerance (float): How much slower than the long-term latency the
+            short-term latency may become before it counts as congestion. None
+            disables the latency signal.
+
+    Example:
+        >>> limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=128)
+        >>> client = PassInfoSDKClient('api_key', 'client_id', concurrency_limiter=limiter)
+        >>> result = client.send_message_bulk_chunked('Hello', 'MyApp', contacts)
+        >>> print(limiter.limit, limiter.throughput)
+        42 310.5
+    """
+
+    def __init__(self, initial_limit=8, min_limit=1, max_limit=64, increase=1.0, decrease_factor=0.5,
+                 latency_tolerance=2.0, throughput_window=10.0):
+        """Initialize a new AdaptiveConcurrencyLimiter.
+
+        Args:
+            initial_limit (int, optional): The starting in-flight limit. Defaults to 8.
+            min_limit (int, optional): The lowest in-flight limit. Defaults to 1.
+            max_limit (int, optional): The highest in-flight limit. Defaults to 64.
+            increase (float, optional): The additive step per round trip. Defaults to 1.
+            decrease_factor (float, optional): The multiplicative cut on congestion.
+                Defaults to 0.5.
+            latency_tolerance (float, optional): The latency ratio treated as
+                congestion. Defaults to 2.0.
+            throughput_window (float, optional): The period in seconds over which
+                ``throughput`` is measured. Defaults to 10.
+        """
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.throughput_window = throughput_window
+        self._cond = threading.Condition()
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._long_latency = None
+        self._smoothed_latency = None
+        self._last_decrease = 0.0
+        self._completions = collections.deque()
+        self.completed = 0
+        self.congestion_events = 0
+
+    @property
+    def limit(self):
+        """int: The current in-flight limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        """int: The number of requests currently in flight."""
+        return self._in_flight
+
+    @property
+    def latency(self):
+        """float: The smoothed request latency in seconds, or None before any request."""
+        return self._smoothed_latency
+
+    @property
+    def throughput(self):
+        """float: Completed requests per second over the last ``throughput_window`` seconds."""
+        with self._cond:
+            now = time.monotonic()
+            self._expire(now)
+            total = sum(count for _, count in self._completions)
+        return total / self.throughput_window
+
+    def snapshot(self):
+        """Return the current limit, load and measurements as a dict."""
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'latency': self.latency,
+            'throughput': self.throughput,
+            'completed': self.completed,
+            'congestion_events': self.congestion_events,
+        }
+
+    def acquire(self, timeout=None):
+        """Wait for a free slot.
+
+        Args:
+            timeout (float, optional): The longest time to wait, in seconds.
+                Defaults to None (wait as long as needed).
+
+        Returns:
+            bool: True if a slot was taken, False if the timeout expired.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._in_flight < int(self._limit), timeout):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self, latency, congested=False):
+        """Free a slot and feed the outcome of its request into the limit.
+
+        Args:
+            latency (float): The duration of the request in seconds.
+            congested (bool, optional): True if the request was rate limited or
+                failed with a server or network error. Defaults to False.
+        """
+        with self._cond:
+            busy = self._in_flight
+            self._in_flight -= 1
+            now = time.monotonic()
+            self._record(now, latency)
+            if (not congested and self.latency_tolerance is not None
+                    and self._smoothed_latency > self._long_latency * self.latency_tolerance):
+                congested = True
+            if congested:
+                # One cut per round trip: failures from the same window share it.
+                if now - self._last_decrease >= (self._smoothed_latency or 0.0):
+                    self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+                    self._last_decrease = now
+                    self.congestion_events += 1
+            elif busy >= self._limit / 2:
+                # Only grow while the current limit is actually being used.
+                self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+            self._cond.notify_all()
+
+    def _record(self, now, latency):
+        self.completed += 1
+        if self._smoothed_latency is None:
+            self._smoothed_latency = self._long_latency = latency
+        else:
+            # The long-term average follows lasting changes ten times more slowly,
+            # so a gap between the two means latency is growing right now.
+            self._smoothed_latency += (latency - self._smoothed_latency) * 0.1
+            self._long_latency += (latency - self._long_latency) * 0.01
+        second = int(now)
+        if self._completions and self._completions[-1][0] == second:
+            self._completions[-1][1] += 1
+        else:
+            self._completions.append([second, 1])
+        self._expire(now)
+
+    def _expire(self, now):
+        horizon = now - self.throughput_window
+        while self._completions and self._completions[0][0] < horizon:
+            self._completions.popleft()
@@ -0,0 +1,349 @@
+import collections
+import csv
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .exceptions import PassInfoAPIError
+from .models import Contact
+from .utils import iter_records
+
+CREATED = 'created'
+EXISTING = 'existing'
+DUPLICATE = 'duplicate'
+INVALID = 'invalid'
+FAILED = 'failed'
+
+EXISTING_PAGE_SIZE = 500
+
+_FIELD_ALIASES = {
+    'first_name': ('first_name', 'firstname', 'prenom', 'prénom'),
+    'last_name': ('last_name', 'lastname', 'nom'),
+    'phone_number': ('phone_number', 'phone', 'contact', 'telephone', 'téléphone', 'numero'),
+}
+
+
+def phone_key(phone_number):
+    """Return the form of a phone number used to detect duplicates.
+
+    Spaces, dots, dashes and parentheses are removed, and a leading '00' is
+    read as '+'. Returns None when nothing usable is left.
+    """
+    if phone_number is None:
+        return None
+    text = str(phone_number).strip()
+    plus = text.startswith('+') or text.startswith('00')
+    digits = ''.join(ch for ch in text if ch.isdigit())
+    if text.startswith('00'):
+        digits = digits[2:]
+    if not digits:
+        return None
+    return '+' + digits if plus else digits
+
+
+class ImportRow:
+    """The outcome of importing one input row.
+
+    Attributes:
+        index (int): The position of the row in the input, starting at 0.
+        first_name (str): The first name read from the row.
+        last_name (str): The last name read from the row.
+        phone_number (str): The phone number read from the row, in canonical
+            form when the client normalizes phone numbers.
+        status (str): 'created', 'existing' (already on the account), 'duplicate'
+            (repeats an earlier row), 'invalid' (no valid phone number) or 'failed'.
+        contact_id (str): The PassInfo identifier of the contact, when known.
+        grouped (bool): Whether the contact was added to the import's group;
+            None when no group was requested or the row was not imported.
+        error (Exception): The error that made the row fail, or None.
+    """
+
+    __slots__ = ('index', 'first_name', 'last_name', 'phone_number', 'status', 'contact_id', 'grouped', 'error')
+
+    def __init__(self, index, first_name, last_name, phone_number):
+        self.index = index
+        self.first_name = first_name
+        self.last_name = last_name
+        self.phone_number = phone_number
+        self.status = None
+        self.contact_id = None
+        self.grouped = None
+        self.error = None
+
+    def __repr__(self):
+        return f"<ImportRow #{self.index} {self.phone_number}: {self.status}>"
+
+
+class ImportReport:
+    """The per-row outcome and statistics of a contact import.
+
+    The counters are updated while the import runs, so the report can be read
+    from a progress callback.
+
+    Attributes:
+        rows (list): An ``ImportRow`` for every input row, in input order.
+        counts (Counter): The number of rows by status.
+        grouped (int): The number of contacts added to the group.
+        group_failures (int): The number of contacts that could not be added to
+            the group.
+        started (float): When the import started (``time.monotonic()``).
+        finished (float): When the import finished, or None while it runs.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.counts = collections.Counter()
+        self.grouped = 0
+        self.group_failures = 0
+        self.started = time.monotonic()
+        self.finished = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self):
+        """int: The number of contacts created."""
+        return self.counts[CREATED]
+
+    @property
+    def failed(self):
+        """list: The rows whose contact could not be created."""
+        return [row for row in self.rows if row.status == FAILED]
+
+    @property
+    def ok(self):
+        """bool: True if no row failed and every requested group add succeeded."""
+        return not self.counts[FAILED] and not self.group_failures
+
+    @property
+    def duration(self):
+        """float: The duration of the import in seconds, so far if it is still running."""
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    @property
+    def throughput(self):
+        """float: Contacts created per second."""
+        duration = self.duration
+        return self.created / duration if duration > 0 else 0.0
+
+    def stats(self):
+        """Return the counters, duration and throughput as a dict."""
+        return {
+            'rows': len(self.rows),
+            'created': self.counts[CREATED],
+            'existing': self.counts[EXISTING],
+            'duplicate': self.counts[DUPLICATE],
+            'invalid': self.counts[INVALID],
+            'failed': self.counts[FAILED],
+            'grouped': self.grouped,
+            'group_failures': self.group_failures,
+            'duration': self.duration,
+            'throughput': self.throughput,
+        }
+
+    def write_csv(self, path):
+        """Write one line per input row with its status, contact ID and error to ``path``."""
+        with open(path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['row', 'first_name', 'last_name', 'phone_number', 'status', 'contact_id', 'grouped', 'error'])
+            for row in self.rows:
+                writer.writerow([
+                    row.index, row.first_name, row.last_name, row.phone_number, row.status,
+                    row.contact_id or '', '' if row.grouped is None else row.grouped, row.error or '',
+                ])
+
+    def _finish(self, row):
+        with self._lock:
+            self.counts[row.status] += 1
+            if row.grouped is True:
+                self.grouped += 1
+            elif row.grouped is False:
+                self.group_failures += 1
+
+    def __repr__(self):
+        return (f"<ImportReport {len(self.rows)} rows: {self.counts[CREATED]} created, "
+                f"{self.counts[EXISTING]} existing, {self.counts[DUPLICATE]} duplicate, "
+                f"{self.counts[INVALID]} invalid, {self.counts[FAILED]} failed>")
+
+
+def _field(record, name):
+    for alias in _FIELD_ALIASES[name]:
+        value = record.get(alias)
+        if value is not None:
+            return str(value).strip()
+    return ''
+
+
+def iter_contact_rows(source, format=None):
+    """Read (first_name, last_name, phone_number) triples from a source.
+
+    Args:
+        source: A path to a CSV or NDJSON file, or any iterable of ``Contact``
+            objects, dicts or (first_name, last_name, phone_number) sequences.
+            Dicts and CSV headers may use 'first_name', 'last_name' and
+            'phone_number' or common aliases ('phone', 'nom', 'prenom'...).
+        format (str, optional): The file format ('csv' or 'ndjson') when
+            ``source`` is a path. Detected from the extension when omitted.
+
+    Yields:
+        tuple: The names and phone number of the next row, as stripped strings.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = iter_records(source, format=format)
+    for record in source:
+        if isinstance(record, dict):
+            record = {str(key).strip().lower(): value for key, value in record.items()}
+            yield _field(record, 'first_name'), _field(record, 'last_name'), _field(record, 'phone_number')
+        elif isinstance(record, str):
+            yield '', '', record.strip()
+        elif isinstance(record, (list, tuple)):
+            values = [str(value).strip() if value is not None else '' for value in record]
+            if len(values) >= 3:
+                yield values[0], values[1], values[2]
+            else:
+                yield '', '', values[0] if values else ''
+        else:
+            yield (
+                (getattr(record, 'first_name', '') or '').strip(),
+                (getattr(record, 'last_name', '') or '').strip(),
+                str(getattr(record, 'phone_number', '') or '').strip(),
+            )
+
+
+def _existing_contacts(api, existing, key):
+    # Maps the phone key of every known contact to its identifier (or None).
+    if existing is None:
+        if api.contact_store is not None:
+            existing = api.contact_store
+        else:
+            existing = api.iter_contacts(page_size=EXISTING_PAGE_SIZE, window=2)
+    known = {}
+    for item in existing:
+        if isinstance(item, Contact):
+            number, contact_id = key(item.phone_number), item.contact_id
+        else:
+            number, contact_id = key(item), None
+        if number is not None:
+            known[number] = contact_id
+    return known
+
+
+def _import_row(api, row, group_id):
+    try:
+        contact = api._create_contact(row.first_name, row.last_name, row.phone_number)
+    except PassInfoAPIError as e:
+        row.status, row.error = FAILED, e
+        return row
+    row.status, row.contact_id = CREATED, contact.contact_id
+    _group_row(api, row, group_id)
+    return row
+
+
+def _group_row(api, row, group_id):
+    if group_id is None:
+        return row
+    if row.contact_id is None:
+        row.grouped = False
+        row.error = PassInfoAPIError(status_code=400, message="The API did not return the contact's identifier")
+        return row
+    try:
+        row.grouped = api._add_contact_to_group(row.contact_id, group_id)
+    except PassInfoAPIError as e:
+        row.grouped, row.error = False, e
+    return row
+
+
+def import_contacts(api, source, group_id=None, skip_existing=True, existing=None, max_workers=None,
+                    format=None, progress=None):
+    """Create many contacts concurrently, skipping duplicates and existing ones.
+
+    Rows are read lazily from ``source``. When the client has a
+    ``phone_normalizer``, phone numbers are converted to canonical E.164 form
+    before anything else and rows with an invalid number are marked invalid;
+    otherwise only rows without a phone number are. Rows whose phone number
+    (ignoring spaces, dashes and parentheses) repeats an earlier row are marked
+    duplicate. When
+    ``skip_existing`` is set, rows already on the account are not created
+    again. The remaining rows are created on a pool of ``max_workers`` threads;
+    at most twice that many requests are queued, so memory stays bounded for
+    large files. With ``group_id``, each contact is added to the group as soon
+    as it is created, together with existing contacts whose identifier is known.
+
+    Errors never stop the import: they are recorded on the failing row.
+
+    Args:
+        api (PassInfoAPI): The API used to create the contacts.
+        source: A path to a CSV or NDJSON file, or an iterable of ``Contact``
+            objects, dicts or (first_name, last_name, phone_number) sequences.
+        group_id (str, optional): A group to add the contacts to. Defaults to None.
+        skip_existing (bool, optional): Skip contacts already on the account.
+            Defaults to True.
+        existing (iterable, optional): The phone numbers (or ``Contact`` objects)
+            already on the account. Defaults to the contacts of
+            ``api.contact_store`` if set, otherwise to a download of the
+            account's contacts.
+        max_workers (int, optional): The number of contacts created in parallel.
+            Defaults to the client's concurrency limit, or 8.
+        format (str, optional): The file format when ``source`` is a path.
+        progress (callable, optional): Called with each ``ImportRow`` once it is
+            done, from the calling thread.
+
+    Returns:
+        ImportReport: The outcome of every row and the import statistics.
+
+    Example:
+        >>> report = import_contacts(api, "customers.csv", group_id="group_456", max_workers=16)
+        >>> print(report.stats())
+        >>> report.write_csv("customers-report.csv")
+    """
+    report = ImportReport()
+    normalizer = api.client.phone_normalizer
+    key_of = normalizer.normalize if normalizer is not None else phone_key
+    known = _existing_contacts(api, existing, key_of) if skip_existing else {}
+    seen = set()
+    max_workers = api.client._dispatch_workers(max_workers)
+
+    def finish(row):
+        report._finish(row)
+        if progress is not None:
+            progress(row)
+
+    def submissions():
+        for index, (first_name, last_name, phone_number) in enumerate(iter_contact_rows(source, format)):
+            key = key_of(phone_number)
+            if normalizer is not None and key is not None:
+                phone_number = key
+            row = ImportRow(index, first_name, last_name, phone_number)
+            report.rows.append(row)
+            if key is None:
+                row.status = INVALID
+                finish(row)
+            elif key in seen:
+                row.status = DUPLICATE
+                finish(row)
+            elif key in known:
+                seen.add(key)
+                row.status, row.contact_id = EXISTING, known[key]
+                if group_id is not None and row.contact_id is not None:
+                    yield _group_row, row
+                else:
+                    finish(row)
+            else:
+                seen.add(key)
+                yield _import_row, row
+
+    tasks = submissions()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for task, row in itertools.islice(tasks, max_workers * 2):
+            pending.add(executor.submit(task, api, row, group_id))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(future.result())
+            for task, row in itertools.islice(tasks, len(done)):
+                pending.add(executor.submit(task, api, row, group_id))
+    report.finished = time.monotonic()
+    return report
@@ -0,0 +1,311 @@
+import sqlite3
+import threading
+import time
+
+from .models import Contact
+
+SYNC_PAGE_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    phone_number TEXT PRIMARY KEY,
+    contact_id TEXT,
+    first_name TEXT NOT NULL DEFAULT '',
+    last_name TEXT NOT NULL DEFAULT '',
+    generation INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS contacts_contact_id ON contacts (contact_id);
+CREATE INDEX IF NOT EXISTS contacts_first_name ON contacts (first_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS contacts_last_name ON contacts (last_name COLLATE NOCASE, first_name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS contact_groups (
+    group_id TEXT NOT NULL,
+    contact_id TEXT NOT NULL,
+    PRIMARY KEY (group_id, contact_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS contact_groups_contact ON contact_groups (contact_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_UPSERT = """
+INSERT INTO contacts (phone_number, contact_id, first_name, last_name, generation)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (phone_number) DO UPDATE SET
+    contact_id = COALESCE(excluded.contact_id, contacts.contact_id),
+    first_name = excluded.first_name,
+    last_name = excluded.last_name,
+    generation = excluded.generation
+"""
+
+
+class SyncResult:
+    """The outcome of a ``ContactStore.sync`` run.
+
+    Attributes:
+        full (bool): True for a full sync, False for an incremental one.
+        fetched (int): The number of contacts downloaded.
+        removed (int): The number of local contacts deleted because they are no
+            longer on the account (full syncs only).
+        total (int): The number of contacts in the store after the sync.
+        duration (float): The duration of the sync in seconds.
+    """
+
+    def __init__(self, full, fetched, removed, total, duration):
+        self.full = full
+        self.fetched = fetched
+        self.removed = removed
+        self.total = total
+        self.duration = duration
+
+    def __repr__(self):
+        kind = "full" if self.full else "incremental"
+        return f"<SyncResult {kind}: {self.fetched} fetched, {self.removed} removed, {self.total} total>"
+
+
+class ContactStore:
+    """A local SQLite mirror of the account's contacts.
+
+    The store keeps a copy of the contact book so that lookups by phone
+    number, name or group are answered from indexed local tables instead of
+    paging through ``get_contacts_list``. Fill it once with a full ``sync``,
+    then keep it current with cheap incremental syncs. When passed to
+    ``PassInfoAPI(contact_store=...)``, ``create_contact`` and
+    ``add_contact_to_group`` also write through to the store.
+
+    The store can be shared between threads. File-backed stores use SQLite's
+    WAL journal so that readers are not blocked during a sync.
+
+    Attributes:
+        path (str): The database file, or ':memory:'.
+
+    Example:
+        >>> store = ContactStore("contacts.db")
+        >>> api = PassInfoAPI("your-api-key", "your-client-id", contact_store=store)
+        >>> store.sync(api)              # first run: full download
+        >>> store.sync(api)              # later runs: only new pages
+        >>> store.find_by_phone("+224622000001")
+        <Contact Jane Doe +224622000001>
+    """
+
+    def __init__(self, path=":memory:"):
+        """Open (and create if needed) a contact store.
+
+        Args:
+            path (str, optional): The SQLite database file. Defaults to
+                ':memory:' (a private in-memory store).
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def _state(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else default
+
+    def _set_state(self, items):
+        self._conn.executemany(
+            "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            [(key, str(value)) for key, value in items.items()],
+        )
+
+    @property
+    def last_sync(self):
+        """float: The time of the last successful sync (epoch seconds), or None."""
+        with self._lock:
+            value = self._state('last_sync')
+        return float(value) if value is not None else None
+
+    def upsert(self, contacts):
+        """Insert or update contacts, keyed by phone number.
+
+        Args:
+            contacts (iterable): Contact objects (or a single Contact).
+
+        Returns:
+            int: The number of contacts written.
+        """
+        if isinstance(contacts, Contact):
+            contacts = [contacts]
+        with self._lock:
+            generation = int(self._state('generation', 0))
+            rows = [
+                (c.phone_number, c.contact_id, c.first_name or '', c.last_name or '', generation)
+                for c in contacts if c.phone_number
+            ]
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def add_to_group(self, contact_id, group_id):
+        """Record that the contact ``contact_id`` belongs to ``group_id``."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO contact_groups (group_id, contact_id) VALUES (?, ?)",
+                (str(group_id), str(contact_id)),
+            )
+
+    def sync(self, api, full=None, page_size=SYNC_PAGE_SIZE, window=2):
+        """Bring the store up to date with the account.
+
+        A full sync downloads every page, updates changed contacts and deletes
+        contacts that no longer exist on the account. Deletions only happen
+        once every page has been downloaded, and never when the listing holds
+        no contact at all. An incremental sync
+        relies on the API listing contacts in creation order: it resumes from
+        the last page seen by the previous sync (re-reading that page in case
+        it was not full) and only downloads what was added since. Run a full
+        sync from time to time to pick up edits and deletions of older contacts.
+
+        Args:
+            api (PassInfoAPI): The API used to download the contacts.
+            full (bool, optional): Force a full (True) or incremental (False)
+                sync. Defaults to a full sync for an empty store and an
+                incremental one otherwise.
+            page_size (int, optional): The number of contacts per request.
+                Defaults to 500.
+            window (int, optional): The number of pages fetched ahead in
+                parallel. Defaults to 2.
+
+        Raises:
+            PassInfoAPIError: If a page cannot be downloaded or holds an error.
+                Contacts written before the error are kept and nothing is
+                deleted.
+
+        Returns:
+            SyncResult: What the sync did.
+        """
+        started = time.monotonic()
+        with self._lock:
+            synced = int(self._state('synced_count', 0))
+            if full is None:
+                full = synced == 0
+            generation = int(self._state('generation', 0)) + (1 if full else 0)
+            self._set_state({'generation': generation})
+        start_page = 1 if full else synced // page_size + 1
+        offset = 0 if full else (start_page - 1) * page_size
+
+        fetched = 0
+        batch = []
+        for contact in api.iter_contacts(page_size=page_size, window=window, start_page=start_page):
+            batch.append(contact)
+            if len(batch) >= page_size:
+                fetched += self.upsert(batch)
+                batch = []
+        if batch:
+            fetched += self.upsert(batch)
+
+        removed = 0
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                # An empty listing says nothing about which contacts are gone.
+                if full and fetched:
+                    removed = self._conn.execute(
+                        "DELETE FROM contacts WHERE generation < ?", (generation,)
+                    ).rowcount
+                    self._conn.execute(
+                        "DELETE FROM contact_groups WHERE contact_id NOT IN "
+                        "(SELECT contact_id FROM contacts WHERE contact_id IS NOT NULL)"
+                    )
+                self._set_state({'synced_count': offset + fetched, 'last_sync': time.time()})
+            total = len(self)
+        return SyncResult(full, fetched, removed, total, time.monotonic() - started)
+
+    @staticmethod
+    def _contacts(rows):
+        return [Contact(first_name, last_name, phone_number, contact_id)
+                for phone_number, contact_id, first_name, last_name in rows]
+
+    def find_by_phone(self, phone_number):
+        """Return the contact with this phone number, or None."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT phone_number, contact_id, first_name, last_name FROM contacts WHERE phone_number = ?",
+                (phone_number,),
+            ).fetchall()
+        contacts = self._contacts(rows)
+        return contacts[0] if contacts else None
+
+    def find_by_id(self, contact_id):
+        """Return the contact with this PassInfo identifier, or None."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT phone_number, contact_id, first_name, last_name FROM contacts WHERE contact_id = ?",
+                (str(contact_id),),
+            ).fetchall()
+        contacts = self._contacts(rows)
+        return contacts[0] if contacts else None
+
+    def find_by_name(self, first_name=None, last_name=None):
+        """Return the contacts matching a first and/or last name, ignoring case.
+
+        Args:
+            first_name (str, optional): The first name to match.
+            last_name (str, optional): The last name to match.
+
+        Returns:
+            list: The matching Contact objects.
+        """
+        clauses, params = [], []
+        if first_name is not None:
+            clauses.append("first_name = ? COLLATE NOCASE")
+            params.append(first_name)
+        if last_name is not None:
+            clauses.append("last_name = ? COLLATE NOCASE")
+            params.append(last_name)
+        if not clauses:
+            raise ValueError("first_name or last_name is required")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT phone_number, contact_id, first_name, last_name FROM contacts WHERE "
+                + " AND ".join(clauses),
+                params,
+            ).fetchall()
+        return self._contacts(rows)
+
+    def find_by_group(self, group_id):
+        """Return the contacts known to belong to ``group_id``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.phone_number, c.contact_id, c.first_name, c.last_name "
+                "FROM contact_groups g JOIN contacts c ON c.contact_id = g.contact_id "
+                "WHERE g.group_id = ?",
+                (str(group_id),),
+            ).fetchall()
+        return self._contacts(rows)
+
+    def __iter__(self):
+        """Iterate over every contact in the store."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT phone_number, contact_id, first_name, last_name FROM contacts"
+            ).fetchall()
+        return iter(self._contacts(rows))
+
+    def phone_numbers(self):
+        """Return the set of phone numbers in the store."""
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT phone_number FROM contacts")}
@@ -0,0 +1,241 @@
+import collections
+import hashlib
+import logging
+import math
+import threading
+import time
+
+from .exceptions import DuplicateSendError
+
+logger = logging.getLogger(__name__)
+
+SUPPRESS = 'suppress'
+FLAG = 'flag'
+
+DEFAULT_WINDOW = 60.0
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_SLICES = 4
+
+# Above this many sends per window, an exact index costs more than ~10 MB
+# and the filter switches to a Bloom index.
+EXACT_MAX_ENTRIES = 100000
+
+_MASK64 = (1 << 64) - 1
+
+
+def send_fingerprint(kind, message, target, sender_name):
+    """Return a 128-bit fingerprint of a send, as an int.
+
+    Args:
+        kind (str): The kind of send, e.g. 'single', 'bulk' or 'group'.
+        message (str): The message text.
+        target (str): The contact, the group ID, or the newline-joined
+            contacts of a bulk send.
+        sender_name (str): The sender name.
+    """
+    data = '\x00'.join((kind, str(sender_name), str(target), str(message))).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), 'little')
+
+
+class ExactWindow:
+    """An exact index of the fingerprints seen in the last ``window`` seconds.
+
+    Fingerprints are kept in insertion order with their time, so expired
+    entries are dropped from the front in amortized O(1). At most
+    ``max_entries`` are kept: when more sends than that happen within the
+    window, the oldest are forgotten early (duplicates of them are missed,
+    nothing is ever wrongly reported as a duplicate).
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, max_entries=DEFAULT_MAX_ENTRIES):
+        self.window = window
+        self.max_entries = max_entries
+        self._seen = collections.OrderedDict()
+
+    def _expire(self, now):
+        seen = self._seen
+        cutoff = now - self.window
+        while seen:
+            fingerprint, added = next(iter(seen.items()))
+            if added > cutoff:
+                return
+            del seen[fingerprint]
+
+    def contains(self, fingerprint, now):
+        self._expire(now)
+        return fingerprint in self._seen
+
+    def add(self, fingerprint, now):
+        seen = self._seen
+        seen[fingerprint] = now
+        seen.move_to_end(fingerprint)
+        if len(seen) > self.max_entries:
+            seen.popitem(last=False)
+
+    def __len__(self):
+        return len(self._seen)
+
+
+class BloomWindow:
+    """A time-windowed Bloom filter of fingerprints, for large windows.
+
+    The window is split into ``slices``; each slice has its own Bloom filter,
+    sized for ``capacity`` sends so that bursts do not raise the error rate.
+    Lookups check every live slice and a fingerprint stays findable for
+    between ``window`` and ``window * (1 + 1 / slices)`` seconds. Memory is
+    fixed: about ``1.44 * log2(1 / error_rate)`` bits per unit of capacity and
+    slice (1.8 MB per slice for a million sends at 0.1%).
+
+    Lookups can return false positives, with probability ``error_rate``: a
+    send that was never made may be reported as a duplicate.
+    """
+
+    def __init__(self, window, capacity, error_rate=DEFAULT_ERROR_RATE, slices=DEFAULT_SLICES):
+        self.window = window
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = max(64, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.bits / capacity * math.log(2))))
+        self._slice_duration = window / slices
+        self._max_filters = slices + 1
+        self._filters = collections.deque()
+
+    def _rotate(self, now):
+        filters = self._filters
+        if not filters or now - filters[-1][0] >= self._slice_duration:
+            filters.append((now, bytearray((self.bits + 7) // 8)))
+            while len(filters) > self._max_filters:
+                filters.popleft()
+        while filters and now - filters[0][0] >= self.window + self._slice_duration:
+            filters.popleft()
+
+    def _positions(self, fingerprint):
+        # Double hashing: k positions from the two 64-bit halves of the fingerprint.
+        first = fingerprint & _MASK64
+        step = (fingerprint >> 64) | 1
+        bits = self.bits
+        return [(first + index * step) % bits for index in range(self.hashes)]
+
+    def contains(self, fingerprint, now):
+        self._rotate(now)
+        positions = self._positions(fingerprint)
+        for _, bits in self._filters:
+            for position in positions:
+                if not bits[position >> 3] & (1 << (position & 7)):
+                    break
+            else:
+                return True
+        return False
+
+    def add(self, fingerprint, now):
+        self._rotate(now)
+        bits = self._filters[-1][1]
+        for position in self._positions(fingerprint):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    @property
+    def nbytes(self):
+        """int: The memory used by the live filters, in bytes."""
+        return sum(len(bits) for _, bits in self._filters)
+
+
+class DuplicateSendFilter:
+    """Suppresses or flags identical sends repeated within a time window.
+
+    Each send is reduced to a fingerprint of its kind, message, recipient (or
+    group, or recipient list) and sender name. A send whose fingerprint was
+    sent successfully in the last ``window`` seconds is a duplicate: in
+    'suppress' mode it raises ``DuplicateSendError`` without contacting the
+    API; in 'flag' mode it is sent anyway and logged. Identical sends running
+    at the same time are duplicates of each other. Failed sends are not
+    recorded, so a retry after an error goes through.
+
+    Up to ``max_entries`` sends per window are tracked exactly. Larger windows
+    use a Bloom index of fixed size that may report a never-made send as a
+    duplicate with probability ``error_rate``. Lookups are O(1) either way
+    (a few microseconds) and the filter is thread-safe.
+
+    Attributes:
+        mode (str): 'suppress' or 'flag'.
+        index (ExactWindow or BloomWindow): The index of recent fingerprints.
+        checked (int): The number of sends checked.
+        duplicates (int): The number of duplicates found.
+
+    Example:
+        >>> client = PassInfoSDKClient('api_key', 'client_id',
+        ...                            duplicate_filter=DuplicateSendFilter(window=30))
+        >>> client.send_message('Your code is 123456', '+224622000001', 'MyApp')
+        >>> client.send_message('Your code is 123456', '+224622000001', 'MyApp')
+        Traceback (most recent call last):
+        DuplicateSendError: Identical send already made in the last 30s.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, max_entries=DEFAULT_MAX_ENTRIES, mode=SUPPRESS,
+                 error_rate=DEFAULT_ERROR_RATE, index=None):
+        """Initialize a new DuplicateSendFilter.
+
+        Args:
+            window (float, optional): The seconds during which a repeat is a
+                duplicate. Defaults to 60.
+            max_entries (int, optional): The number of sends expected per
+                window. Up to 100000 they are tracked exactly; above, a Bloom
+                index sized for this many sends is used. Defaults to 100000.
+            mode (str, optional): 'suppress' to refuse duplicates, 'flag' to
+                log and send them. Defaults to 'suppress'.
+            error_rate (float, optional): The false positive rate of the
+                Bloom index. Defaults to 0.001.
+            index (optional): A custom index with ``contains(fingerprint, now)``
+                and ``add(fingerprint, now)`` methods. Overrides the above.
+        """
+        if mode not in (SUPPRESS, FLAG):
+            raise ValueError("mode must be 'suppress' or 'flag'")
+        if index is None:
+            if max_entries <= EXACT_MAX_ENTRIES:
+                index = ExactWindow(window, max_entries)
+            else:
+                index = BloomWindow(window, max_entries, error_rate)
+        self.window = window
+        self.mode = mode
+        self.index = index
+        self.checked = 0
+        self.duplicates = 0
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def begin(self, kind, message, target, sender_name):
+        """Check a send before it is made.
+
+        Raises:
+            DuplicateSendError: In 'suppress' mode, if the send is a duplicate.
+
+        Returns:
+            int: The fingerprint to pass to ``end`` once the send completes.
+        """
+        fingerprint = send_fingerprint(kind, message, target, sender_name)
+        now = time.monotonic()
+        with self._lock:
+            self.checked += 1
+            duplicate = fingerprint in self._in_flight or self.index.contains(fingerprint, now)
+            if duplicate:
+                self.duplicates += 1
+            if not duplicate or self.mode == FLAG:
+                self._in_flight.add(fingerprint)
+        if duplicate:
+            if self.mode == SUPPRESS:
+                raise DuplicateSendError(window=self.window)
+            logger.warning("Sending a %s message identical to one sent within %ss", kind, self.window)
+        return fingerprint
+
+    def end(self, fingerprint, sent):
+        """Record the outcome of a send started with ``begin``.
+
+        Args:
+            fingerprint (int): The value returned by ``begin``.
+            sent (bool): Whether the API accepted the send. Only accepted sends
+                make later repeats duplicates.
+        """
+        with self._lock:
+            self._in_flight.discard(fingerprint)
+            if sent:
+                self.index.add(fingerprint, time.monotonic())
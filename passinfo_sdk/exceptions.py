@@ -62,4 +62,122 @@ class PassInfoAPIError(PassInfoSDKError):
                 API request (e.g., 400 for client errors, 500 for server errors).
         """
         super().__init__(message)
-        self.status_code = status_code
\ No newline at end of file
+        self.status_code = status_code
+
+class CircuitOpenError(PassInfoAPIError):
+    """Exception raised when a request is refused by an open circuit breaker.
+
+    The circuit breaker opens after repeated server or network failures, and
+    refuses requests without contacting the API until its recovery timeout has
+    passed. This lets callers fail fast, or requeue work, while the PassInfo API
+    is degraded.
+
+    Attributes:
+        retry_after (float): The number of seconds until the breaker lets trial
+            requests through again.
+        status_code (int): Always 503.
+    """
+
+    def __init__(self, retry_after=0.0, message=None):
+        super().__init__(
+            message=message or f"Circuit breaker is open; retry in {retry_after:.1f}s.",
+            status_code=503
+        )
+        self.retry_after = retry_after
+
+
+class RateLimitError(PassInfoAPIError):
+    """Exception raised when the client-side rate limiter refuses a request.
+
+    This happens when the rate limiter is used in non-blocking mode and the
+    budget of the endpoint family is exhausted, or when a blocking wait exceeds
+    its timeout. The request is not sent to the API.
+
+    Attributes:
+        family (str): The endpoint family whose budget is exhausted ('send',
+            'status' or 'account').
+        retry_after (float): An estimate of the seconds until a request can be
+            sent again.
+        status_code (int): Always 429.
+    """
+
+    def __init__(self, family, retry_after=0.0, message=None):
+        super().__init__(
+            message=message or f"Client-side rate limit reached for '{family}' requests.",
+            status_code=429
+        )
+        self.family = family
+        self.retry_after = retry_after
+
+
+class WebhookError(PassInfoSDKError):
+    """Exception raised when a delivery-receipt callback cannot be accepted.
+
+    This covers callbacks with an invalid body or a signature that does not
+    match the configured secret.
+
+    Attributes:
+        status_code (int): The HTTP status code returned to the sender (400 for
+            an invalid body, 401 for a bad signature).
+    """
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class InsufficientCreditsError(PassInfoAPIError):
+    """Exception raised when a send would cost more SMS credits than the account holds.
+
+    The pre-send balance check raises it before any message is sent, so a
+    campaign is refused as a whole instead of failing partway through.
+
+    Attributes:
+        required (float): The credits the send would cost.
+        available (float): The credits left on the account.
+        status_code (int): Always 402.
+    """
+
+    def __init__(self, required, available, message=None):
+        super().__init__(
+            message=message or f"Insufficient SMS credits: the send needs {required}, {available} available.",
+            status_code=402
+        )
+        self.required = required
+        self.available = available
+
+
+class BalanceUnknownError(PassInfoAPIError):
+    """Exception raised when the SMS credit balance cannot be determined.
+
+    Unlike ``get_sms_count``, which returns 0 on any error, balance reads that
+    feed decisions (``get_balance``, the balance tracker and the pre-send
+    balance check) raise this error, so that an unreachable API is not taken
+    for an empty account. The underlying error is chained as ``__cause__``.
+
+    Attributes:
+        status_code (int): The status code of the failed request, or 503.
+    """
+
+    def __init__(self, message, status_code=503):
+        super().__init__(message=message, status_code=status_code)
+
+
+class DuplicateSendError(PassInfoAPIError):
+    """Exception raised when a send repeats an identical recent send.
+
+    The client's ``duplicate_filter`` raises it before any request is made,
+    when the same message, recipient and sender name were sent within its
+    window.
+
+    Attributes:
+        window (float): The duplicate window of the filter, in seconds.
+        status_code (int): Always 409.
+    """
+
+    def __init__(self, window, message=None):
+        super().__init__(
+            message=message or f"Identical send already made in the last {window:g}s.",
+            status_code=409
+        )
+        self.window = window
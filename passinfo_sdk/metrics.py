@@ -0,0 +1,195 @@
+import collections
+import threading
+
+
+def operation_name(endpoint):
+    """Return ``endpoint`` without its trailing identifier, e.g. 'v1/message/get_single_status'."""
+    return '/'.join(endpoint.split('/', 3)[:3])
+
+
+class EndpointStats:
+    """Request counters and latency of one API operation.
+
+    Attributes:
+        requests (int): HTTP requests sent, retries included.
+        errors (int): Requests that failed with a network error or a status
+            of 400 or more.
+        retries (int): Requests that were repeated after a transient failure.
+        cached (int): Calls answered from the response cache without a request.
+        total_latency (float): The summed duration of the requests, in seconds.
+        max_latency (float): The longest request, in seconds.
+        bytes_sent (int): Request body bytes sent, after compression.
+        bytes_received (int): Response body bytes received, before decompression.
+        compressed (int): Request bodies sent gzip-compressed.
+        request_bytes_saved (int): Bytes saved by compressing request bodies.
+        response_bytes_saved (int): Bytes saved by compressed responses.
+        compression_time (float): Time spent compressing request bodies, in seconds.
+    """
+
+    __slots__ = ('requests', 'errors', 'retries', 'cached', 'total_latency', 'max_latency',
+                 'bytes_sent', 'bytes_received', 'compressed', 'request_bytes_saved',
+                 'response_bytes_saved', 'compression_time')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.cached = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.compressed = 0
+        self.request_bytes_saved = 0
+        self.response_bytes_saved = 0
+        self.compression_time = 0.0
+
+    @property
+    def mean_latency(self):
+        """float: The average request duration in seconds, or None before any request."""
+        return self.total_latency / self.requests if self.requests else None
+
+    def to_dict(self):
+        """Return the counters as a dict."""
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'cached': self.cached,
+            'mean_latency': self.mean_latency,
+            'max_latency': self.max_latency,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'compressed': self.compressed,
+            'request_bytes_saved': self.request_bytes_saved,
+            'response_bytes_saved': self.response_bytes_saved,
+            'compression_time': self.compression_time,
+        }
+
+
+class ClientMetrics:
+    """Collects request counts, errors, retries and latency of a client.
+
+    Pass an instance as ``metrics`` to ``PassInfoSDKClient`` or ``PassInfoAPI``;
+    the client records every HTTP request it sends. Operations are keyed without
+    their trailing identifier, so all ``get_single_status/<id>`` calls share one
+    entry. The object is thread-safe and can be shared between clients to get
+    combined figures.
+
+    Attributes:
+        status_codes (Counter): The number of responses by HTTP status code.
+
+    Example:
+        >>> metrics = ClientMetrics()
+        >>> api = PassInfoAPI('your-api-key', 'your-client-id', metrics=metrics)
+        >>> api.get_user_groups()
+        >>> metrics.snapshot()['endpoints']['v1/groupe/get_all_my_groupes']
+        {'requests': 1, 'errors': 0, 'retries': 0, 'cached': 0, 'mean_latency': 0.084, 'max_latency': 0.084, ...}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = collections.defaultdict(EndpointStats)
+        self.status_codes = collections.Counter()
+
+    def record_request(self, endpoint, status_code, latency):
+        """Record a request sent to ``endpoint``.
+
+        Args:
+            endpoint (str): The endpoint of the request.
+            status_code (int): The response status, or None on a network error.
+            latency (float): The duration of the request in seconds.
+        """
+        with self._lock:
+            stats = self._endpoints[operation_name(endpoint)]
+            stats.requests += 1
+            stats.total_latency += latency
+            if latency > stats.max_latency:
+                stats.max_latency = latency
+            if status_code is None or status_code >= 400:
+                stats.errors += 1
+            self.status_codes[status_code] += 1
+
+    def record_retry(self, endpoint):
+        """Record that a request to ``endpoint`` is about to be repeated."""
+        with self._lock:
+            self._endpoints[operation_name(endpoint)].retries += 1
+
+    def record_transfer(self, endpoint, sent, received, decoded):
+        """Record the body sizes of a request to ``endpoint``.
+
+        Args:
+            endpoint (str): The endpoint of the request.
+            sent (int): The request body size as sent.
+            received (int): The response body size as received.
+            decoded (int): The response body size after decompression.
+        """
+        with self._lock:
+            stats = self._endpoints[operation_name(endpoint)]
+            stats.bytes_sent += sent
+            stats.bytes_received += received
+            stats.response_bytes_saved += max(0, decoded - received)
+
+    def record_compression(self, endpoint, original, compressed, duration):
+        """Record the compression of a request body for ``endpoint``.
+
+        Args:
+            endpoint (str): The endpoint of the request.
+            original (int): The body size before compression.
+            compressed (int): The body size after compression. The body is sent
+                uncompressed when this is not smaller than ``original``.
+            duration (float): The time spent compressing, in seconds.
+        """
+        with self._lock:
+            stats = self._endpoints[operation_name(endpoint)]
+            stats.compression_time += duration
+            if compressed < original:
+                stats.compressed += 1
+                stats.request_bytes_saved += original - compressed
+
+    def record_cached(self, endpoint):
+        """Record a call to ``endpoint`` answered from the response cache."""
+        with self._lock:
+            self._endpoints[operation_name(endpoint)].cached += 1
+
+    def endpoint(self, endpoint):
+        """Return the EndpointStats of ``endpoint``, or None if it was never called."""
+        with self._lock:
+            return self._endpoints.get(operation_name(endpoint))
+
+    @property
+    def requests(self):
+        """int: The total number of requests sent."""
+        with self._lock:
+            return sum(stats.requests for stats in self._endpoints.values())
+
+    @property
+    def errors(self):
+        """int: The total number of failed requests."""
+        with self._lock:
+            return sum(stats.errors for stats in self._endpoints.values())
+
+    def snapshot(self):
+        """Return all counters as a dict, with totals and a per-operation breakdown."""
+        with self._lock:
+            endpoints = {name: stats.to_dict() for name, stats in self._endpoints.items()}
+            status_codes = dict(self.status_codes)
+        return {
+            'requests': sum(stats['requests'] for stats in endpoints.values()),
+            'errors': sum(stats['errors'] for stats in endpoints.values()),
+            'retries': sum(stats['retries'] for stats in endpoints.values()),
+            'cached': sum(stats['cached'] for stats in endpoints.values()),
+            'bytes_sent': sum(stats['bytes_sent'] for stats in endpoints.values()),
+            'bytes_received': sum(stats['bytes_received'] for stats in endpoints.values()),
+            'bytes_saved': sum(stats['request_bytes_saved'] + stats['response_bytes_saved']
+                               for stats in endpoints.values()),
+            'compression_time': sum(stats['compression_time'] for stats in endpoints.values()),
+            'status_codes': status_codes,
+            'endpoints': endpoints,
+        }
+
+    def reset(self):
+        """Set all counters back to zero."""
+        with self._lock:
+            self._endpoints.clear()
+            self.status_codes.clear()
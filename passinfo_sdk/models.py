@@ -1,3 +1,7 @@
+from .exceptions import PassInfoAPIError
+from .pagination import DEFAULT_PAGE_SIZE, iter_pages
+
+
 class Contact:
     """A class representing a contact in the PassInfo system.
 
@@ -9,6 +13,7 @@ class Contact:
         first_name (str): The first name of the contact.
         last_name (str): The last name of the contact.
         phone_number (str): The contact's phone number in a format accepted by PassInfo.
+        contact_id (str): The identifier of the contact in PassInfo, when known.
 
     Example:
         >>> contact = Contact("John", "Doe", "+1234567890")
@@ -16,19 +21,45 @@ class Contact:
         'John Doe'
         >>> print(contact.phone_number)
         '+1234567890'
+
+    Note:
+        Contacts have no per-instance ``__dict__`` (64 bytes each plus
+        their strings), so extra attributes cannot be set on them. Use
+        ``ContactTable`` to hold very large contact books.
     """
 
-    def __init__(self, first_name, last_name, phone_number):
+    __slots__ = ('first_name', 'last_name', 'phone_number', 'contact_id')
+
+    def __init__(self, first_name, last_name, phone_number, contact_id=None):
         """Initialize a new Contact instance.
 
         Args:
             first_name (str): The first name of the contact.
             last_name (str): The last name of the contact.
             phone_number (str): The contact's phone number in a format accepted by PassInfo.
+            contact_id (str, optional): The identifier of the contact in PassInfo.
+                Defaults to None.
         """
         self.first_name = first_name
         self.last_name = last_name
         self.phone_number = phone_number
+        self.contact_id = contact_id
+
+    def __repr__(self):
+        return f"<Contact {self.first_name} {self.last_name} {self.phone_number}>"
+
+
+def contact_id_from(data):
+    """Return the contact identifier found in an API object, or None."""
+    if not isinstance(data, dict):
+        return None
+    for key in ('id', 'contact_id', '_id'):
+        value = data.get(key)
+        if value is not None:
+            return str(value)
+    nested = data.get('contact')
+    return contact_id_from(nested) if isinstance(nested, dict) else None
+
 
 class PassInfoAPI:
     """A class for interacting with the PassInfo API.
@@ -40,9 +71,17 @@ class PassInfoAPI:
     The API requires authentication through both an API key and a client ID, which
     should be obtained from your PassInfo dashboard.
 
+    All calls go through one ``PassInfoSDKClient``, so they share its pooled
+    keep-alive connections, timeout, retry policy, rate limiter, cache and
+    metrics. Pass ``client`` to share the transport of an existing messaging
+    client, or the same options as ``PassInfoSDKClient`` to configure a new one.
+    Call ``close()`` (or use the instance as a context manager) to release the
+    connections.
+
     Attributes:
         api_key (str): The authentication key for the PassInfo API.
         client_id (str): Your unique client identifier for the PassInfo platform.
+        client (PassInfoSDKClient): The client all calls are sent through.
 
     Example:
         >>> api = PassInfoAPI(
@@ -57,7 +96,11 @@ class PassInfoAPI:
         >>> groups = api.get_user_groups()
     """
 
-    def __init__(self, api_key, client_id):
+    def __init__(self, api_key, client_id, retry_policy=None, circuit_breaker=None, rate_limiter=None,
+                 contact_store=None, cache=None, base_url="https://api.passinfo.net",
+                 pool_connections=None, pool_maxsize=None, pool_block=False, keep_alive=True,
+                 timeout=None, concurrency_limiter=None, metrics=None, phone_normalizer=None,
+                 balance_tracker=None, codec=None, client=None):
         """Initialize a new PassInfoAPI instance.
 
         Args:
@@ -68,6 +111,51 @@ class PassInfoAPI:
             client_id (str): Your unique client identifier for the PassInfo platform.
                 This ID is used to track API usage and manage access permissions.
                 It must be included in all API requests alongside the API key.
+            retry_policy (RetryPolicy, optional): Controls how transient failures
+                are retried. Defaults to ``RetryPolicy()``.
+            circuit_breaker (CircuitBreaker, optional): A breaker shared by all
+                calls made through this instance, so that they fail fast while the
+                API is degraded. Defaults to None (disabled).
+            rate_limiter (RateLimiter, optional): A client-side rate limiter applied
+                to every call. Defaults to None.
+            contact_store (ContactStore, optional): A local contact index kept
+                up to date with the contacts and group memberships created
+                through this instance. Defaults to None.
+            cache (ResponseCache, optional): A response cache for groups and
+                contact pages, invalidated by the mutations made through this
+                instance. Defaults to None.
+            base_url (str, optional): The base URL for the PassInfo API endpoints.
+                Defaults to "https://api.passinfo.net".
+            pool_connections (int, optional): The number of per-host connection
+                pools. Defaults to the ``PassInfoSDKClient`` default.
+            pool_maxsize (int, optional): The maximum number of connections kept
+                open to the API. Raise this when calling from many threads.
+                Defaults to the ``PassInfoSDKClient`` default.
+            pool_block (bool, optional): Wait for a free connection instead of
+                opening a temporary extra one. Defaults to False.
+            keep_alive (bool, optional): Whether connections are kept open between
+                calls. Defaults to True.
+            timeout (float or tuple, optional): Connect/read timeout in seconds
+                applied to every call. Defaults to None (no timeout).
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): See
+                ``PassInfoSDKClient``. Defaults to None.
+            metrics (ClientMetrics, optional): Records the count, errors, retries
+                and latency of every call. Defaults to None.
+            phone_normalizer (PhoneNormalizer, optional): Converts the phone
+                numbers of imported contacts to canonical form. Defaults to None.
+            balance_tracker (BalanceTracker, optional): Caches the SMS balance
+                returned by ``get_sms_count`` and ``get_balance``. Defaults to None.
+            codec (str or JSONCodec, optional): The JSON library used for request
+                and response bodies. Defaults to the fastest one installed.
+            client (PassInfoSDKClient, optional): An existing client to send the
+                calls through, e.g. the one used for messaging. When given, the
+                transport options above are ignored and ``api_key`` and
+                ``client_id`` must match the client's, or be None to use them.
+                Defaults to None.
+
+        Raises:
+            ValueError: If ``client`` is given with an ``api_key`` or
+                ``client_id`` different from its own.
 
         Example:
             >>> # Initialize with both required credentials
@@ -75,13 +163,71 @@ class PassInfoAPI:
             ...     api_key="your-secret-api-key",
             ...     client_id="your-client-id"
             ... )
+            >>>
+            >>> # Share the connections of a messaging client
+            >>> client = PassInfoSDKClient("your-api-key", "your-client-id", pool_maxsize=50)
+            >>> api = PassInfoAPI(client.api_key, client.client_id, client=client)
 
         Note:
             Both api_key and client_id are required for authentication. Keep your
             API key secure and never share it in public repositories or client-side code.
         """
-        self.api_key = api_key
-        self.client_id = client_id
+        from .client import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, PassInfoSDKClient
+
+        if client is None:
+            client = PassInfoSDKClient(
+                api_key=api_key,
+                client_id=client_id,
+                base_url=base_url,
+                pool_connections=pool_connections or DEFAULT_POOL_CONNECTIONS,
+                pool_maxsize=pool_maxsize or DEFAULT_POOL_MAXSIZE,
+                pool_block=pool_block,
+                keep_alive=keep_alive,
+                timeout=timeout,
+                retry_policy=retry_policy,
+                circuit_breaker=circuit_breaker,
+                rate_limiter=rate_limiter,
+                concurrency_limiter=concurrency_limiter,
+                cache=cache,
+                metrics=metrics,
+                phone_normalizer=phone_normalizer,
+                balance_tracker=balance_tracker,
+                codec=codec,
+            )
+        elif api_key is not None and api_key != client.api_key:
+            raise ValueError("api_key does not match the api_key of the shared client")
+        elif client_id is not None and client_id != client.client_id:
+            raise ValueError("client_id does not match the client_id of the shared client")
+        self.client = client
+        self.contact_store = contact_store
+
+    @property
+    def api_key(self):
+        """str: The API key used by the underlying client."""
+        return self.client.api_key
+
+    @api_key.setter
+    def api_key(self, value):
+        self.client.api_key = value
+
+    @property
+    def client_id(self):
+        """str: The client ID used by the underlying client."""
+        return self.client.client_id
+
+    @client_id.setter
+    def client_id(self, value):
+        self.client.client_id = value
+
+    def close(self):
+        """Release the pooled connections of the underlying client."""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
         
     def create_contact(self, first_name, last_name, phone_number):
         """Create a new contact in the PassInfo system.
@@ -96,7 +242,9 @@ class PassInfoAPI:
             phone_number (str): The contact's phone number in a format accepted by PassInfo.
 
         Returns:
-            Contact: A new Contact instance representing the created contact.
+            Contact: A new Contact instance representing the created contact, or
+                None if it could not be created. To import many contacts and
+                learn why some failed, use ``import_contacts`` instead.
 
         Example:
             >>> api = PassInfoAPI("your-api-key", "your-client-id")
@@ -106,25 +254,36 @@ class PassInfoAPI:
             ...     phone_number="+1234567890"
             ... )
         """
-        from .client import PassInfoSDKClient
-        
-        client = PassInfoSDKClient(api_key=self.api_key, client_id=self.client_id)
+        try:
+            return self._create_contact(first_name, last_name, phone_number)
+        except Exception:
+            return None
+
+    def _create_contact(self, first_name, last_name, phone_number):
         data = {
             "first_name": first_name,
             "last_name": last_name,
             "phone_number": phone_number
         }
-        try:
-            response = client._make_request(
-                method='POST',
-                endpoint='v1/contact/add_contact',
-                data=data
+        response = self.client._make_request(
+            method='POST',
+            endpoint='v1/contact/add_contact',
+            data=data
+        )
+        if not isinstance(response, dict):
+            raise PassInfoAPIError(
+                status_code=502,
+                message=f"Unexpected API response for contact {phone_number}: {response!r}"
             )
-            if response.get('success', False):
-                return Contact(first_name, last_name, phone_number)
-            return None
-        except Exception:
-            return None
+        if not response.get('success', False):
+            raise PassInfoAPIError(
+                status_code=400,
+                message=f"Contact {phone_number} was rejected by the API: {response}"
+            )
+        contact = Contact(first_name, last_name, phone_number, contact_id_from(response))
+        if self.contact_store is not None:
+            self.contact_store.upsert(contact)
+        return contact
     
     def get_user_groups(self):
         """Retrieve all user groups associated with the current account.
@@ -143,11 +302,8 @@ class PassInfoAPI:
             >>> for group in groups:
             ...     print(group['name'])
         """
-        from .client import PassInfoSDKClient
-        
-        client = PassInfoSDKClient(api_key=self.api_key, client_id=self.client_id)
         try:
-            response = client._make_request(
+            response = self.client._make_request(
                 method='GET',
                 endpoint='v1/groupe/get_all_my_groupes'
             )
@@ -176,22 +332,34 @@ class PassInfoAPI:
             ...     group_id="group_456"
             ... )
         """
-        from .client import PassInfoSDKClient
-        
-        client = PassInfoSDKClient(api_key=self.api_key, client_id=self.client_id)
+        try:
+            return self._add_contact_to_group(contact_id, group_id)
+        except Exception:
+            return False
+
+    def _add_contact_to_group(self, contact_id, group_id):
         data = {
             "contact_id": contact_id,
             "group_id": group_id
         }
-        try:
-            response = client._make_request(
-                method='POST',
-                endpoint='v1/groupe/add_contact_to_group',
-                data=data
+        response = self.client._make_request(
+            method='POST',
+            endpoint='v1/groupe/add_contact_to_group',
+            data=data
+        )
+        if not isinstance(response, dict):
+            raise PassInfoAPIError(
+                status_code=502,
+                message=f"Unexpected API response for contact {contact_id} in group {group_id}: {response!r}"
             )
-            return response.get('success', False)
-        except Exception:
-            return False
+        if not response.get('success', False):
+            raise PassInfoAPIError(
+                status_code=400,
+                message=f"Contact {contact_id} was not added to group {group_id}: {response}"
+            )
+        if self.contact_store is not None:
+            self.contact_store.add_to_group(contact_id, group_id)
+        return True
     
     def get_sms_count(self):
         """Get the remaining SMS credit balance for the account.
@@ -200,24 +368,26 @@ class PassInfoAPI:
         sending messages through the PassInfo platform.
 
         Returns:
-            int: The number of SMS credits remaining in the account.
+            int: The number of SMS credits remaining in the account, or 0 if
+                the request fails. Use ``get_balance`` to tell them apart.
 
         Example:
             >>> api = PassInfoAPI("your-api-key", "your-client-id")
             >>> remaining_credits = api.get_sms_count()
             >>> print(f"You have {remaining_credits} SMS credits remaining")
         """
-        from .client import PassInfoSDKClient
-        
-        client = PassInfoSDKClient(api_key=self.api_key, client_id=self.client_id)
-        try:
-            response = client._make_request(
-                method='GET',
-                endpoint='v1/user/get_solde'
-            )
-            return response.get('solde', 0)
-        except Exception:
-            return 0
+        return self.client.get_sms_count()
+
+    def get_balance(self):
+        """Get the remaining SMS credit balance, raising an error if it is unknown.
+
+        Raises:
+            BalanceUnknownError: If the balance cannot be read from the API.
+
+        Returns:
+            float: The number of SMS credits remaining in the account.
+        """
+        return self.client.get_balance()
     
     def renew_api_key(self):
         """Generate a new API key for the account.
@@ -234,11 +404,8 @@ class PassInfoAPI:
             >>> new_key = api.renew_api_key()
             >>> print("Your new API key:", new_key)
         """
-        from .client import PassInfoSDKClient
-        
-        client = PassInfoSDKClient(api_key=self.api_key, client_id=self.client_id)
         try:
-            response = client._make_request(
+            response = self.client._make_request(
                 method='GET',
                 endpoint='v1/user/renew_api_key'
             )
@@ -251,6 +418,7 @@ class PassInfoAPI:
 
         This method returns a list of contacts associated with the account,
         with support for pagination to handle large numbers of contacts efficiently.
+        To walk every contact of the account, use ``iter_contacts`` instead.
 
         Args:
             page (int, optional): The page number to retrieve. Defaults to 1.
@@ -266,27 +434,124 @@ class PassInfoAPI:
             >>> # Get the second page
             >>> more_contacts = api.get_contacts_list(page=2, limit=10)
         """
-        from .client import PassInfoSDKClient
-        
-        client = PassInfoSDKClient(api_key=self.api_key, client_id=self.client_id)
+        try:
+            return self._fetch_contacts_page(page, limit)
+        except Exception:
+            return []
+
+    def _fetch_contact_records(self, page, limit):
         params = {
             "page": page,
             "limit": limit
         }
-        try:
-            response = client._make_request(
-                method='GET',
-                endpoint='v1/contact/all_my_contacts',
-                params=params
+        response = self.client._make_request(
+            method='GET',
+            endpoint='v1/contact/all_my_contacts',
+            params=params
+        )
+        if not isinstance(response, dict):
+            raise PassInfoAPIError(
+                status_code=502,
+                message=f"Unexpected API response for contacts page {page}: {response!r}"
             )
-            contacts_data = response.get('contacts', [])
-            return [Contact(
-                first_name=contact.get('first_name', ''),
-                last_name=contact.get('last_name', ''),
-                phone_number=contact.get('phone_number', '')
-            ) for contact in contacts_data]
-        except Exception:
-            return []
+        if 'error' in response:
+            raise PassInfoAPIError(
+                status_code=400,
+                message=f"Contacts page {page} was rejected by the API: {response}"
+            )
+        contacts = response.get('contacts', [])
+        if not isinstance(contacts, list):
+            raise PassInfoAPIError(
+                status_code=502,
+                message=f"Unexpected contacts in the API response for page {page}: {contacts!r}"
+            )
+        return contacts
+
+    def _fetch_contacts_page(self, page, limit):
+        contacts_data = self._fetch_contact_records(page, limit)
+        return [Contact(
+            first_name=contact.get('first_name', ''),
+            last_name=contact.get('last_name', ''),
+            phone_number=contact.get('phone_number', ''),
+            contact_id=contact_id_from(contact)
+        ) for contact in contacts_data]
+
+    def iter_contacts(self, page_size=DEFAULT_PAGE_SIZE, window=1, start_page=1):
+        """Iterate over every contact of the account, page by page.
+
+        Pages are requested in the background while the current page is being
+        consumed: ``window`` pages are fetched ahead, in parallel when ``window``
+        is greater than 1. Contacts are always yielded in page order, and the
+        iteration ends after the first page holding fewer than ``page_size``
+        contacts.
+
+        Unlike ``get_contacts_list``, errors are not swallowed: a failed page
+        raises ``PassInfoAPIError`` instead of silently ending the iteration.
+
+        Args:
+            page_size (int, optional): The number of contacts requested per page.
+                Defaults to 100.
+            window (int, optional): The number of pages fetched ahead of the one
+                being consumed. 0 disables prefetching. Defaults to 1.
+            start_page (int, optional): The page to start from. Defaults to 1.
+
+        Raises:
+            PassInfoAPIError: If a page cannot be retrieved.
+
+        Returns:
+            iterator: Yields a Contact object for each contact of the account.
+
+        Example:
+            >>> api = PassInfoAPI("your-api-key", "your-client-id")
+            >>> for contact in api.iter_contacts(page_size=500, window=4):
+            ...     print(contact.phone_number)
+        """
+        pages = iter_pages(
+            lambda page: self._fetch_contacts_page(page, page_size),
+            page_size=page_size,
+            window=window,
+            start_page=start_page,
+        )
+        for contacts in pages:
+            yield from contacts
+
+    def import_contacts(self, source, group_id=None, skip_existing=True, existing=None, max_workers=None,
+                        format=None, progress=None):
+        """Create many contacts concurrently, skipping duplicates and existing ones.
+
+        Unlike ``create_contact``, failures are not hidden: the returned report
+        holds the outcome of every input row. See
+        ``passinfo_sdk.contact_import.import_contacts`` for the details.
+
+        Args:
+            source: A path to a CSV or NDJSON file, or an iterable of Contact
+                objects, dicts or (first_name, last_name, phone_number) sequences.
+            group_id (str, optional): A group to add the contacts to. Defaults to None.
+            skip_existing (bool, optional): Skip contacts already on the account.
+                Defaults to True.
+            existing (iterable, optional): The phone numbers already on the
+                account. Defaults to the contact store, or a download of the
+                account's contacts.
+            max_workers (int, optional): The number of contacts created in
+                parallel. Defaults to the client's concurrency limit, or 8.
+            format (str, optional): The file format ('csv' or 'ndjson') when
+                ``source`` is a path.
+            progress (callable, optional): Called with each ImportRow once done.
+
+        Returns:
+            ImportReport: The outcome of every row and the import statistics.
+
+        Example:
+            >>> api = PassInfoAPI("your-api-key", "your-client-id", pool_maxsize=32)
+            >>> report = api.import_contacts("customers.csv", group_id="group_456", max_workers=32)
+            >>> print(report.created, "created,", len(report.failed), "failed")
+        """
+        from .contact_import import import_contacts
+
+        return import_contacts(
+            self, source, group_id=group_id, skip_existing=skip_existing, existing=existing,
+            max_workers=max_workers, format=format, progress=progress,
+        )
     
     def add_users_to_contact(self, contact_id, user_ids):
         """Associate multiple users with a contact.
@@ -302,6 +567,10 @@ class PassInfoAPI:
             bool: True if all users were successfully added to the contact,
                 False otherwise.
 
+        Note:
+            The request carries the account's ``Client-Id`` header like every
+            other call. Versions up to 1.0.2 sent the literal "None" instead.
+
         Example:
             >>> api = PassInfoAPI("your-api-key", "your-client-id")
             >>> user_ids = ["user_123", "user_456", "user_789"]
@@ -310,15 +579,12 @@ class PassInfoAPI:
             ...     user_ids=user_ids
             ... )
         """
-        from .client import PassInfoSDKClient
-        
-        client = PassInfoSDKClient(api_key=self.api_key, client_id=None)
         data = {
             "contact_id": contact_id,
             "user_ids": user_ids
         }
         try:
-            response = client._make_request(
+            response = self.client._make_request(
                 method='POST',
                 endpoint='v1/contact/add_users',
                 data=data
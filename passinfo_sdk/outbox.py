@@ -0,0 +1,532 @@
+import hashlib
+import itertools
+import logging
+import sqlite3
+import threading
+import time
+
+from . import bulk
+from .codec import BulkPayload
+from .exceptions import CircuitOpenError, PassInfoAPIError, RateLimitError
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+UNKNOWN = 'unknown'
+
+DEFAULT_BATCH_SIZE = bulk.DEFAULT_CHUNK_SIZE
+DEFAULT_POLL_INTERVAL = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    message TEXT NOT NULL,
+    sender_name TEXT NOT NULL,
+    contact TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    request_key TEXT,
+    batch_id TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, id);
+CREATE INDEX IF NOT EXISTS outbox_request ON outbox (request_key);
+"""
+
+_INSERT = """
+INSERT OR IGNORE INTO outbox (idempotency_key, message, sender_name, contact, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+def idempotency_key(message, sender_name, contact, campaign=None):
+    """Return the idempotency key of sending ``message`` to ``contact``.
+
+    With a ``campaign``, the key is '<campaign>:<contact>', so a campaign
+    reaches each recipient at most once. Without one, the key is a hash of the
+    message, sender name and contact.
+    """
+    if campaign is not None:
+        return f"{campaign}:{contact}"
+    digest = hashlib.sha256('\x00'.join((message, sender_name, contact)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def request_key_of(keys):
+    """Return the ``Idempotency-Key`` of a request sending the entries with idempotency keys ``keys``.
+
+    The key only depends on the set of entries, so a request that is sent
+    again after a failure carries the same key.
+    """
+    digest = hashlib.sha256('\n'.join(sorted(keys)).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def _may_have_been_sent(error):
+    # Timeouts, connection errors (reported as 500) and 5xx responses leave
+    # the outcome open; other errors mean the request was refused or never left.
+    if isinstance(error, (CircuitOpenError, RateLimitError)):
+        return False
+    return error.status_code is None or error.status_code >= 500
+
+
+class OutboxEntry:
+    """One recipient of a message queued in an ``Outbox``.
+
+    Attributes:
+        idempotency_key (str): The unique key of the entry.
+        message (str): The message to send.
+        sender_name (str): The sender name of the message.
+        contact (str): The recipient's phone number.
+        status (str): 'pending', 'sending' (request in flight), 'sent',
+            'failed' or 'unknown' (may or may not have been sent).
+        attempts (int): The number of requests made for the entry.
+        batch_id (str): The batch ID returned by the API once sent, or None.
+        error (str): The last error, or None.
+    """
+
+    __slots__ = ('idempotency_key', 'message', 'sender_name', 'contact', 'status', 'attempts', 'batch_id', 'error')
+
+    def __init__(self, idempotency_key, message, sender_name, contact, status, attempts, batch_id, error):
+        self.idempotency_key = idempotency_key
+        self.message = message
+        self.sender_name = sender_name
+        self.contact = contact
+        self.status = status
+        self.attempts = attempts
+        self.batch_id = batch_id
+        self.error = error
+
+    def __repr__(self):
+        return f"<OutboxEntry {self.contact}: {self.status}>"
+
+
+class DrainResult:
+    """The outcome of an ``Outbox.drain`` run.
+
+    Attributes:
+        requests (int): The number of bulk requests sent.
+        sent (int): The number of entries accepted by the API.
+        failed (int): The number of entries whose request was refused.
+        unknown (int): The number of entries whose request failed in a way
+            that leaves its outcome open (timeout, connection error, 5xx).
+        duration (float): The duration of the run in seconds.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.sent = 0
+        self.failed = 0
+        self.unknown = 0
+        self.duration = 0.0
+
+    def __repr__(self):
+        return f"<DrainResult {self.requests} requests: {self.sent} sent, {self.failed} failed, {self.unknown} unknown>"
+
+
+class _Write:
+    __slots__ = ('rows', 'done', 'count', 'error')
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.done = False
+        self.count = 0
+        self.error = None
+
+
+class Outbox:
+    """A durable SQLite queue of messages, sent by background workers.
+
+    Every recipient of a send is first written to the outbox with an
+    idempotency key, then marked sent with the batch ID returned by the API.
+    If the process stops partway through a campaign, the next run resumes with
+    the recipients that were not sent yet, and recipients enqueued twice with
+    the same key are only stored (and sent) once.
+
+    Entries are drained in enqueue order: pending entries sharing a message and
+    sender name are grouped into bulk requests of up to ``batch_size``
+    recipients, each sent with an ``Idempotency-Key`` header derived from the
+    keys of its entries; a requeued request is sent again as the same group,
+    under the same key. Entries are marked 'sending' before their request
+    leaves, in the same transaction that claims them. Requests refused by the
+    API are marked 'failed'. Requests whose outcome is open (timeouts,
+    connection errors, 5xx responses) are marked 'unknown', and so are entries
+    still marked 'sending' by a previous process when an outbox is opened:
+    they may or may not have reached the API, so they are not resent
+    automatically. Check them (e.g. with ``get_bulk_status``) and call
+    ``requeue(UNKNOWN)`` to send them again.
+
+    Enqueues from concurrent threads are committed together ("group commit"):
+    while one thread writes, others queue their rows, and the next transaction
+    writes all of them with a single sync to disk. Each enqueue call returns
+    once its rows are durable. The database uses SQLite's WAL journal.
+
+    An outbox file must be used by one process at a time.
+
+    Attributes:
+        path (str): The database file.
+        batch_size (int): The maximum number of recipients per request.
+
+    Example:
+        >>> outbox = Outbox("campaigns.db")
+        >>> outbox.enqueue_bulk("Join our event tomorrow!", "MyApp", contacts, campaign="event-2024-06")
+        >>> result = outbox.drain(client, max_workers=8)
+        >>> outbox.stats()
+        {'pending': 0, 'sending': 0, 'sent': 250000, 'failed': 0, 'unknown': 0}
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, synchronous='FULL'):
+        """Open (and create if needed) an outbox.
+
+        Args:
+            path (str): The SQLite database file.
+            batch_size (int, optional): The maximum number of recipients per
+                request. Defaults to 1000.
+            synchronous (str, optional): SQLite's ``synchronous`` setting.
+                'FULL' makes every commit survive a power loss; 'NORMAL' is
+                faster and only survives process crashes. Defaults to 'FULL'.
+        """
+        if synchronous not in ('FULL', 'NORMAL'):
+            raise ValueError("synchronous must be 'FULL' or 'NORMAL'")
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._queue_lock = threading.Lock()
+        self._queued = []
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript(_SCHEMA)
+        self._workers = []
+        self._stop = threading.Event()
+        self.recovered = self._recover()
+
+    def close(self):
+        """Stop the background workers and close the database connection."""
+        self.stop()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _recover(self):
+        # Entries claimed by a previous process may have been sent or not.
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                count = self._conn.execute(
+                    "UPDATE outbox SET status = ?, updated_at = ? WHERE status = ?",
+                    (UNKNOWN, time.time(), SENDING),
+                ).rowcount
+        if count:
+            logger.warning("%d outbox entries were in flight when the outbox was last closed; "
+                           "they are marked unknown and will not be resent automatically", count)
+        return count
+
+    def _write(self, rows):
+        # Group commit: the first thread to get the lock writes the rows of
+        # every thread waiting at that point, in one transaction.
+        write = _Write(rows)
+        with self._queue_lock:
+            self._queued.append(write)
+        with self._lock:
+            if not write.done:
+                with self._queue_lock:
+                    writes, self._queued = self._queued, []
+                try:
+                    with self._conn:
+                        self._conn.execute("BEGIN IMMEDIATE")
+                        for pending in writes:
+                            pending.count = self._conn.executemany(_INSERT, pending.rows).rowcount
+                except sqlite3.Error as e:
+                    for pending in writes:
+                        pending.error = e
+                for pending in writes:
+                    pending.done = True
+        if write.error is not None:
+            raise write.error
+        return write.count
+
+    def enqueue(self, message, sender_name, contact, key=None):
+        """Queue one message for one recipient.
+
+        Args:
+            message (str): The message to send.
+            sender_name (str): The sender name of the message.
+            contact (str): The recipient's phone number.
+            key (str, optional): The idempotency key. Defaults to
+                ``idempotency_key(message, sender_name, contact)``.
+
+        Returns:
+            bool: True if the entry was added, False if its key was already queued.
+        """
+        contact = str(contact)
+        if key is None:
+            key = idempotency_key(message, sender_name, contact)
+        now = time.time()
+        return self._write([(key, message, sender_name, contact, now, now)]) == 1
+
+    def enqueue_bulk(self, message, sender_name, contacts, campaign=None):
+        """Queue one message for many recipients.
+
+        Args:
+            message (str): The message to send.
+            sender_name (str): The sender name of the message.
+            contacts (iterable): The recipients' phone numbers.
+            campaign (str, optional): A campaign identifier used in the
+                idempotency keys, so that enqueueing the campaign again after a
+                crash adds nothing. Defaults to a key per message, sender name
+                and recipient.
+
+        Returns:
+            int: The number of entries added; already queued keys are skipped.
+        """
+        if message is None or sender_name is None:
+            raise PassInfoAPIError(status_code=400, message="Message and sender name are required.")
+        now = time.time()
+        added = 0
+        iterator = iter(contacts)
+        while True:
+            batch = [str(contact) for contact in itertools.islice(iterator, 50000)]
+            if not batch:
+                return added
+            rows = [(idempotency_key(message, sender_name, contact, campaign), message, sender_name, contact, now, now)
+                    for contact in batch]
+            added += self._write(rows)
+
+    def _claim(self):
+        # Marks the next group of pending entries as sending and returns
+        # (request_key, message, sender_name, [(id, contact), ...]). A group
+        # that was sent before and requeued is claimed again as a whole, under
+        # the same request key, so the API can recognize the retry.
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                first = self._conn.execute(
+                    "SELECT message, sender_name, request_key FROM outbox WHERE status = ? ORDER BY id LIMIT 1",
+                    (PENDING,),
+                ).fetchone()
+                if first is None:
+                    return None
+                message, sender_name, request_key = first
+                if request_key is not None:
+                    rows = self._conn.execute(
+                        "SELECT id, contact FROM outbox WHERE status = ? AND request_key = ? ORDER BY id",
+                        (PENDING, request_key),
+                    ).fetchall()
+                else:
+                    keyed = self._conn.execute(
+                        "SELECT id, contact, idempotency_key FROM outbox WHERE status = ? AND message = ? "
+                        "AND sender_name = ? AND request_key IS NULL ORDER BY id LIMIT ?",
+                        (PENDING, message, sender_name, self.batch_size),
+                    ).fetchall()
+                    rows = [(row_id, contact) for row_id, contact, _ in keyed]
+                    request_key = request_key_of(key for _, _, key in keyed)
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE outbox SET status = ?, attempts = attempts + 1, request_key = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    [(SENDING, request_key, now, row_id) for row_id, _ in rows],
+                )
+        return request_key, message, sender_name, rows
+
+    def _finish(self, request_key, status, batch_id=None, error=None):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                return self._conn.execute(
+                    "UPDATE outbox SET status = ?, batch_id = ?, error = ?, updated_at = ? "
+                    "WHERE request_key = ? AND status = ?",
+                    (status, batch_id, error, time.time(), request_key, SENDING),
+                ).rowcount
+
+    def send_next(self, client):
+        """Claim and send the next group of pending entries.
+
+        Args:
+            client (PassInfoSDKClient): The client used to send the request.
+
+        Returns:
+            tuple: (status, count) for the entries handled, or None if nothing
+                is pending.
+        """
+        claimed = self._claim()
+        if claimed is None:
+            return None
+        request_key, message, sender_name, rows = claimed
+        contacts = [contact for _, contact in rows]
+        try:
+            response = client._send_bulk(message, sender_name, contacts,
+                                         BulkPayload(message, sender_name, client.codec), request_key)
+        except PassInfoAPIError as e:
+            logger.warning("Outbox request %s for %d recipients failed: %s", request_key, len(rows), e)
+            status = UNKNOWN if _may_have_been_sent(e) else FAILED
+            return status, self._finish(request_key, status, error=str(e))
+        if not bulk._accepted(response):
+            return FAILED, self._finish(request_key, FAILED, error=f"Rejected by the API: {response}")
+        batch_id = response.get('batch_id') if isinstance(response, dict) else None
+        return SENT, self._finish(request_key, SENT, batch_id=None if batch_id is None else str(batch_id))
+
+    def drain(self, client, max_workers=None):
+        """Send pending entries until none is left.
+
+        Args:
+            client (PassInfoSDKClient): The client used to send the requests.
+            max_workers (int, optional): The number of requests sent in
+                parallel. Defaults to 8, or to the ``max_limit`` of the client's
+                concurrency limiter.
+
+        Returns:
+            DrainResult: What the run sent.
+        """
+        result = DrainResult()
+        started = time.monotonic()
+        lock = threading.Lock()
+
+        def work():
+            while True:
+                outcome = self.send_next(client)
+                if outcome is None:
+                    return
+                status, count = outcome
+                with lock:
+                    result.requests += 1
+                    if status == SENT:
+                        result.sent += count
+                    elif status == UNKNOWN:
+                        result.unknown += count
+                    else:
+                        result.failed += count
+
+        threads = [threading.Thread(target=work, name=f'passinfo-outbox-{index}', daemon=True)
+                   for index in range(client._dispatch_workers(max_workers))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        result.duration = time.monotonic() - started
+        return result
+
+    def start(self, client, max_workers=None, poll_interval=DEFAULT_POLL_INTERVAL):
+        """Drain the outbox continuously in background threads until ``stop()``.
+
+        Workers wait ``poll_interval`` seconds when nothing is pending.
+        """
+        if self._workers:
+            return
+        self._stop.clear()
+
+        def work():
+            while not self._stop.is_set():
+                try:
+                    outcome = self.send_next(client)
+                except sqlite3.Error:
+                    logger.exception("Outbox worker failed to read the queue")
+                    outcome = None
+                if outcome is None:
+                    self._stop.wait(poll_interval)
+
+        self._workers = [threading.Thread(target=work, name=f'passinfo-outbox-{index}', daemon=True)
+                         for index in range(client._dispatch_workers(max_workers))]
+        for thread in self._workers:
+            thread.start()
+
+    def stop(self):
+        """Stop the background workers once their current request completes."""
+        self._stop.set()
+        for thread in self._workers:
+            thread.join()
+        self._workers = []
+
+    def requeue(self, status=FAILED):
+        """Set entries with ``status`` ('failed' or 'unknown') back to pending.
+
+        Returns:
+            int: The number of entries requeued.
+        """
+        if status not in (FAILED, UNKNOWN):
+            raise ValueError("Only failed or unknown entries can be requeued")
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                return self._conn.execute(
+                    "UPDATE outbox SET status = ?, error = NULL, updated_at = ? WHERE status = ?",
+                    (PENDING, time.time(), status),
+                ).rowcount
+
+    def stats(self):
+        """Return the number of entries by status."""
+        counts = dict.fromkeys((PENDING, SENDING, SENT, FAILED, UNKNOWN), 0)
+        with self._lock:
+            for status, count in self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status"):
+                counts[status] = count
+        return counts
+
+    def count(self, campaign=None):
+        """Return the number of entries, or of entries enqueued for ``campaign``."""
+        query, params = "SELECT COUNT(*) FROM outbox", ()
+        if campaign is not None:
+            # Campaign keys are '<campaign>:<contact>'; ';' sorts right after ':'.
+            query += " WHERE idempotency_key >= ? AND idempotency_key < ?"
+            params = (f"{campaign}:", f"{campaign};")
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def get(self, key):
+        """Return the entry with idempotency key ``key``, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT idempotency_key, message, sender_name, contact, status, attempts, batch_id, error "
+                "FROM outbox WHERE idempotency_key = ?",
+                (key,),
+            ).fetchone()
+        return OutboxEntry(*row) if row is not None else None
+
+    def entries(self, status=None, limit=None):
+        """Return the entries, optionally only those with ``status``, in enqueue order."""
+        query = "SELECT idempotency_key, message, sender_name, contact, status, attempts, batch_id, error FROM outbox"
+        params = []
+        if status is not None:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [OutboxEntry(*row) for row in rows]
+
+    def batch_ids(self):
+        """Return the distinct batch IDs of the sent entries, in send order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT batch_id FROM outbox WHERE batch_id IS NOT NULL GROUP BY batch_id ORDER BY MIN(id)"
+            ).fetchall()
+        return [batch_id for batch_id, in rows]
+
+    def purge(self, older_than=None):
+        """Delete sent entries, optionally only those sent more than ``older_than`` seconds ago.
+
+        Purged keys can be enqueued again.
+
+        Returns:
+            int: The number of entries deleted.
+        """
+        cutoff = time.time() - (older_than or 0)
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                return self._conn.execute(
+                    "DELETE FROM outbox WHERE status = ? AND updated_at <= ?", (SENT, cutoff)
+                ).rowcount
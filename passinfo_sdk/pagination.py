@@ -0,0 +1,56 @@
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def iter_pages(fetch_page, page_size=DEFAULT_PAGE_SIZE, window=1, start_page=1):
+    """Walk a paginated endpoint page by page, fetching ahead in the background.
+
+    ``window`` pages are requested ahead of the page being consumed, on a pool
+    of ``window`` threads. Pages are always yielded in order, whatever order
+    their requests complete in. The walk stops at the first page holding fewer
+    than ``page_size`` items, which is the last one; requests already sent for
+    pages past the end are discarded.
+
+    Args:
+        fetch_page (callable): Called with a page number, returns the list of
+            items of that page. Errors it raises are propagated to the caller.
+        page_size (int, optional): The number of items per full page. Defaults
+            to 100.
+        window (int, optional): The number of pages fetched ahead. 0 fetches
+            each page only when it is needed. Defaults to 1.
+        start_page (int, optional): The first page to fetch. Defaults to 1.
+
+    Yields:
+        list: The items of each page, in page order.
+    """
+    if window < 1:
+        page = start_page
+        while True:
+            items = fetch_page(page)
+            if items:
+                yield items
+            if len(items) < page_size:
+                return
+            page += 1
+
+    executor = ThreadPoolExecutor(max_workers=window)
+    pending = collections.deque()
+    next_page = start_page
+    try:
+        for _ in range(window + 1):
+            pending.append(executor.submit(fetch_page, next_page))
+            next_page += 1
+        while pending:
+            items = pending.popleft().result()
+            if items:
+                yield items
+            if len(items) < page_size:
+                return
+            pending.append(executor.submit(fetch_page, next_page))
+            next_page += 1
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,259 @@
+import itertools
+import re
+
+MIN_DIGITS = 8
+MAX_DIGITS = 15
+BATCH_SIZE = 65536
+
+# Characters commonly used to format phone numbers, removed before parsing.
+_SEPARATORS = dict.fromkeys(map(ord, ' \t\r\n.-()/\u00a0\u2009\u202f'), None)
+_BATCH_SEPARATORS = {key: value for key, value in _SEPARATORS.items() if key != ord('\n')}
+
+
+class DedupeResult:
+    """The outcome of normalizing and deduplicating a list of phone numbers.
+
+    Attributes:
+        numbers (list): The distinct valid numbers in canonical form, in the
+            order they were first seen.
+        invalid (list): The input values that are not valid phone numbers.
+        duplicates (int): The number of valid inputs that repeated an earlier
+            number, once normalized.
+    """
+
+    __slots__ = ('numbers', 'invalid', 'duplicates')
+
+    def __init__(self):
+        self.numbers = []
+        self.invalid = []
+        self.duplicates = 0
+
+    @property
+    def total(self):
+        """int: The number of input values."""
+        return len(self.numbers) + len(self.invalid) + self.duplicates
+
+    def __repr__(self):
+        return (f"<DedupeResult {len(self.numbers)} numbers, {len(self.invalid)} invalid, "
+                f"{self.duplicates} duplicates>")
+
+
+class PhoneNormalizer:
+    """Converts phone numbers to the canonical E.164 form, e.g. '+224622123456'.
+
+    Spaces, dots, dashes, slashes and parentheses are ignored. Numbers starting
+    with '+' or the international prefix ('00') are read as international.
+    Other numbers are national: the trunk prefix ('0') is dropped and
+    ``default_country_code`` is prepended. Without a default country code, only
+    international numbers are accepted. A number is valid when it has between
+    8 and 15 digits including the country code, and only digits after the '+'.
+
+    The normalizer only checks the shape of numbers, not country-specific
+    numbering plans; set ``national_digits`` to also check the length of
+    national numbers.
+
+    Attributes:
+        default_country_code (str): The country calling code of national
+            numbers, without '+' (e.g. '224'), or None.
+        trunk_prefix (str): The national prefix dropped from national numbers.
+        international_prefix (str): The dialling prefix read as '+'.
+        national_digits (int): The exact number of digits of a national number
+            (without trunk prefix), or None to accept any length.
+
+    Example:
+        >>> normalizer = PhoneNormalizer(default_country_code='224', national_digits=9)
+        >>> normalizer.normalize('622 12 34 56')
+        '+224622123456'
+        >>> normalizer.normalize('00224 622-12-34-56')
+        '+224622123456'
+        >>> normalizer.dedupe(['622123456', '+224 622 12 34 56', 'n/a'])
+        <DedupeResult 1 numbers, 1 invalid, 1 duplicates>
+    """
+
+    def __init__(self, default_country_code=None, trunk_prefix='0', international_prefix='00',
+                 national_digits=None, min_digits=MIN_DIGITS, max_digits=MAX_DIGITS):
+        """Initialize a new PhoneNormalizer.
+
+        Args:
+            default_country_code (str or int, optional): The country calling code
+                of national numbers, with or without '+'. Defaults to None.
+            trunk_prefix (str, optional): The national trunk prefix. Defaults to '0'.
+            international_prefix (str, optional): The international dialling
+                prefix. Defaults to '00'.
+            national_digits (int, optional): The length of national numbers.
+                When set, digit strings of that length preceded by the country
+                code are also read as international. Defaults to None.
+            min_digits (int, optional): The shortest valid number, country code
+                included. Defaults to 8.
+            max_digits (int, optional): The longest valid number, country code
+                included. Defaults to 15, the E.164 maximum.
+        """
+        if default_country_code is not None:
+            default_country_code = str(default_country_code).lstrip('+')
+            if not (default_country_code.isascii() and default_country_code.isdigit()):
+                raise ValueError("default_country_code must be a numeric calling code")
+        self.default_country_code = default_country_code
+        self.trunk_prefix = trunk_prefix or ''
+        self.international_prefix = international_prefix or '+'
+        self.national_digits = national_digits
+        self.min_digits = min_digits
+        self.max_digits = max_digits
+        self._rewrites = None
+
+    def normalize(self, number):
+        """Return ``number`` in canonical form, or None if it is not a valid number.
+
+        Args:
+            number (str or int): The phone number to normalize.
+
+        Returns:
+            str: The number as '+' followed by its digits, or None.
+        """
+        if number is None:
+            return None
+        text = str(number).translate(_SEPARATORS)
+        if not text:
+            return None
+        if text[0] == '+':
+            digits = text[1:]
+        elif text.startswith(self.international_prefix):
+            digits = text[len(self.international_prefix):]
+        else:
+            country = self.default_country_code
+            if country is None:
+                return None
+            national = self.national_digits
+            if self.trunk_prefix and text.startswith(self.trunk_prefix):
+                text = text[len(self.trunk_prefix):]
+                if national is not None and len(text) != national:
+                    return None
+                digits = country + text
+            elif national is None or len(text) == national:
+                digits = country + text
+            elif len(text) == len(country) + national and text.startswith(country):
+                digits = text
+            else:
+                return None
+        if not (self.min_digits <= len(digits) <= self.max_digits and digits.isdigit()
+                and digits.isascii() and digits[0] != '0'):
+            return None
+        return '+' + digits
+
+    def is_valid(self, number):
+        """Return True if ``number`` can be normalized."""
+        return self.normalize(number) is not None
+
+    def normalize_many(self, numbers):
+        """Normalize a batch of numbers.
+
+        The batch is processed as a single string by a few compiled regular
+        expressions, which is many times faster than calling ``normalize`` on
+        each number.
+
+        Args:
+            numbers (iterable): The phone numbers to normalize.
+
+        Returns:
+            list: The canonical form of each number, or None for invalid ones,
+                in input order.
+        """
+        return [canonical or None for canonical in self._normalize_batch(list(numbers))]
+
+    def dedupe(self, numbers):
+        """Normalize, validate and deduplicate numbers.
+
+        Args:
+            numbers (iterable): The phone numbers to process.
+
+        Returns:
+            DedupeResult: The distinct valid numbers, in first-seen order, and
+                the invalid inputs.
+        """
+        result = DedupeResult()
+        result.numbers = list(self.iter_unique(numbers, result))
+        return result
+
+    def iter_unique(self, numbers, result=None, batch_size=BATCH_SIZE):
+        """Lazily yield the distinct valid numbers of an iterable, normalized.
+
+        The input is read ``batch_size`` numbers at a time, and each batch goes
+        through the fast ``normalize_many`` path.
+
+        Args:
+            numbers (iterable): The phone numbers to process.
+            result (DedupeResult, optional): Collects the invalid inputs and
+                the duplicate count while the iterator is consumed.
+            batch_size (int, optional): The number of inputs processed at once.
+                Defaults to 65536.
+
+        Yields:
+            str: Each distinct valid number in canonical form, in first-seen order.
+        """
+        iterator = iter(numbers)
+        seen = set()
+        while True:
+            batch = list(itertools.islice(iterator, batch_size))
+            if not batch:
+                return
+            canonical = self._normalize_batch(batch)
+            distinct = dict.fromkeys(canonical)
+            invalid = '' in distinct
+            distinct.pop('', None)
+            new = [number for number in distinct if number not in seen]
+            seen.update(new)
+            if result is not None:
+                if invalid:
+                    result.invalid.extend(raw for raw, number in zip(batch, canonical) if not number)
+                result.duplicates += len(canonical) - canonical.count('') - len(new)
+            yield from new
+
+    def _compile(self):
+        # Rewrites applied in order to a batch joined with newlines: each line
+        # ends up either in canonical form or empty. Replacements are plain
+        # strings inserted at lookahead-checked positions, which re.sub applies
+        # much faster than templates with group references.
+        country = self.default_country_code
+        flags = re.MULTILINE | re.ASCII
+        rewrites = [(re.compile('^' + re.escape(self.international_prefix), flags), '+')]
+        if country is not None:
+            trunk = re.escape(self.trunk_prefix)
+            national = self.national_digits
+            if national is None:
+                optional_trunk = f'(?:{trunk})?' if trunk else ''
+                rewrites.append((re.compile(rf'^{optional_trunk}(?=\d+$)', flags), f'+{country}'))
+            else:
+                not_trunk = f'(?!{trunk})' if trunk else ''
+                if trunk:
+                    rewrites.append((re.compile(rf'^{trunk}(?=\d{{{national}}}$)', flags), f'+{country}'))
+                rewrites.append((re.compile(rf'^{not_trunk}(?=\d{{{national}}}$)', flags), f'+{country}'))
+                rewrites.append((re.compile(rf'^{not_trunk}(?={country}\d{{{national}}}$)', flags), '+'))
+        valid = rf'\+[1-9]\d{{{self.min_digits - 1},{self.max_digits - 1}}}'
+        rewrites.append((re.compile(rf'^(?!{valid}$).+$', flags), ''))
+        return rewrites
+
+    def _normalize_batch(self, numbers):
+        # Returns the canonical form of each number, or '' for invalid ones.
+        if not numbers:
+            return []
+        try:
+            joined = '\n'.join(numbers)
+        except TypeError:
+            numbers = ['' if number is None else str(number) for number in numbers]
+            joined = '\n'.join(numbers)
+        if joined.count('\n') != len(numbers) - 1:
+            # A number contains a newline: the lines would not line up.
+            return [self.normalize(number) or '' for number in numbers]
+        if self._rewrites is None:
+            self._rewrites = self._compile()
+        text = joined.translate(_BATCH_SEPARATORS)
+        for pattern, replacement in self._rewrites:
+            text = pattern.sub(replacement, text)
+        return text.split('\n')
+
+
+def normalize_phone_number(number, default_country_code=None):
+    """Return ``number`` in canonical E.164 form, or None if it is not valid.
+
+    A shortcut for ``PhoneNormalizer(default_country_code).normalize(number)``.
+    """
+    return PhoneNormalizer(default_country_code).normalize(number)
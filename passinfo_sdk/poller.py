@@ -0,0 +1,234 @@
+import heapq
+import itertools
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .exceptions import PassInfoAPIError
+
+MESSAGE = 'message'
+BATCH = 'batch'
+
+MESSAGE_TERMINAL_STATUSES = frozenset({'delivered', 'failed', 'undelivered', 'rejected', 'expired'})
+BATCH_TERMINAL_STATUSES = frozenset({'completed', 'failed', 'cancelled'})
+
+DEFAULT_MAX_FAILURES = 5
+
+
+class StatusEvent:
+    """A change in the delivery status of a message or batch.
+
+    Attributes:
+        kind (str): 'message' or 'batch'.
+        id (str): The message ID or batch ID.
+        status (str): The new status, or the last known status if the check failed.
+        previous_status (str): The status before the change, or None for the
+            first status seen.
+        response (dict): The full API response of the check, or None on error.
+        terminal (bool): True if the status is final; the ID is not polled again.
+            Also set on an error for an ID that does not exist, or after
+            ``max_failures`` failed checks in a row.
+        error (PassInfoAPIError): The error raised by the check, or returned
+            as an error body or a response without a status, or None.
+    """
+
+    __slots__ = ('kind', 'id', 'status', 'previous_status', 'response', 'terminal', 'error')
+
+    def __init__(self, kind, id, status, previous_status, response, terminal, error=None):
+        self.kind = kind
+        self.id = id
+        self.status = status
+        self.previous_status = previous_status
+        self.response = response
+        self.terminal = terminal
+        self.error = error
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"<StatusEvent {self.kind} {self.id}: error {self.error}>"
+        return f"<StatusEvent {self.kind} {self.id}: {self.previous_status} -> {self.status}>"
+
+
+class _Tracked:
+    __slots__ = ('kind', 'id', 'status', 'interval', 'checks', 'failures')
+
+    def __init__(self, kind, id, interval):
+        self.kind = kind
+        self.id = id
+        self.status = None
+        self.interval = interval
+        self.checks = 0
+        self.failures = 0
+
+
+def _not_found(error, response):
+    if error.status_code == 404:
+        return True
+    detail = response.get('error') if isinstance(response, dict) else None
+    return isinstance(detail, str) and 'not found' in detail.lower()
+
+
+class StatusPoller:
+    """Tracks the delivery status of many messages and batches concurrently.
+
+    Each ID is checked on its own schedule. While its status stays the same and
+    is not final (e.g. 'pending'), the interval between checks grows by
+    ``backoff`` up to ``max_interval``; when the status changes, the interval
+    goes back to ``initial_interval``. Once an ID reaches a terminal status
+    ('delivered', 'failed', 'completed', ...) it is never checked again. Up to
+    ``max_workers`` checks run in parallel.
+
+    Attributes:
+        client (PassInfoSDKClient): The client used to check the statuses.
+        pending (dict): The IDs still being tracked, keyed by ``(kind, id)``,
+            with their last known status.
+
+    Example:
+        >>> poller = StatusPoller(client, max_workers=32)
+        >>> for event in poller.poll(message_ids=message_ids, batch_ids=batch_ids):
+        ...     print(event.kind, event.id, event.status)
+        ...     if event.terminal and event.status == 'failed':
+        ...         schedule_resend(event.id)
+    """
+
+    def __init__(self, client, max_workers=16, initial_interval=2.0, max_interval=60.0, backoff=1.5,
+                 jitter=0.1, message_terminal_statuses=MESSAGE_TERMINAL_STATUSES,
+                 batch_terminal_statuses=BATCH_TERMINAL_STATUSES, max_failures=DEFAULT_MAX_FAILURES):
+        """Initialize a new StatusPoller.
+
+        Args:
+            client (PassInfoSDKClient): The client used to check the statuses.
+            max_workers (int, optional): The number of checks run in parallel.
+                Defaults to 16.
+            initial_interval (float, optional): Seconds between the first checks
+                of an ID, and after each status change. Defaults to 2.
+            max_interval (float, optional): The longest interval between two
+                checks of the same ID, in seconds. Defaults to 60.
+            backoff (float, optional): The factor applied to the interval while
+                the status stays the same. Defaults to 1.5.
+            jitter (float, optional): The random fraction added to each interval
+                to spread checks out. Defaults to 0.1.
+            message_terminal_statuses (iterable, optional): Final message statuses.
+            batch_terminal_statuses (iterable, optional): Final batch statuses.
+            max_failures (int, optional): The failed checks in a row after
+                which an ID is given up. IDs the API does not know (404) are
+                given up at once. Defaults to 5.
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.max_failures = max_failures
+        self.terminal_statuses = {
+            MESSAGE: frozenset(message_terminal_statuses),
+            BATCH: frozenset(batch_terminal_statuses),
+        }
+        self.pending = {}
+
+    def _check(self, tracked):
+        if tracked.kind == MESSAGE:
+            return self.client.get_message_status(tracked.id)
+        return self.client.get_message_status_bulk(tracked.id)
+
+    def _next_interval(self, interval):
+        return interval * (1 + random.uniform(0, self.jitter))
+
+    def poll(self, message_ids=(), batch_ids=(), timeout=None):
+        """Poll the given IDs until they all reach a terminal status.
+
+        Args:
+            message_ids (iterable, optional): Message IDs to track.
+            batch_ids (iterable, optional): Batch IDs to track.
+            timeout (float, optional): Stop after this many seconds even if some
+                IDs are not final; they remain listed in ``pending`` and can be
+                passed to a later ``poll``. Defaults to None (no limit).
+
+        Yields:
+            StatusEvent: An event for every status change, and for every check
+                that failed with an API error.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        sequence = itertools.count()
+        schedule = []
+        now = time.monotonic()
+        tracking = set()
+        for kind, ids in ((MESSAGE, message_ids), (BATCH, batch_ids)):
+            for id in ids:
+                if (kind, id) in tracking:
+                    continue
+                tracking.add((kind, id))
+                # IDs left pending by an earlier poll resume from their last
+                # known status, so an unchanged status is not reported again.
+                tracked = _Tracked(kind, id, self.initial_interval)
+                tracked.status = self.pending.setdefault((kind, id), None)
+                heapq.heappush(schedule, (now, next(sequence), tracked))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while schedule or running:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    for future in running:
+                        future.cancel()
+                    return
+                while schedule and schedule[0][0] <= now and len(running) < self.max_workers:
+                    _, _, tracked = heapq.heappop(schedule)
+                    running[executor.submit(self._check, tracked)] = tracked
+
+                wake = None
+                if schedule and len(running) < self.max_workers:
+                    wake = max(0.0, schedule[0][0] - now)
+                if deadline is not None:
+                    wake = deadline - now if wake is None else min(wake, deadline - now)
+                if not running:
+                    time.sleep(wake)
+                    continue
+                done, _ = wait(running, timeout=wake, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tracked = running.pop(future)
+                    event = self._handle(tracked, future)
+                    if not event or not event.terminal:
+                        heapq.heappush(schedule, (
+                            time.monotonic() + self._next_interval(tracked.interval),
+                            next(sequence),
+                            tracked,
+                        ))
+                    if event is not None:
+                        yield event
+
+    def _handle(self, tracked, future):
+        tracked.checks += 1
+        try:
+            response = future.result()
+        except PassInfoAPIError as e:
+            return self._failed(tracked, e, None)
+
+        # Error bodies (e.g. a 404) are returned rather than raised.
+        status = response.get('status') if isinstance(response, dict) else None
+        if not isinstance(status, str) or (isinstance(response, dict) and 'error' in response):
+            error = PassInfoAPIError(status_code=502, message=f"No status in the response: {response!r:.200}")
+            return self._failed(tracked, error, response)
+        tracked.failures = 0
+        status = status.lower()
+        terminal = status in self.terminal_statuses[tracked.kind]
+        if status == tracked.status:
+            tracked.interval = min(self.max_interval, tracked.interval * self.backoff)
+            return None
+
+        previous, tracked.status = tracked.status, status
+        tracked.interval = self.initial_interval
+        if terminal:
+            self.pending.pop((tracked.kind, tracked.id), None)
+        else:
+            self.pending[(tracked.kind, tracked.id)] = status
+        return StatusEvent(tracked.kind, tracked.id, status, previous, response, terminal)
+
+    def _failed(self, tracked, error, response):
+        tracked.failures += 1
+        tracked.interval = min(self.max_interval, tracked.interval * self.backoff)
+        terminal = _not_found(error, response) or tracked.failures >= self.max_failures
+        if terminal:
+            self.pending.pop((tracked.kind, tracked.id), None)
+        return StatusEvent(tracked.kind, tracked.id, tracked.status, tracked.status, response, terminal, error=error)
@@ -0,0 +1,236 @@
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from .exceptions import RateLimitError
+
+SEND = 'send'
+STATUS = 'status'
+ACCOUNT = 'account'
+
+DEFAULT_LIMITS = {
+    SEND: 50.0,
+    STATUS: 20.0,
+    ACCOUNT: 5.0,
+}
+
+
+def endpoint_family(endpoint):
+    """Return the rate limit family ('send', 'status' or 'account') of an endpoint."""
+    if endpoint.startswith('v1/message/'):
+        if '_status' in endpoint:
+            return STATUS
+        return SEND
+    return ACCOUNT
+
+
+class TokenBucket:
+    """A thread-safe token bucket.
+
+    The bucket holds up to ``capacity`` tokens and is refilled at ``rate`` tokens
+    per second. Each request takes one token; when the bucket is empty, callers
+    either wait for the next token or are refused straight away.
+
+    Attributes:
+        rate (float): The number of tokens added per second.
+        capacity (float): The maximum number of tokens, i.e. the largest burst.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, tokens=1):
+        """Take ``tokens`` if available.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the number of seconds to
+                wait before enough tokens are available.
+        """
+        with self._lock:
+            self._tokens, self._updated, wait = _take(
+                self._tokens, self._updated, tokens, self.rate, self.capacity
+            )
+        return wait
+
+    def acquire(self, tokens=1, blocking=True, timeout=None):
+        """Take ``tokens`` from the bucket.
+
+        Args:
+            tokens (int, optional): The number of tokens to take. Defaults to 1.
+            blocking (bool, optional): Whether to wait for tokens when the bucket
+                is empty. Defaults to True.
+            timeout (float, optional): The longest time to wait, in seconds.
+                Defaults to None (wait as long as needed).
+
+        Returns:
+            bool: True if the tokens were taken, False otherwise.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.reserve(tokens)
+            if wait == 0:
+                return True
+            if not blocking or (deadline is not None and time.monotonic() + wait > deadline):
+                return False
+            time.sleep(wait)
+
+
+class FileTokenBucket(TokenBucket):
+    """A token bucket shared by every process on the host that uses the same file.
+
+    The bucket state (available tokens and last refill time) is stored in a
+    16-byte file and updated under an exclusive ``flock``, so worker processes
+    started independently, or forked from a common parent, all draw from one
+    budget. Only available on POSIX systems.
+
+    Attributes:
+        path (str): The file holding the shared bucket state.
+    """
+
+    _STATE = struct.Struct('dd')
+
+    def __init__(self, path, rate, capacity=None):
+        if fcntl is None:
+            raise RuntimeError("FileTokenBucket requires fcntl and is only available on POSIX systems")
+        super().__init__(rate, capacity)
+        self.path = os.fspath(path)
+        self._fd = None
+        self._pid = None
+
+    def _file(self):
+        # flock() locks belong to the open file, so each process needs its own.
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+        return self._fd
+
+    def reserve(self, tokens=1):
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                raw = os.pread(fd, self._STATE.size, 0)
+                if len(raw) == self._STATE.size:
+                    available, updated = self._STATE.unpack(raw)
+                else:
+                    available, updated = self.capacity, time.monotonic()
+                available, updated, wait = _take(available, updated, tokens, self.rate, self.capacity)
+                os.pwrite(fd, self._STATE.pack(available, updated), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        return wait
+
+    def close(self):
+        """Close the state file of this process."""
+        if self._fd is not None and self._pid == os.getpid():
+            os.close(self._fd)
+        self._fd = None
+
+
+def _take(available, updated, tokens, rate, capacity):
+    now = time.monotonic()
+    available = min(capacity, available + max(0.0, now - updated) * rate)
+    if available >= tokens:
+        return available - tokens, now, 0
+    return available, now, (tokens - available) / rate
+
+
+class RateLimiter:
+    """Client-side rate limiting with a separate budget per endpoint family.
+
+    Endpoints are grouped into three families: ``'send'`` (message sends),
+    ``'status'`` (delivery status lookups) and ``'account'`` (balance, contacts,
+    groups and everything else). Each family has its own token bucket, so a
+    status polling loop cannot starve the senders.
+
+    With ``shared_dir`` set, the buckets are stored as files in that directory
+    and shared by every process on the host that points at it.
+
+    Attributes:
+        blocking (bool): Whether requests wait for a token by default.
+        timeout (float): The longest time a blocking request waits, or None.
+
+    Example:
+        >>> limiter = RateLimiter(
+        ...     limits={'send': 100, 'status': 20, 'account': 5},
+        ...     shared_dir='/tmp/passinfo-limits'
+        ... )
+        >>> client = PassInfoSDKClient('api_key', 'client_id', rate_limiter=limiter)
+    """
+
+    def __init__(self, limits=None, burst=None, blocking=True, timeout=None, shared_dir=None):
+        """Initialize a new RateLimiter.
+
+        Args:
+            limits (dict, optional): Requests per second for each family. A family
+                mapped to None is not limited. Missing families use the defaults
+                (send: 50, status: 20, account: 5).
+            burst (dict, optional): The bucket capacity for each family. Defaults
+                to one second worth of requests.
+            blocking (bool, optional): Whether requests wait for a token (True) or
+                fail immediately with ``RateLimitError`` (False). Defaults to True.
+            timeout (float, optional): The longest time a blocking request waits
+                before failing with ``RateLimitError``. Defaults to None.
+            shared_dir (str, optional): A directory in which to store the buckets
+                so that they are shared between processes. Defaults to None
+                (buckets are shared between threads only).
+        """
+        limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        burst = burst or {}
+        self.blocking = blocking
+        self.timeout = timeout
+        self.buckets = {}
+        if shared_dir is not None:
+            os.makedirs(shared_dir, exist_ok=True)
+        for family, rate in limits.items():
+            if rate is None:
+                continue
+            if shared_dir is not None:
+                path = os.path.join(shared_dir, f"{family}.bucket")
+                self.buckets[family] = FileTokenBucket(path, rate, burst.get(family))
+            else:
+                self.buckets[family] = TokenBucket(rate, burst.get(family))
+
+    def reserve(self, endpoint):
+        """Take a token for ``endpoint`` without waiting.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until one is
+                available.
+        """
+        bucket = self.buckets.get(endpoint_family(endpoint))
+        if bucket is None:
+            return 0
+        return bucket.reserve()
+
+    def acquire(self, endpoint, blocking=None, timeout=None):
+        """Take a token for a request to ``endpoint``.
+
+        Args:
+            endpoint (str): The API endpoint about to be called.
+            blocking (bool, optional): Overrides ``self.blocking`` for this call.
+            timeout (float, optional): Overrides ``self.timeout`` for this call.
+
+        Raises:
+            RateLimitError: If no token could be taken.
+        """
+        family = endpoint_family(endpoint)
+        bucket = self.buckets.get(family)
+        if bucket is None:
+            return
+        blocking = self.blocking if blocking is None else blocking
+        timeout = self.timeout if timeout is None else timeout
+        if not bucket.acquire(blocking=blocking, timeout=timeout):
+            raise RateLimitError(family=family, retry_after=1.0 / bucket.rate)
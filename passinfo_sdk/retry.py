@@ -0,0 +1,232 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from .exceptions import CircuitOpenError
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+# Endpoints whose safety differs from what their HTTP method suggests. A value
+# of True means the call can be repeated without side effects.
+DEFAULT_ENDPOINT_RULES = {
+    'v1/groupe/add_contact_to_group': True,
+    'v1/contact/add_users': True,
+    'v1/user/renew_api_key': False,
+}
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is sent again.
+
+    Retries use exponential backoff with "full jitter": the delay before retry
+    ``n`` is a random value between 0 and ``backoff_factor * 2 ** n`` seconds,
+    capped at ``max_backoff``. When the server sends a ``Retry-After`` header,
+    its value is used instead (up to ``max_retry_after`` seconds).
+
+    Requests are only retried when doing so cannot cause a duplicate action:
+
+    - Rate-limited responses (429) and connection failures that happened
+      before the request reached the server are always retried.
+    - Server errors (5xx) and other network errors are retried only for
+      idempotent endpoints. By default these are GET-like methods, plus the
+      endpoints listed in ``endpoint_rules``. Message sends (POST) are therefore
+      never repeated after the server may already have accepted them.
+
+    Attributes:
+        max_retries (int): The maximum number of retries per request. 0 disables
+            retries.
+        backoff_factor (float): The base delay in seconds.
+        max_backoff (float): The maximum delay between two attempts, in seconds.
+        jitter (bool): Whether delays are randomised.
+        retry_statuses (frozenset): HTTP status codes considered transient.
+        respect_retry_after (bool): Whether ``Retry-After`` headers are honoured.
+        max_retry_after (float): The longest ``Retry-After`` delay honoured, in
+            seconds. Longer delays stop the retries.
+        endpoint_rules (dict): Maps endpoint prefixes to True (safe to retry) or
+            False (never retry on 5xx or network errors).
+
+    Example:
+        >>> policy = RetryPolicy(
+        ...     max_retries=5,
+        ...     backoff_factor=0.2,
+        ...     endpoint_rules={'v1/message/single_message': True}
+        ... )
+        >>> client = PassInfoSDKClient('api_key', 'client_id', retry_policy=policy)
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30.0, jitter=True,
+                 retry_statuses=RETRY_STATUSES, respect_retry_after=True, max_retry_after=60.0,
+                 endpoint_rules=None):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.endpoint_rules = dict(DEFAULT_ENDPOINT_RULES)
+        if endpoint_rules:
+            self.endpoint_rules.update(endpoint_rules)
+
+    def is_idempotent(self, method, endpoint):
+        """Return True if ``method`` on ``endpoint`` can safely be sent twice."""
+        best = None
+        for prefix, safe in self.endpoint_rules.items():
+            if endpoint.startswith(prefix) and (best is None or len(prefix) > len(best[0])):
+                best = (prefix, safe)
+        if best is not None:
+            return best[1]
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def should_retry(self, attempt, method, endpoint, status_code=None, error=None, connect_error=None):
+        """Return True if the request should be sent again.
+
+        Args:
+            attempt (int): The number of retries already made for the request.
+            method (str): The HTTP method of the request.
+            endpoint (str): The API endpoint of the request.
+            status_code (int, optional): The status code of the failed response.
+            error (Exception, optional): The network error raised by the request.
+            connect_error (bool, optional): Whether ``error`` happened before the
+                request reached the server. Detected for ``requests`` errors when
+                omitted.
+        """
+        if attempt >= self.max_retries:
+            return False
+        if error is not None:
+            if connect_error is None:
+                connect_error = is_connect_error(error)
+            return connect_error or self.is_idempotent(method, endpoint)
+        if status_code not in self.retry_statuses:
+            return False
+        return status_code == 429 or self.is_idempotent(method, endpoint)
+
+    def backoff(self, attempt, retry_after=None):
+        """Return the delay in seconds before retry number ``attempt + 1``.
+
+        Returns None if the server asked for a longer wait than
+        ``max_retry_after``, in which case the request should not be retried.
+        """
+        if retry_after is not None and self.respect_retry_after:
+            if retry_after > self.max_retry_after:
+                return None
+            return max(0.0, retry_after)
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+
+def is_connect_error(error):
+    """Return True if ``error`` happened before the request reached the server."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+def parse_retry_after(value):
+    """Parse a ``Retry-After`` header into a number of seconds, or None."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    """Fails fast while the PassInfo API is degraded.
+
+    The breaker counts consecutive failures (server errors and network errors).
+    After ``failure_threshold`` of them it opens, and every request raises
+    ``CircuitOpenError`` immediately instead of waiting on a struggling API.
+    Once ``recovery_timeout`` seconds have passed, up to ``half_open_max_calls``
+    trial requests are let through: a success closes the breaker, a failure
+    opens it again. The breaker is thread-safe and can be shared by several
+    clients.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures needed to open the breaker.
+        recovery_timeout (float): Seconds to wait before sending trial requests.
+        half_open_max_calls (int): Trial requests allowed while half-open.
+
+    Example:
+        >>> breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=30)
+        >>> client = PassInfoSDKClient('api_key', 'client_id', circuit_breaker=breaker)
+        >>> try:
+        ...     client.send_message('Hello', '1234567890', 'MyApp')
+        ... except CircuitOpenError as e:
+        ...     requeue_later(delay=e.retry_after)
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0, half_open_max_calls=1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+
+    @property
+    def state(self):
+        """str: The current state: 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_calls = 0
+
+    def before_request(self):
+        """Reserve permission to send a request.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with all trial
+                requests already in flight.
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                return
+            retry_after = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(retry_after=retry_after)
+
+    def record_success(self):
+        """Record a request that reached a healthy API."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_calls = 0
+
+    def record_failure(self):
+        """Record a server or network failure."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_calls = 0
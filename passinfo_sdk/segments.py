@@ -0,0 +1,180 @@
+import collections
+import functools
+import itertools
+import re
+
+GSM_7 = 'GSM-7'
+UCS_2 = 'UCS-2'
+
+# Single-segment limits and per-segment payload of concatenated messages (the
+# user data header takes 7 septets / 3 UTF-16 units of each part).
+GSM_SINGLE_LIMIT = 160
+GSM_PART_LIMIT = 153
+UCS_SINGLE_LIMIT = 70
+UCS_PART_LIMIT = 67
+
+# The GSM 03.38 default alphabet, and its extension table whose characters are
+# sent as an escape followed by the character, i.e. two septets.
+GSM_BASIC_CHARACTERS = (
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+GSM_EXTENSION_CHARACTERS = "\f^{}\\[~]|€"
+
+_NON_GSM = re.compile('[^' + re.escape(GSM_BASIC_CHARACTERS + GSM_EXTENSION_CHARACTERS) + ']')
+_GSM_EXTENSION = re.compile('[' + re.escape(GSM_EXTENSION_CHARACTERS) + ']')
+_ASTRAL = re.compile('[\U00010000-\U0010ffff]')
+
+_CACHE_SIZE = 4096
+_BATCH_SIZE = 100000
+
+
+class MessageCost:
+    """The encoding and segment count of one message text.
+
+    Attributes:
+        encoding (str): 'GSM-7' or 'UCS-2'.
+        units (int): The length of the text in the units of its encoding:
+            septets for GSM-7 (extension characters count twice), UTF-16 code
+            units for UCS-2 (emoji and other non-BMP characters count twice).
+        segments (int): The number of SMS the text is split into.
+    """
+
+    __slots__ = ('encoding', 'units', 'segments')
+
+    def __init__(self, encoding, units, segments):
+        self.encoding = encoding
+        self.units = units
+        self.segments = segments
+
+    def __repr__(self):
+        return f"<MessageCost {self.encoding}, {self.units} units, {self.segments} segments>"
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def message_cost(text):
+    """Return the encoding and number of SMS segments of a message text.
+
+    A text made only of GSM 03.38 characters is sent in GSM-7: up to 160
+    septets in a single SMS, 153 per part beyond. Any other character switches
+    the whole message to UCS-2: up to 70 UTF-16 units in a single SMS, 67 per
+    part beyond. An empty text still costs one SMS. Results are cached, so
+    repeated texts are not scanned again.
+
+    Args:
+        text (str): The message text.
+
+    Returns:
+        MessageCost: The encoding, length and segment count of the text.
+
+    Example:
+        >>> message_cost("Hello!")
+        <MessageCost GSM-7, 6 units, 1 segments>
+        >>> message_cost("Bonne année 🎉")
+        <MessageCost UCS-2, 14 units, 1 segments>
+    """
+    if _NON_GSM.search(text) is None:
+        units = len(text)
+        if _GSM_EXTENSION.search(text) is not None:
+            units += sum(map(text.count, GSM_EXTENSION_CHARACTERS))
+        single, part, encoding = GSM_SINGLE_LIMIT, GSM_PART_LIMIT, GSM_7
+    else:
+        units = len(text)
+        if _ASTRAL.search(text) is not None:
+            units += len(_ASTRAL.findall(text))
+        single, part, encoding = UCS_SINGLE_LIMIT, UCS_PART_LIMIT, UCS_2
+    segments = 1 if units <= single else -(-units // part)
+    return MessageCost(encoding, units, segments)
+
+
+def message_encoding(text):
+    """Return 'GSM-7' if ``text`` fits the GSM 03.38 alphabet, 'UCS-2' otherwise."""
+    return GSM_7 if _NON_GSM.search(text) is None else UCS_2
+
+
+def count_segments(text):
+    """Return the number of SMS segments ``text`` is split into."""
+    return message_cost(text).segments
+
+
+class CostEstimate:
+    """The planned cost of a send, in messages, segments and credits.
+
+    Attributes:
+        messages (int): The number of messages, i.e. recipients.
+        segments (int): The total number of SMS segments.
+        credits (float): The total cost: ``segments`` times the credits per
+            segment.
+        max_segments (int): The segment count of the longest message.
+        encodings (Counter): The number of messages by encoding.
+        credits_per_segment (float): The credits charged per SMS segment.
+    """
+
+    __slots__ = ('messages', 'segments', 'credits', 'max_segments', 'encodings', 'credits_per_segment')
+
+    def __init__(self, credits_per_segment=1):
+        self.credits_per_segment = credits_per_segment
+        self.messages = 0
+        self.segments = 0
+        self.credits = 0
+        self.max_segments = 0
+        self.encodings = collections.Counter()
+
+    def add(self, cost, count=1):
+        """Account for ``count`` messages of the given MessageCost."""
+        self.messages += count
+        self.segments += cost.segments * count
+        self.credits = self.segments * self.credits_per_segment
+        if cost.segments > self.max_segments:
+            self.max_segments = cost.segments
+        self.encodings[cost.encoding] += count
+        return self
+
+    def __repr__(self):
+        return (f"<CostEstimate {self.messages} messages, {self.segments} segments, "
+                f"{self.credits} credits>")
+
+
+def estimate_cost(message, recipients=1, credits_per_segment=1):
+    """Estimate the cost of sending one text to ``recipients`` recipients.
+
+    Args:
+        message (str): The message text.
+        recipients (int, optional): The number of recipients. Defaults to 1.
+        credits_per_segment (float, optional): The credits charged per SMS
+            segment. Defaults to 1.
+
+    Returns:
+        CostEstimate: The cost of the send.
+
+    Example:
+        >>> estimate_cost("Join our event tomorrow!", recipients=250000)
+        <CostEstimate 250000 messages, 250000 segments, 250000 credits>
+    """
+    return CostEstimate(credits_per_segment).add(message_cost(message), recipients)
+
+
+def estimate_messages(messages, credits_per_segment=1):
+    """Estimate the cost of a send of personalized texts, one per recipient.
+
+    Texts are read in batches and only the distinct texts of each batch are
+    measured, as personalized campaigns usually repeat the same few texts.
+    Nothing is kept between batches, so the input can be a generator over
+    millions of messages.
+
+    Args:
+        messages (iterable): The text sent to each recipient.
+        credits_per_segment (float, optional): The credits charged per SMS
+            segment. Defaults to 1.
+
+    Returns:
+        CostEstimate: The total cost of the send.
+    """
+    estimate = CostEstimate(credits_per_segment)
+    iterator = iter(messages)
+    while True:
+        batch = collections.Counter(itertools.islice(iterator, _BATCH_SIZE))
+        if not batch:
+            return estimate
+        for text, count in batch.items():
+            estimate.add(message_cost(text), count)
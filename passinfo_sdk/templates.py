@@ -0,0 +1,358 @@
+import itertools
+import re
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from . import bulk
+from .codec import BulkPayload
+from .exceptions import PassInfoAPIError
+from .phone import DedupeResult
+from .segments import estimate_messages
+
+_MISSING = object()
+_FIELD_ROOT = re.compile(r'[^.\[]*')
+
+
+class MessageTemplate:
+    """A message template with named fields, e.g. 'Bonjour {first_name} !'.
+
+    The template uses ``str.format`` syntax with named fields only; format
+    specifications ('{amount:.2f}') and attribute or index access
+    ('{contact.first_name}', '{order[id]}') are supported. It is parsed once,
+    when created. Rendering many recipients reads each recipient's values for
+    the template's fields and renders each distinct combination of values only
+    once, so a campaign whose template takes a few distinct values is rendered
+    in a handful of ``format`` calls, whatever its size.
+
+    Attributes:
+        template (str): The template text.
+        fields (tuple): The names of the variables the template uses.
+        defaults (dict): Values used for variables a recipient does not define.
+
+    Example:
+        >>> template = MessageTemplate("Bonjour {first_name}, -{discount}% ce soir !")
+        >>> template.fields
+        ('first_name', 'discount')
+        >>> template.render({'first_name': 'Awa', 'discount': 20})
+        'Bonjour Awa, -20% ce soir !'
+    """
+
+    def __init__(self, template, defaults=None):
+        """Parse a template.
+
+        Args:
+            template (str): The template text.
+            defaults (dict, optional): Values used for variables a recipient
+                does not define. Defaults to None.
+
+        Raises:
+            ValueError: If the template is malformed or has positional fields.
+        """
+        fields = []
+        for _, field_name, _, _ in string.Formatter().parse(template):
+            if field_name is None:
+                continue
+            root = _FIELD_ROOT.match(field_name).group()
+            if not root or root.isdigit():
+                raise ValueError(f"Template fields must be named: {template!r}")
+            fields.append(root)
+        self.template = template
+        self.fields = tuple(dict.fromkeys(fields))
+        self.defaults = dict(defaults or {})
+
+    def values(self, recipient, variables=None):
+        """Return the tuple of values of the template's fields for one recipient.
+
+        Values are looked up in ``variables``, then in ``recipient`` (a dict's
+        keys or an object's attributes, e.g. a ``Contact``), then in ``defaults``.
+
+        Raises:
+            KeyError: If a field has no value.
+        """
+        values = []
+        for field in self.fields:
+            value = _MISSING
+            if variables is not None:
+                value = variables.get(field, _MISSING)
+            if value is _MISSING:
+                if isinstance(recipient, dict):
+                    value = recipient.get(field, _MISSING)
+                else:
+                    value = getattr(recipient, field, _MISSING)
+            if value is _MISSING:
+                value = self.defaults.get(field, _MISSING)
+                if value is _MISSING:
+                    raise KeyError(field)
+            values.append(value)
+        return tuple(values)
+
+    def _format(self, values):
+        return self.template.format_map(dict(zip(self.fields, values)))
+
+    def render(self, recipient, variables=None):
+        """Render the message of one recipient.
+
+        Args:
+            recipient: A dict of variables, or an object whose attributes are
+                the variables (e.g. a ``Contact``).
+            variables (dict, optional): Extra variables, taking precedence.
+
+        Returns:
+            str: The rendered message.
+        """
+        return self._format(self.values(recipient, variables))
+
+    def render_many(self, recipients):
+        """Render the message of each recipient, each distinct one only once.
+
+        Args:
+            recipients (iterable): Dicts, objects, or (recipient, variables) pairs.
+
+        Returns:
+            list: The rendered messages, in input order.
+        """
+        rendered = {}
+        messages = []
+        for recipient, variables in map(_split, recipients):
+            values = self.values(recipient, variables)
+            try:
+                text = rendered.get(values)
+                if text is None:
+                    text = rendered[values] = self._format(values)
+            except TypeError:
+                text = self._format(values)
+            messages.append(text)
+        return messages
+
+    def __repr__(self):
+        return f"<MessageTemplate {self.template!r}>"
+
+
+def _split(record):
+    # (recipient, variables) pairs are the only 2-tuples whose second item is a dict.
+    if isinstance(record, tuple) and len(record) == 2 and isinstance(record[1], dict):
+        return record
+    return record, None
+
+
+def _phone_of(recipient):
+    if isinstance(recipient, str):
+        return recipient
+    if isinstance(recipient, dict):
+        value = recipient.get('phone_number', recipient.get('contact'))
+    else:
+        value = getattr(recipient, 'phone_number', None)
+    return None if value is None else str(value).strip()
+
+
+class TemplatedSendResult:
+    """The outcome of a templated send.
+
+    Attributes:
+        template (MessageTemplate): The template that was sent.
+        recipients (int): The number of recipients rendered.
+        texts (int): The number of distinct rendered messages.
+        requests (int): The number of API requests made.
+        sent_contacts (int): The number of recipients in accepted requests.
+        responses (list): The raw API responses of the accepted requests.
+        failures (list): (message, contacts, error) for each failed request.
+        invalid (list): The recipients without a phone number or whose
+            template variables are missing, with the reason.
+        normalization (DedupeResult): The invalid and duplicate numbers
+            dropped by the client's ``phone_normalizer``, if any.
+        estimate (CostEstimate): The cost of the send, in segments and credits.
+        duration (float): The duration of the send in seconds.
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self.recipients = 0
+        self.texts = 0
+        self.requests = 0
+        self.sent_contacts = 0
+        self.responses = []
+        self.failures = []
+        self.invalid = []
+        self.normalization = DedupeResult()
+        self.estimate = None
+        self.duration = 0.0
+
+    @property
+    def ok(self):
+        """bool: True if every request was accepted."""
+        return not self.failures
+
+    def __repr__(self):
+        return (f"<TemplatedSendResult {self.sent_contacts}/{self.recipients} recipients sent, "
+                f"{self.texts} texts in {self.requests} requests, {len(self.failures)} failed>")
+
+
+def group_messages(template, recipients, normalizer=None, result=None):
+    """Render a template for each recipient and group recipients by message.
+
+    Args:
+        template (MessageTemplate or str): The template.
+        recipients (iterable): ``Contact`` objects, dicts holding
+            'phone_number' and the variables, phone number strings, or
+            (recipient, variables) pairs.
+        normalizer (PhoneNormalizer, optional): Converts phone numbers to
+            canonical form and drops invalid ones and repeats of a number.
+        result (TemplatedSendResult, optional): Collects the invalid recipients
+            and the normalization report.
+
+    Returns:
+        dict: The recipients' phone numbers by rendered message, in the order
+            messages first appear.
+    """
+    if not isinstance(template, MessageTemplate):
+        template = MessageTemplate(template)
+    rendered = {}
+    groups = {}
+    seen = set()
+    for record in recipients:
+        recipient, variables = _split(record)
+        phone = _phone_of(recipient)
+        if normalizer is not None and phone:
+            canonical = normalizer.normalize(phone)
+            if canonical is None:
+                if result is not None:
+                    result.normalization.invalid.append(phone)
+                continue
+            if canonical in seen:
+                if result is not None:
+                    result.normalization.duplicates += 1
+                continue
+            seen.add(canonical)
+            phone = canonical
+        if not phone:
+            if result is not None:
+                result.invalid.append((record, "no phone number"))
+            continue
+        try:
+            values = template.values(recipient, variables)
+        except KeyError as e:
+            if result is not None:
+                result.invalid.append((record, f"missing variable {e.args[0]!r}"))
+            continue
+        try:
+            text = rendered.get(values)
+            if text is None:
+                text = rendered[values] = template._format(values)
+        except TypeError:
+            text = template._format(values)
+        group = groups.get(text)
+        if group is None:
+            group = groups[text] = []
+        group.append(phone)
+    return groups
+
+
+def _requests(groups, chunk_size):
+    # One request per chunk of recipients sharing a message.
+    for text, phones in groups.items():
+        for start in range(0, len(phones), chunk_size):
+            yield text, phones[start:start + chunk_size]
+
+
+def send_templated(client, template, sender_name, recipients, chunk_size=bulk.DEFAULT_CHUNK_SIZE,
+                   max_workers=None):
+    """Send a personalized message to many recipients in as few requests as possible.
+
+    The template is rendered for every recipient first. Recipients whose
+    messages are identical are sent together in bulk requests of up to
+    ``chunk_size`` recipients; messages with a single recipient are sent with
+    single message requests. All requests run concurrently on ``max_workers``
+    threads, with at most ``max_workers`` in flight.
+
+    When the client has a ``phone_normalizer``, numbers are normalized and
+    invalid or repeated ones dropped. When it has a ``balance_check``, the cost
+    of all rendered messages is checked against the balance before anything is
+    sent; templated sends are never truncated.
+
+    Errors never stop the send: failed requests are listed in the result.
+
+    Args:
+        client (PassInfoSDKClient): The client used to send the messages.
+        template (MessageTemplate or str): The message template.
+        sender_name (str): The sender name.
+        recipients (iterable): ``Contact`` objects, dicts holding
+            'phone_number' and the variables, or (recipient, variables) pairs.
+        chunk_size (int, optional): The maximum number of recipients per bulk
+            request. Defaults to 1000.
+        max_workers (int, optional): The number of requests sent in parallel.
+            Defaults to 8, or to the ``max_limit`` of the concurrency limiter.
+
+    Raises:
+        PassInfoAPIError: If sender_name or recipients is None (status_code=400).
+        InsufficientCreditsError: If ``balance_check`` is set and the balance
+            does not cover the send.
+
+    Returns:
+        TemplatedSendResult: The outcome of the send.
+
+    Example:
+        >>> result = send_templated(client, "Bonjour {first_name}, votre code est {code}",
+        ...                         "MyApp", [(contact, {'code': code}) for contact, code in pairs])
+    """
+    if sender_name is None:
+        raise PassInfoAPIError(status_code=400, message="Sender name is required.")
+    elif recipients is None:
+        raise PassInfoAPIError(status_code=400, message="Contacts are required.")
+    if not isinstance(template, MessageTemplate):
+        template = MessageTemplate(template)
+
+    started = time.monotonic()
+    result = TemplatedSendResult(template)
+    groups = group_messages(template, recipients, client.phone_normalizer, result)
+    result.texts = len(groups)
+    result.recipients = sum(map(len, groups.values()))
+    result.estimate = estimate_messages(
+        itertools.chain.from_iterable(itertools.repeat(text, len(phones)) for text, phones in groups.items()),
+        client.credits_per_segment,
+    )
+    if client.balance_check is not None and groups:
+        client.check_credits(result.estimate)
+
+    lock = threading.Lock()
+    payloads = {}
+
+    def send(text, phones):
+        try:
+            if len(groups[text]) == 1:
+                response = client._send_single(text, phones[0], sender_name, check_balance=False)
+            else:
+                with lock:
+                    payload = payloads.get(text)
+                    if payload is None:
+                        payload = payloads[text] = BulkPayload(text, sender_name, client.codec)
+                response = client._send_bulk(text, sender_name, phones, payload)
+        except PassInfoAPIError as e:
+            return text, phones, None, e
+        if not bulk._accepted(response):
+            return text, phones, None, PassInfoAPIError(
+                status_code=400, message=f"Rejected by the API: {response}")
+        return text, phones, response, None
+
+    def finish(outcome):
+        text, phones, response, error = outcome
+        result.requests += 1
+        if error is not None:
+            result.failures.append((text, phones, error))
+        else:
+            result.sent_contacts += len(phones)
+            result.responses.append(response)
+
+    workers = client._dispatch_workers(max_workers)
+    tasks = _requests(groups, chunk_size)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(send, text, phones) for text, phones in itertools.islice(tasks, workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(future.result())
+            for text, phones in itertools.islice(tasks, len(done)):
+                pending.add(executor.submit(send, text, phones))
+    result.duration = time.monotonic() - started
+    return result
@@ -1,5 +1,93 @@
+import csv
+import itertools
+import json
+import os
+
+
 def validate_resource_data(data):
     required_fields = ["name", "description"]
     for field in required_fields:
         if field not in data:
-            raise ValueError(f"Missing required field: {field}")
\ No newline at end of file
+            raise ValueError(f"Missing required field: {field}")
+
+
+def detect_file_format(path):
+    """Return 'csv', 'ndjson' or 'json' based on the file extension of ``path``."""
+    extension = os.path.splitext(os.fspath(path))[1].lower()
+    if extension in (".csv", ".tsv", ".txt"):
+        return "csv"
+    if extension in (".ndjson", ".jsonl"):
+        return "ndjson"
+    if extension == ".json":
+        return "json"
+    raise ValueError(f"Cannot detect the format of {path!r}; pass format='csv', format='ndjson' or format='json'")
+
+
+def iter_records(path, format=None, encoding="utf-8", header=None, column=None):
+    """Lazily read records from a CSV, NDJSON or JSON file.
+
+    CSV files with a header row yield one dict per row; CSV files without one,
+    and NDJSON lines holding a bare value, yield plain values. CSV and NDJSON
+    files are read line by line and never loaded into memory at once; JSON
+    files must hold a single array and are loaded whole.
+
+    Args:
+        path (str or PathLike): The file to read.
+        format (str, optional): 'csv', 'ndjson' or 'json'. Detected from the
+            file extension when omitted.
+        encoding (str, optional): The file encoding. Defaults to 'utf-8'.
+        header (bool, optional): Whether the first CSV row is a header.
+            Detected when omitted: the first row is a header if it holds
+            ``column``, or if none of its cells contains a digit.
+        column (str, optional): A field the CSV header must have, e.g. the
+            phone number column.
+
+    Raises:
+        ValueError: If a CSV header has no ``column`` field, or if a JSON file
+            does not hold an array.
+
+    Yields:
+        dict or str: The next record of the file.
+    """
+    format = format or detect_file_format(path)
+    with open(path, newline="", encoding=encoding) as handle:
+        if format == "ndjson":
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        elif format == "json":
+            records = json.load(handle)
+            if not isinstance(records, list):
+                raise ValueError(f"{path!r} does not hold a JSON array; pass format='ndjson' "
+                                 f"for one record per line")
+            yield from records
+        elif format == "csv":
+            delimiter = "\t" if os.fspath(path).endswith(".tsv") else ","
+            yield from _iter_csv(handle, delimiter=delimiter, header=header, column=column)
+        else:
+            raise ValueError(f"Unsupported format: {format!r}")
+
+
+def _iter_csv(handle, delimiter=",", header=None, column=None):
+    reader = csv.reader(handle, delimiter=delimiter)
+    first = next(reader, None)
+    if first is None:
+        return
+    fields = [cell.strip() for cell in first]
+    if header is None:
+        # Phone numbers, however they are written, hold digits; header names
+        # rarely do.
+        header = (column is not None and column in fields) or not any(
+            character.isdigit() for cell in fields for character in cell
+        )
+    if header:
+        if column is not None and column not in fields:
+            raise ValueError(f"The CSV header {fields} has no {column!r} field")
+        for row in reader:
+            if row:
+                yield dict(zip(fields, row))
+    else:
+        for cells in itertools.chain([first], reader):
+            if cells:
+                yield cells[0] if len(cells) == 1 else cells
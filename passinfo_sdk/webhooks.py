@@ -0,0 +1,492 @@
+import asyncio
+import hashlib
+import hmac
+import inspect
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from .exceptions import WebhookError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = '/webhooks/passinfo'
+DEFAULT_SIGNATURE_HEADER = 'X-PassInfo-Signature'
+DEFAULT_MAX_BODY_SIZE = 1024 * 1024
+
+
+class DeliveryReceipt:
+    """A delivery receipt posted by PassInfo for a message.
+
+    Attributes:
+        message_id (str): The ID of the message, or None for batch-level receipts.
+        batch_id (str): The ID of the batch the message belongs to, or None.
+        status (str): The delivery status, lower-cased (e.g. 'delivered').
+        contact (str): The recipient phone number, if provided.
+        timestamp (str): The time of the status change, if provided.
+        error_message (str): The delivery error, if any.
+        raw (dict): The receipt as received.
+    """
+
+    __slots__ = ('message_id', 'batch_id', 'status', 'contact', 'timestamp', 'error_message', 'raw')
+
+    def __init__(self, message_id, batch_id, status, contact=None, timestamp=None, error_message=None, raw=None):
+        self.message_id = message_id
+        self.batch_id = batch_id
+        self.status = status
+        self.contact = contact
+        self.timestamp = timestamp
+        self.error_message = error_message
+        self.raw = raw
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a receipt from a decoded JSON object.
+
+        Raises:
+            WebhookError: If the object has no status, or neither a message ID
+                nor a batch ID.
+        """
+        if not isinstance(data, dict):
+            raise WebhookError("Receipt must be a JSON object.")
+        message_id = data.get('message_id') or data.get('messageId')
+        batch_id = data.get('batch_id') or data.get('batchId')
+        status = data.get('status')
+        if not isinstance(status, str) or not status:
+            raise WebhookError("Receipt is missing its status.")
+        if message_id is None and batch_id is None:
+            raise WebhookError("Receipt is missing a message_id or batch_id.")
+        return cls(
+            message_id=message_id,
+            batch_id=batch_id,
+            status=status.lower(),
+            contact=data.get('contact'),
+            timestamp=data.get('timestamp'),
+            error_message=data.get('error_message'),
+            raw=data,
+        )
+
+    def to_dict(self):
+        return dict(self.raw) if self.raw is not None else {
+            'message_id': self.message_id,
+            'batch_id': self.batch_id,
+            'status': self.status,
+            'contact': self.contact,
+            'timestamp': self.timestamp,
+            'error_message': self.error_message,
+        }
+
+    def __repr__(self):
+        return f"<DeliveryReceipt {self.message_id or self.batch_id}: {self.status}>"
+
+
+def sign_body(body, secret):
+    """Return the hex HMAC-SHA256 signature of ``body`` with ``secret``."""
+    if isinstance(secret, str):
+        secret = secret.encode()
+    return hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+def parse_receipts(body, secret=None, signature=None):
+    """Validate and decode a delivery-receipt callback body.
+
+    The body may hold a single receipt object, a list of receipts, or an object
+    with a ``receipts`` list.
+
+    Args:
+        body (bytes): The raw request body.
+        secret (str, optional): The shared webhook secret. When set, ``signature``
+            must be the hex HMAC-SHA256 of the body.
+        signature (str, optional): The signature sent with the request.
+
+    Raises:
+        WebhookError: If the signature does not match, or the body is not a
+            valid receipt payload.
+
+    Returns:
+        list: The ``DeliveryReceipt`` objects of the callback.
+    """
+    if secret is not None:
+        if not signature or not hmac.compare_digest(sign_body(body, secret), signature.strip()):
+            raise WebhookError("Invalid webhook signature.", status_code=401)
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise WebhookError("Body is not valid JSON.")
+    if isinstance(payload, dict) and isinstance(payload.get('receipts'), list):
+        payload = payload['receipts']
+    if isinstance(payload, list):
+        return [DeliveryReceipt.from_dict(item) for item in payload]
+    return [DeliveryReceipt.from_dict(payload)]
+
+
+class _ReceiptProcessor:
+    # Shared request handling of the threaded and asyncio receivers.
+
+    def __init__(self, handler, queue, path, secret, signature_header, max_body_size):
+        self.handlers = []
+        if handler is not None:
+            self.handlers.append(handler)
+        self.queue = queue
+        self.path = path
+        self.secret = secret
+        self.signature_header = signature_header
+        self.max_body_size = max_body_size
+        self.received = 0
+        self.rejected = 0
+        # The threaded receiver updates the counters from its request threads.
+        self._lock = threading.Lock()
+
+    def check_request(self, method, path, content_length):
+        if path.split('?', 1)[0] != self.path:
+            return 404, "Not found."
+        if method != 'POST':
+            return 405, "Method not allowed."
+        if content_length is None:
+            return 411, "Content-Length required."
+        if content_length > self.max_body_size:
+            return 413, "Body too large."
+        return None
+
+    def parse(self, body, headers):
+        try:
+            return parse_receipts(body, self.secret, headers.get(self.signature_header))
+        except WebhookError:
+            with self._lock:
+                self.rejected += 1
+            raise
+
+    def accepted(self, count):
+        with self._lock:
+            self.received += count
+
+
+class _ReceiptServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 resets connections under bursts of callbacks.
+    request_queue_size = 128
+
+
+def _response_body(status, message):
+    return json.dumps({'status': 'ok' if status == 200 else 'error', 'message': message}).encode()
+
+
+class WebhookReceiver:
+    """An embeddable threaded HTTP server for PassInfo delivery receipts.
+
+    Each POST to ``path`` is validated (optional HMAC-SHA256 signature, JSON
+    structure), parsed into ``DeliveryReceipt`` objects and passed to the
+    registered handlers and/or put on ``queue``. Requests are served by a pool
+    of threads, and the server itself runs in a background thread.
+
+    Handlers run on the request thread; a handler that raises makes the receiver
+    answer 500 so that the sender can retry. For heavy processing, pass a
+    ``queue.Queue`` and consume it from your own workers.
+
+    Attributes:
+        host (str): The address the server listens on.
+        port (int): The port the server listens on (chosen by the OS when 0).
+        received (int): The number of receipts accepted so far.
+        rejected (int): The number of callbacks rejected so far.
+
+    Example:
+        >>> def on_receipt(receipt):
+        ...     print(receipt.message_id, receipt.status)
+        >>> with WebhookReceiver(port=8080, handler=on_receipt, secret="s3cret") as receiver:
+        ...     print("Listening on", receiver.url)
+        ...     serve_until_shutdown()
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, path=DEFAULT_PATH, handler=None, queue=None, secret=None,
+                 signature_header=DEFAULT_SIGNATURE_HEADER, max_body_size=DEFAULT_MAX_BODY_SIZE):
+        """Initialize a new WebhookReceiver.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to '127.0.0.1'.
+            port (int, optional): The port to listen on; 0 picks a free port.
+                Defaults to 0.
+            path (str, optional): The URL path receiving callbacks. Defaults to
+                '/webhooks/passinfo'.
+            handler (callable, optional): Called with each ``DeliveryReceipt``.
+            queue (queue.Queue, optional): A queue on which each receipt is put.
+            secret (str, optional): The shared secret used to check signatures.
+                Defaults to None (no signature check).
+            signature_header (str, optional): The header holding the signature.
+                Defaults to 'X-PassInfo-Signature'.
+            max_body_size (int, optional): The largest accepted body, in bytes.
+                Defaults to 1 MiB.
+        """
+        self.host = host
+        self.port = port
+        self._processor = _ReceiptProcessor(handler, queue, path, secret, signature_header, max_body_size)
+        self._server = None
+        self._thread = None
+
+    @property
+    def received(self):
+        return self._processor.received
+
+    @property
+    def rejected(self):
+        return self._processor.rejected
+
+    @property
+    def url(self):
+        """str: The full URL callbacks should be posted to."""
+        return f"http://{self.host}:{self.port}{self._processor.path}"
+
+    def add_handler(self, handler):
+        """Register another callable to receive each ``DeliveryReceipt``."""
+        self._processor.handlers.append(handler)
+
+    def start(self):
+        """Start serving in a background thread and return the receiver."""
+        self._server = _ReceiptServer((self.host, self.port), _make_request_handler(self._processor))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='passinfo-webhooks', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and wait for its thread to finish."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def _make_request_handler(processor):
+    class ReceiptRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body are written separately; without TCP_NODELAY every
+        # keep-alive response would wait on the peer's delayed ACK.
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+        def _reply(self, status, message):
+            body = _response_body(status, message)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self):
+            length = self.headers.get('Content-Length')
+            length = int(length) if length and length.isdigit() else None
+            error = processor.check_request(self.command, self.path, length)
+            if error is not None:
+                self.close_connection = True
+                return self._reply(*error)
+            body = self.rfile.read(length)
+            try:
+                receipts = processor.parse(body, self.headers)
+            except WebhookError as e:
+                return self._reply(e.status_code, str(e))
+            try:
+                for receipt in receipts:
+                    for handler in processor.handlers:
+                        handler(receipt)
+                    if processor.queue is not None:
+                        processor.queue.put(receipt)
+            except Exception:
+                logger.exception("Delivery receipt handler failed")
+                return self._reply(500, "Handler failed.")
+            processor.accepted(len(receipts))
+            self._reply(200, f"{len(receipts)} receipts received.")
+
+        do_POST = do_GET = do_PUT = do_DELETE = _handle
+
+    return ReceiptRequestHandler
+
+
+class AsyncWebhookReceiver:
+    """An asyncio HTTP server for PassInfo delivery receipts.
+
+    This is the event-loop counterpart of ``WebhookReceiver`` and has no extra
+    dependencies. Handlers may be plain functions or coroutine functions, and
+    ``queue`` is expected to be an ``asyncio.Queue``.
+
+    Example:
+        >>> async def main():
+        ...     queue = asyncio.Queue()
+        ...     async with AsyncWebhookReceiver(port=8080, queue=queue) as receiver:
+        ...         while True:
+        ...             receipt = await queue.get()
+        ...             await record_delivery(receipt)
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, path=DEFAULT_PATH, handler=None, queue=None, secret=None,
+                 signature_header=DEFAULT_SIGNATURE_HEADER, max_body_size=DEFAULT_MAX_BODY_SIZE):
+        """Initialize a new AsyncWebhookReceiver.
+
+        Takes the same arguments as ``WebhookReceiver``.
+        """
+        self.host = host
+        self.port = port
+        self._processor = _ReceiptProcessor(handler, queue, path, secret, signature_header, max_body_size)
+        self._server = None
+        self._connections = {}
+
+    @property
+    def received(self):
+        return self._processor.received
+
+    @property
+    def rejected(self):
+        return self._processor.rejected
+
+    @property
+    def url(self):
+        """str: The full URL callbacks should be posted to."""
+        return f"http://{self.host}:{self.port}{self._processor.path}"
+
+    def add_handler(self, handler):
+        """Register another callable or coroutine function to receive each receipt."""
+        self._processor.handlers.append(handler)
+
+    async def start(self):
+        """Start listening and return the receiver."""
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        """Stop listening and close the server."""
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise keep their tasks waiting.
+            connections = dict(self._connections)
+            for writer in connections.values():
+                writer.close()
+            await asyncio.gather(*connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    async def _serve_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while await self._serve_request(reader, writer):
+                pass
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _serve_request(self, reader, writer):
+        request_line = await reader.readline()
+        if not request_line:
+            return False
+        method, path, version = request_line.decode('latin-1').split(None, 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().title()] = value.strip()
+        keep_alive = headers.get('Connection', '').lower() != 'close' and version.strip() == 'HTTP/1.1'
+
+        processor = self._processor
+        length = headers.get('Content-Length')
+        length = int(length) if length and length.isdigit() else None
+        error = processor.check_request(method, path, length)
+        if error is not None:
+            await self._reply(writer, *error, keep_alive=False)
+            return False
+        body = await reader.readexactly(length)
+        try:
+            receipts = processor.parse(body, _HeaderView(headers))
+        except WebhookError as e:
+            await self._reply(writer, e.status_code, str(e), keep_alive)
+            return keep_alive
+        try:
+            for receipt in receipts:
+                for handler in processor.handlers:
+                    result = handler(receipt)
+                    if inspect.isawaitable(result):
+                        await result
+                if processor.queue is not None:
+                    await processor.queue.put(receipt)
+        except Exception:
+            logger.exception("Delivery receipt handler failed")
+            await self._reply(writer, 500, "Handler failed.", keep_alive)
+            return keep_alive
+        processor.accepted(len(receipts))
+        await self._reply(writer, 200, f"{len(receipts)} receipts received.", keep_alive)
+        return keep_alive
+
+    async def _reply(self, writer, status, message, keep_alive):
+        body = _response_body(status, message)
+        reason = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+                  405: 'Method Not Allowed', 411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error'}[status]
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+class _HeaderView:
+    # Case-insensitive header lookup over the title-cased dict of the async server.
+
+    def __init__(self, headers):
+        self._headers = headers
+
+    def get(self, name, default=None):
+        return self._headers.get(name.title(), default)
+
+
+def post_receipts(url, receipts, secret=None, signature_header=DEFAULT_SIGNATURE_HEADER, session=None):
+    """Post delivery receipts to a receiver, standing in for PassInfo.
+
+    Useful to exercise a ``WebhookReceiver`` or ``AsyncWebhookReceiver`` and
+    your handlers offline.
+
+    Args:
+        url (str): The receiver URL, e.g. ``receiver.url``.
+        receipts (list): ``DeliveryReceipt`` objects or dicts to post in a single
+            callback.
+        secret (str, optional): Signs the body with this secret when set.
+        signature_header (str, optional): The header carrying the signature.
+        session (requests.Session, optional): The session used to post.
+
+    Returns:
+        requests.Response: The receiver's response.
+
+    Example:
+        >>> with WebhookReceiver(handler=print) as receiver:
+        ...     post_receipts(receiver.url, [
+        ...         {'message_id': 'm1', 'status': 'delivered'},
+        ...     ])
+    """
+    payload = [r.to_dict() if isinstance(r, DeliveryReceipt) else r for r in receipts]
+    body = json.dumps(payload).encode()
+    headers = {'Content-Type': 'application/json'}
+    if secret is not None:
+        headers[signature_header] = sign_body(body, secret)
+    return (session or requests).post(url, data=body, headers=headers)
@@ -16,6 +16,13 @@ setup(
         "cryptography>=3.4.7",
         "certifi>=2021.5.30",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8"],
+        "fast": ["orjson>=3.6"],
+    },
+    entry_points={
+        "console_scripts": ["passinfo=passinfo_sdk.cli:main"],
+    },
     python_requires=">=3.7",
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -0,0 +1,155 @@
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.models import PassInfoAPI
+
+
+class FakeAPI:
+    """Stands in for ``PassInfoSDKClient._make_request`` and records every call.
+
+    Responses are scripted per endpoint prefix. Each entry is returned once, in
+    order, except the last one, which keeps being returned. An entry may be a
+    response body, an exception to raise, or a callable receiving the call.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.routes = {}
+        self._lock = threading.Lock()
+
+    def route(self, prefix, *responses):
+        self.routes[prefix] = list(responses)
+        return self
+
+    def endpoints(self, prefix=''):
+        return [call['endpoint'] for call in self.calls if call['endpoint'].startswith(prefix)]
+
+    def __call__(self, method, endpoint, params=None, data=None, headers=None):
+        if isinstance(data, bytes):
+            data = json.loads(data)
+        call = {'method': method, 'endpoint': endpoint, 'params': params, 'data': data, 'headers': headers}
+        with self._lock:
+            self.calls.append(call)
+            prefix = max((p for p in self.routes if endpoint.startswith(p)), key=len, default=None)
+            if prefix is None:
+                raise AssertionError(f"Unexpected call to {endpoint}")
+            responses = self.routes[prefix]
+            response = responses.pop(0) if len(responses) > 1 else responses[0]
+        if isinstance(response, BaseException):
+            raise response
+        if callable(response):
+            return response(call)
+        return response
+
+
+@pytest.fixture
+def fake_api():
+    return FakeAPI()
+
+
+@pytest.fixture
+def client(fake_api):
+    client = PassInfoSDKClient('test-key', 'test-client')
+    client._make_request = fake_api
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def api(fake_api):
+    api = PassInfoAPI('test-key', 'test-client')
+    api.client._make_request = fake_api
+    yield api
+    api.close()
+
+
+class FakeServer:
+    """A local HTTP server answering scripted responses, for transport tests.
+
+    Each scripted reply is a (status, body, headers) tuple; dict and list
+    bodies are sent as JSON. Requests are recorded with their decoded body.
+    ``delay`` holds every reply back, and ``max_in_flight`` records the most
+    requests served at the same time.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.replies = []
+        self.default = (200, {'success': True}, {})
+        self.delay = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    def reply(self, status=200, body=None, headers=None):
+        self.replies.append((status, {'success': True} if body is None else body, headers or {}))
+        return self
+
+    def _next(self):
+        return self.replies.pop(0) if self.replies else self.default
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                if self.headers.get('Content-Encoding') == 'gzip':
+                    raw = gzip.decompress(raw)
+                server.requests.append({
+                    'method': self.command,
+                    'path': self.path,
+                    'headers': dict(self.headers),
+                    'body': raw,
+                    'peer': self.client_address,
+                })
+                with server._lock:
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    status, body, headers = server._next()
+                time.sleep(server.delay)
+                with server._lock:
+                    server.in_flight -= 1
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def server():
+    server = FakeServer().start()
+    yield server
+    server.stop()
@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from passinfo_sdk.async_client import AsyncPassInfoSDKClient  # noqa: E402
+from passinfo_sdk.exceptions import PassInfoAPIError  # noqa: E402
+from passinfo_sdk.retry import CircuitBreaker, RetryPolicy  # noqa: E402
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def make_client(server, **options):
+    options.setdefault('retry_policy', RetryPolicy(backoff_factor=0))
+    return AsyncPassInfoSDKClient('test-key', 'test-client', base_url=server.url, **options)
+
+
+def test_send_message_posts_the_message(server):
+    async def main():
+        async with make_client(server) as client:
+            return await client.send_message('Hello', '622000001', 'MyApp')
+
+    assert run(main()) == {'success': True}
+    request = server.requests[0]
+    assert request['path'] == '/v1/message/single_message'
+    assert json.loads(request['body']) == {'message': 'Hello', 'contact': '622000001', 'senderName': 'MyApp'}
+    assert request['headers']['Api-Key'] == 'test-key'
+
+
+def test_validation_matches_the_sync_client(server):
+    async def main():
+        async with make_client(server) as client:
+            await client.send_message(None, '622000001', 'MyApp')
+
+    with pytest.raises(PassInfoAPIError) as excinfo:
+        run(main())
+    assert excinfo.value.status_code == 400
+    assert server.requests == []
+
+
+def test_error_bodies_are_returned(server):
+    server.reply(401, {'error': 'Unauthorized'})
+
+    async def main():
+        async with make_client(server) as client:
+            return await client.get_message_status('m1')
+
+    assert run(main()) == {'error': 'Unauthorized'}
+
+
+@pytest.mark.parametrize('body', [b'', b'<html>Bad gateway</html>'])
+def test_undecodable_body_raises_without_retry_or_breaker_failure(server, body):
+    breaker = CircuitBreaker(failure_threshold=1)
+    server.reply(200, body)
+
+    async def main():
+        async with make_client(server, circuit_breaker=breaker) as client:
+            await client.get_message_status('m1')
+
+    with pytest.raises(PassInfoAPIError) as excinfo:
+        run(main())
+    assert excinfo.value.status_code == 500
+    assert len(server.requests) == 1
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_transient_status_is_retried_for_reads(server):
+    server.reply(503, {'error': 'busy'}).reply(200, {'status': 'delivered'})
+
+    async def main():
+        async with make_client(server) as client:
+            return await client.get_message_status('m1')
+
+    assert run(main()) == {'status': 'delivered'}
+    assert len(server.requests) == 2
+
+
+def test_concurrency_is_bounded(server):
+    server.delay = 0.05
+
+    async def main():
+        async with make_client(server, max_concurrency=3) as client:
+            await asyncio.gather(*[client.get_message_status(f'm{i}') for i in range(12)])
+
+    run(main())
+    assert len(server.requests) == 12
+    assert server.max_in_flight <= 3
+
+
+def test_large_bodies_fall_back_to_uncompressed_after_415(server):
+    server.reply(415, {'error': 'Unsupported Media Type'})
+    contacts = [f'6220{i:05d}' for i in range(2000)]
+
+    async def main():
+        async with make_client(server, compression_threshold=1024) as client:
+            response = await client.send_message_bulk('Hello', 'MyApp', contacts)
+            return client, response
+
+    client, response = run(main())
+    assert response == {'success': True}
+    assert server.requests[0]['headers']['Content-Encoding'] == 'gzip'
+    assert 'Content-Encoding' not in server.requests[1]['headers']
+    assert json.loads(server.requests[1]['body'])['contacts'] == contacts
+    assert client._compress_requests is False
+
+
+def test_close_does_not_break_requests_in_flight(server):
+    server.delay = 0.3
+
+    async def main():
+        client = make_client(server)
+        request = asyncio.ensure_future(client.get_message_status('m1'))
+        await asyncio.sleep(0.1)
+        await client.close()
+        assert client._semaphore is not None
+        with pytest.raises(PassInfoAPIError):
+            await request
+        server.delay = 0
+        response = await client.get_message_status('m2')
+        await client.close()
+        return response
+
+    assert run(main()) == {'success': True}
@@ -0,0 +1,99 @@
+import time
+
+import pytest
+
+from passinfo_sdk.balance import BalanceTracker
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.exceptions import BalanceUnknownError
+
+
+@pytest.fixture
+def tracked(fake_api):
+    def make(**options):
+        tracker = BalanceTracker(**options)
+        client = PassInfoSDKClient('test-key', 'test-client', balance_tracker=tracker)
+        client._make_request = fake_api
+        clients.append(client)
+        return client, tracker
+
+    clients = []
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_balance_is_read_once_then_debited_locally(tracked, fake_api):
+    client, tracker = tracked()
+    fake_api.route('v1/user/get_solde', {'solde': 100})
+    fake_api.route('v1/message/single_message', {'status': 'success'})
+    fake_api.route('v1/message/send_bulk_contacts_messages', {'successful_sends': 2})
+    assert client.get_balance() == 100
+    client.send_message('a' * 200, '1', 'MyApp')
+    client.send_message_bulk('Hi', 'MyApp', ['1', '2', '3'])
+    assert client.get_balance() == 96
+    assert len(fake_api.endpoints('v1/user/get_solde')) == 1
+
+
+@pytest.mark.parametrize('response', [
+    {'error': 'Unauthorized'}, {'success': False}, {'status': 'failed'}, None,
+])
+def test_rejected_sends_are_not_debited(tracked, fake_api, response):
+    client, tracker = tracked()
+    fake_api.route('v1/user/get_solde', {'solde': 100})
+    fake_api.route('v1/message/', response)
+    client.get_balance()
+    client.send_message('Hi', '1', 'MyApp')
+    client.send_message_bulk('Hi', 'MyApp', ['1', '2'])
+    assert tracker.peek() == 100
+
+
+def test_stale_balance_is_read_again(tracked, fake_api):
+    client, tracker = tracked(max_age=0.01)
+    fake_api.route('v1/user/get_solde', {'solde': 10}, {'solde': 7})
+    assert tracker.balance == 10
+    time.sleep(0.02)
+    assert tracker.balance == 7
+    assert tracker.refreshes == 2
+
+
+def test_drift_triggers_a_background_resync(tracked, fake_api):
+    client, tracker = tracked(max_age=None, max_drift=5)
+    fake_api.route('v1/user/get_solde', {'solde': 100}, {'solde': 90})
+    tracker.refresh()
+    tracker.debit(3)
+    assert tracker.refreshes == 1
+    tracker.debit(3)
+    deadline = time.monotonic() + 2
+    while tracker.refreshes < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert tracker.peek() == 90
+
+
+def test_unreadable_balance_is_unknown_not_zero(tracked, fake_api):
+    client, tracker = tracked()
+    fake_api.route('v1/user/get_solde', {'error': 'Unauthorized'})
+    with pytest.raises(BalanceUnknownError):
+        tracker.balance
+    assert tracker.peek() is None
+    assert client.get_sms_count() == 0
+
+
+def test_debits_before_the_first_read_are_ignored(tracked, fake_api):
+    client, tracker = tracked()
+    tracker.debit(5)
+    fake_api.route('v1/user/get_solde', {'solde': 10})
+    assert tracker.balance == 10
+
+
+def test_invalidate_forces_a_read(tracked, fake_api):
+    client, tracker = tracked()
+    fake_api.route('v1/user/get_solde', {'solde': 10}, {'solde': 4})
+    tracker.balance
+    tracker.invalidate()
+    assert not tracker.known
+    assert tracker.balance == 4
+
+
+def test_tracker_without_client_cannot_refresh():
+    with pytest.raises(BalanceUnknownError):
+        BalanceTracker().refresh()
@@ -0,0 +1,80 @@
+import pytest
+
+from passinfo_sdk import bulk
+from passinfo_sdk.exceptions import PassInfoAPIError
+
+CONTACTS = [f'62200000{i}' for i in range(5)]
+
+
+@pytest.mark.parametrize('response, accepted', [
+    ({'success': True, 'batch_id': 'b1'}, True),
+    ({'success': False}, False),
+    ({'status': 'failed'}, False),
+    ({'error': 'Unauthorized'}, False),
+    (None, False),
+])
+def test_accepted(response, accepted):
+    assert bulk._accepted(response) is accepted
+
+
+def test_iter_chunks_splits_lazily():
+    chunks = list(bulk.iter_chunks(iter(CONTACTS), chunk_size=2))
+    assert [chunk.contacts for chunk in chunks] == [CONTACTS[0:2], CONTACTS[2:4], CONTACTS[4:]]
+    assert [chunk.index for chunk in chunks] == [0, 1, 2]
+    with pytest.raises(ValueError):
+        list(bulk.iter_chunks(CONTACTS, chunk_size=0))
+
+
+def test_chunked_send_merges_the_responses(client, fake_api):
+    batch_ids = iter(range(10))
+    fake_api.route('v1/message/send_bulk', lambda call: {
+        'success': True, 'batch_id': f'b{next(batch_ids)}',
+        'successful_sends': len(call['data']['contacts']), 'failed_sends': 0,
+    })
+    result = client.send_message_bulk_chunked('Hello', 'MyApp', CONTACTS, chunk_size=2, max_workers=2)
+    assert result.ok
+    assert result.sent_contacts == result.total_contacts == 5
+    assert result.successful_sends == 5
+    assert len(result.batch_ids) == 3
+    sent = sorted(c for call in fake_api.calls for c in call['data']['contacts'])
+    assert sent == CONTACTS
+
+
+@pytest.mark.parametrize('rejection', [
+    {'error': 'Unauthorized'},
+    {'success': False, 'message': 'Invalid sender'},
+    PassInfoAPIError(status_code=503, message='Service unavailable'),
+])
+def test_rejected_chunks_keep_their_contacts(client, fake_api, rejection):
+    fake_api.route('v1/message/send_bulk', rejection)
+    result = client.send_message_bulk_chunked('Hello', 'MyApp', CONTACTS, chunk_size=2)
+    assert not result.ok
+    assert result.sent_contacts == 0
+    assert result.batch_ids == []
+    assert [chunk.index for chunk in result.failed_chunks] == [0, 1, 2]
+    assert [c for chunk in result.failed_chunks for c in chunk.contacts] == CONTACTS
+    assert all(isinstance(chunk.error, PassInfoAPIError) for chunk in result.failed_chunks)
+
+
+def test_failed_chunks_can_be_resent(client, fake_api):
+    fake_api.route('v1/message/send_bulk', {'error': 'Unauthorized'}, {'error': 'Unauthorized'},
+                   {'success': True, 'batch_id': 'b1'})
+    result = client.send_message_bulk_chunked('Hello', 'MyApp', CONTACTS[:4], chunk_size=2, max_workers=1)
+    assert len(result.failed_chunks) == 2
+    retry = client.resend_failed_chunks(result)
+    assert retry.ok
+    assert retry.sent_contacts == 4
+
+
+def test_stream_yields_rejected_batches_with_their_contacts(client, fake_api):
+    fake_api.route('v1/message/send_bulk', {'error': 'Unauthorized'})
+    batches = list(client.stream_message_bulk('Hello', 'MyApp', iter(CONTACTS), batch_size=5))
+    assert len(batches) == 1
+    assert not batches[0].ok
+    assert batches[0].contacts == CONTACTS
+
+
+def test_empty_contact_list_is_refused(client, fake_api):
+    with pytest.raises(PassInfoAPIError) as excinfo:
+        client.send_message_bulk_chunked('Hello', 'MyApp', [])
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+
+from passinfo_sdk.cache import ResponseCache
+from passinfo_sdk.client import PassInfoSDKClient
+
+GROUPS = 'v1/groupe/get_all_my_groupes'
+
+
+@pytest.fixture
+def cached_client(server):
+    cache = ResponseCache()
+    client = PassInfoSDKClient('test-key', 'test-client', base_url=server.url, cache=cache)
+    yield client
+    client.close()
+
+
+def get_groups(client):
+    return client._make_request('GET', GROUPS)
+
+
+def test_fresh_entries_are_served_without_a_request(cached_client, server):
+    server.reply(200, [{'id': 1}])
+    assert get_groups(cached_client) == [{'id': 1}]
+    assert get_groups(cached_client) == [{'id': 1}]
+    assert len(server.requests) == 1
+    assert cached_client.cache.stats()['hits'] == 1
+
+
+def test_cached_values_are_copies(cached_client, server):
+    server.reply(200, [{'id': 1}])
+    get_groups(cached_client).append('changed')
+    assert get_groups(cached_client) == [{'id': 1}]
+
+
+def test_uncached_endpoints_always_hit_the_api(cached_client, server):
+    server.reply(200, {'solde': 1}).reply(200, {'solde': 2})
+    assert cached_client._make_request('GET', 'v1/user/get_solde') == {'solde': 1}
+    assert cached_client._make_request('GET', 'v1/user/get_solde') == {'solde': 2}
+
+
+def test_error_responses_are_not_cached(cached_client, server):
+    server.reply(400, {'error': 'Unauthorized'}).reply(200, [{'id': 1}])
+    assert get_groups(cached_client) == {'error': 'Unauthorized'}
+    assert get_groups(cached_client) == [{'id': 1}]
+    assert len(server.requests) == 2
+
+
+def test_no_store_responses_are_not_cached(cached_client, server):
+    server.reply(200, [1], {'Cache-Control': 'no-store'}).reply(200, [2])
+    assert get_groups(cached_client) == [1]
+    assert get_groups(cached_client) == [2]
+
+
+def test_stale_entries_are_revalidated_with_etags(cached_client, server):
+    cached_client.cache.ttls[GROUPS] = 0
+    server.reply(200, [{'id': 1}], {'ETag': '"v1"'}).reply(304, b'')
+    get_groups(cached_client)
+    assert get_groups(cached_client) == [{'id': 1}]
+    assert server.requests[1]['headers']['If-None-Match'] == '"v1"'
+    assert cached_client.cache.stats()['revalidations'] == 1
+
+
+def test_stale_entries_without_validators_are_downloaded_again(cached_client, server):
+    cached_client.cache.ttls[GROUPS] = 0
+    server.reply(200, [1]).reply(200, [2])
+    get_groups(cached_client)
+    assert get_groups(cached_client) == [2]
+    assert 'If-None-Match' not in server.requests[1]['headers']
+
+
+def test_mutations_invalidate_related_entries(cached_client, server):
+    server.reply(200, [1]).reply(200, {'success': True}).reply(200, [2])
+    get_groups(cached_client)
+    cached_client._make_request('POST', 'v1/groupe/add_contact_to_group', data={'contact_id': 1})
+    assert get_groups(cached_client) == [2]
+
+
+def test_entries_are_keyed_by_client_and_params():
+    cache = ResponseCache()
+    assert cache.key('a', GROUPS) != cache.key('b', GROUPS)
+    assert cache.key('a', GROUPS, {'page': 1, 'limit': 2}) == cache.key('a', GROUPS, {'limit': 2, 'page': 1})
+    assert cache.key('a', 'v1/user/get_solde') is None
+
+
+def test_memory_layer_evicts_the_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    for n in range(3):
+        cache.store(f'k{n}', GROUPS, b'[]', {})
+    assert cache.get('k0') is None
+    assert cache.get('k2') is not None
+    assert cache.evictions == 1
+
+
+def test_disk_layer_survives_a_restart(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = ResponseCache(path=path)
+    cache.store('k', GROUPS, b'[1]', {})
+    cache.close()
+    cache = ResponseCache(path=path)
+    try:
+        assert cache.get('k').value() == [1]
+        cache.invalidate('v1/groupe/')
+        assert cache.get('k') is None
+    finally:
+        cache.close()
+
+
+def test_entries_expire():
+    cache = ResponseCache(ttls={GROUPS: 0.01})
+    entry = cache.store('k', GROUPS, b'[]', {})
+    assert entry.fresh
+    time.sleep(0.02)
+    assert not entry.fresh
+    assert cache.get('k') is None
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from passinfo_sdk.campaign import CampaignRunner, run_campaign
+from passinfo_sdk.exceptions import PassInfoAPIError
+from passinfo_sdk.phone import PhoneNormalizer
+from passinfo_sdk.retry import RetryPolicy
+
+CONTACTS = [f'+224622{n:06d}' for n in range(10)]
+
+
+def options(server):
+    return {'base_url': server.url, 'retry_policy': RetryPolicy(max_retries=0)}
+
+
+def sent_contacts(server):
+    return sorted(contact for request in server.requests for contact in json.loads(request['body'])['contacts'])
+
+
+def test_every_contact_is_sent_once(server):
+    server.default = (200, {'successful_sends': 3, 'batch_id': 'b'}, {})
+    reports = []
+    result = run_campaign('test-key', 'test-client', 'Hi', 'MyApp', CONTACTS, processes=2, threads=2,
+                          chunk_size=3, client_options=options(server), progress=reports.append)
+    assert sent_contacts(server) == CONTACTS
+    assert (result.total_contacts, result.sent_contacts, len(result.responses)) == (10, 10, 4)
+    assert sum(result.shards.values()) == 10
+    assert result.ok and not result.worker_errors
+    assert reports[-1] is result
+    assert server.requests[0]['headers']['Client-Id'] == 'test-client'
+
+
+@pytest.mark.parametrize('reply', [
+    (400, {'error': 'Unauthorized'}, {}),
+    (200, {'success': False}, {}),
+    (200, {'status': 'failed'}, {}),
+    (503, {'error': 'Unavailable'}, {}),
+])
+def test_rejected_chunks_are_failed_with_their_contacts(server, reply):
+    server.reply(200, {'successful_sends': 3})
+    server.default = reply
+    result = run_campaign('test-key', 'test-client', 'Hi', 'MyApp', CONTACTS, processes=1, threads=1,
+                          chunk_size=3, client_options=options(server))
+    assert result.sent_contacts == 3
+    assert [chunk.index for chunk in result.failed_chunks] == [1, 2, 3]
+    assert [contact for chunk in result.failed_chunks for contact in chunk.contacts] == CONTACTS[3:]
+    assert all(isinstance(chunk.error, PassInfoAPIError) for chunk in result.failed_chunks)
+    assert result.failed_chunks[0].error.status_code == (reply[0] if reply[0] >= 500 else 400)
+
+
+def test_recipients_are_normalized_before_sharding(server):
+    runner = CampaignRunner('test-key', 'test-client', processes=1, threads=1, client_options=options(server))
+    result = runner.run('Hi', 'MyApp', ['622000001', '+224 622 000 001', 'n/a'],
+                        normalizer=PhoneNormalizer(default_country_code='224'))
+    assert sent_contacts(server) == ['+224622000001']
+    assert (result.normalization.duplicates, result.normalization.invalid) == (1, ['n/a'])
+
+
+def test_shared_rate_is_applied(server):
+    result = run_campaign('test-key', 'test-client', 'Hi', 'MyApp', CONTACTS, processes=2, threads=1,
+                          rate=1000, chunk_size=5, client_options=options(server))
+    assert result.sent_contacts == 10
+
+
+def test_empty_campaigns_and_bad_arguments_are_refused(server):
+    with pytest.raises(PassInfoAPIError):
+        run_campaign('test-key', 'test-client', 'Hi', 'MyApp', [], processes=1, client_options=options(server))
+    with pytest.raises(PassInfoAPIError):
+        run_campaign('test-key', 'test-client', None, 'MyApp', CONTACTS, processes=1)
+    with pytest.raises(ValueError):
+        CampaignRunner('test-key', 'test-client', threads=0)
+    assert not server.requests
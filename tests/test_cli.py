@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from passinfo_sdk.cli import EXIT_ERROR, EXIT_FAILURES, main
+from passinfo_sdk.outbox import Outbox
+
+
+@pytest.fixture
+def run(server):
+    def run(*argv):
+        command, rest = argv[0], list(argv[1:])
+        return main([command, '--api-key', 'test-key', '--client-id', 'test-client',
+                     '--base-url', server.url, '-q', *rest])
+    return run
+
+
+@pytest.fixture
+def recipients(tmp_path):
+    path = tmp_path / 'recipients.csv'
+    path.write_text('phone_number,first_name\n+224622000001,Awa\n+224622000002,Jane\n+224622000003,Awa\n',
+                    encoding='utf-8')
+    return str(path)
+
+
+def bodies(server):
+    return [json.loads(request['body']) for request in server.requests]
+
+
+def test_send_queues_and_sends_every_recipient(run, server, recipients):
+    server.default = (200, {'successful_sends': 2, 'batch_id': 'b1'}, {})
+    assert run('send', 'Hi', '-s', 'MyApp', '-r', recipients, '--chunk-size', '2') == 0
+    assert sorted(contact for body in bodies(server) for contact in body['contacts']) == [
+        '+224622000001', '+224622000002', '+224622000003']
+    with Outbox(recipients + '.passinfo.db') as outbox:
+        assert outbox.batch_ids() == ['b1']
+
+
+def test_send_again_resumes_without_resending(run, server, recipients):
+    assert run('send', 'Hi', '-s', 'MyApp', '-r', recipients) == 0
+    assert run('send', 'Hi', '-s', 'MyApp', '-r', recipients) == 0
+    assert len(server.requests) == 1
+
+
+def test_templated_send_groups_identical_texts(run, server, recipients):
+    assert run('send', 'Bonjour {first_name}', '--template', '-s', 'MyApp', '-r', recipients) == 0
+    assert sorted((body['message'], body['contacts']) for body in bodies(server)) == [
+        ('Bonjour Awa', ['+224622000001', '+224622000003']), ('Bonjour Jane', ['+224622000002'])]
+
+
+def test_rejected_sends_exit_with_failures_and_can_be_retried(run, server, recipients):
+    server.reply(400, {'error': 'Unauthorized'})
+    assert run('send', 'Hi', '-s', 'MyApp', '-r', recipients) == EXIT_FAILURES
+    assert run('send', 'Hi', '-s', 'MyApp', '-r', recipients, '--retry', 'failed') == 0
+    assert len(server.requests) == 2
+
+
+def test_empty_recipients_file_is_an_error(run, server, tmp_path):
+    path = tmp_path / 'empty.csv'
+    path.write_text('phone_number\n', encoding='utf-8')
+    assert run('send', 'Hi', '-s', 'MyApp', '-r', str(path)) == EXIT_ERROR
+    assert not server.requests
+
+
+def test_missing_credentials_stop_the_command(server):
+    with pytest.raises(SystemExit):
+        main(['balance', '--api-key', '', '--client-id', '', '--base-url', server.url])
+
+
+def test_balance(run, server, capsys):
+    server.reply(200, {'solde': 42})
+    assert run('balance', '--json') == 0
+    assert json.loads(capsys.readouterr().out) == {'balance': 42}
+
+
+def test_unreadable_balance_is_an_error(run, server, capsys):
+    server.reply(400, {'error': 'Unauthorized'})
+    assert run('balance') == EXIT_ERROR
+    assert 'passinfo:' in capsys.readouterr().err
+
+
+def test_status_writes_final_statuses_and_skips_them_next_time(run, server, tmp_path):
+    output = str(tmp_path / 'statuses.ndjson')
+    server.reply(200, {'status': 'COMPLETED'}).reply(200, {'status': 'processing'})
+    assert run('status', '--batch-id', 'b1', '--batch-id', 'b2', '-w', '1', '-o', output) == EXIT_FAILURES
+    records = [json.loads(line) for line in open(output, encoding='utf-8')]
+    assert [(record['id'], record['status']) for record in records] == [('b1', 'completed'), ('b2', 'processing')]
+    server.reply(200, {'status': 'completed'})
+    assert run('status', '--batch-id', 'b1', '--batch-id', 'b2', '-o', output) == 0
+    assert len(server.requests) == 3
+
+
+def test_status_reports_error_bodies_as_pending(run, server):
+    server.reply(404, {'error': 'Not found'})
+    assert run('status', '--batch-id', 'b1') == EXIT_FAILURES
+
+
+def test_import_reports_rows(run, server, tmp_path, capsys):
+    path = tmp_path / 'contacts.csv'
+    path.write_text('first_name,last_name,phone_number\nJane,Doe,622000001\n', encoding='utf-8')
+    server.reply(200, {'success': True, 'id': 1})
+    assert run('import', str(path), '--no-skip-existing', '--json') == 0
+    assert json.loads(capsys.readouterr().out)['created'] == 1
+    server.reply(200, {'error': 'Duplicate'})
+    assert run('import', str(path), '--no-skip-existing') == EXIT_FAILURES
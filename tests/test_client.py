@@ -0,0 +1,55 @@
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.exceptions import PassInfoAPIError
+
+
+@pytest.fixture
+def http_client(server):
+    client = PassInfoSDKClient('test-key', 'test-client', base_url=server.url)
+    yield client
+    client.close()
+
+
+def test_requests_reuse_one_keep_alive_connection(server, http_client):
+    for _ in range(3):
+        http_client.get_message_status('m1')
+    assert len({request['peer'] for request in server.requests}) == 1
+
+
+def test_keep_alive_disabled_closes_each_connection(server):
+    with PassInfoSDKClient('test-key', 'test-client', base_url=server.url, keep_alive=False) as client:
+        client.get_message_status('m1')
+        client.get_message_status('m1')
+    assert server.requests[0]['headers']['Connection'] == 'close'
+    assert server.requests[0]['peer'] != server.requests[1]['peer']
+
+
+def test_close_releases_the_session_and_the_client_stays_usable(server, http_client):
+    session = http_client.session
+    http_client.close()
+    assert http_client._session is None
+    http_client.get_message_status('m1')
+    assert http_client.session is not session
+
+
+def test_credentials_are_sent_and_follow_key_rotation(server, http_client):
+    http_client.get_message_status('m1')
+    http_client.api_key = 'rotated-key'
+    http_client.get_message_status('m1')
+    assert server.requests[0]['headers']['Api-Key'] == 'test-key'
+    assert server.requests[0]['headers']['Client-Id'] == 'test-client'
+    assert server.requests[1]['headers']['Api-Key'] == 'rotated-key'
+
+
+def test_error_bodies_are_returned_not_raised(server, http_client):
+    server.reply(401, {'error': 'Unauthorized'})
+    assert http_client.get_message_status('m1') == {'error': 'Unauthorized'}
+
+
+@pytest.mark.parametrize('body', [b'', b'<html>Bad gateway</html>'])
+def test_undecodable_body_raises(server, http_client, body):
+    server.reply(200, body)
+    with pytest.raises(PassInfoAPIError) as excinfo:
+        http_client.get_message_status('m1')
+    assert excinfo.value.status_code == 500
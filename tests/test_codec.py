@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.codec import BulkPayload, JSONCodec, available_codecs, get_codec
+from passinfo_sdk.exceptions import PassInfoAPIError
+
+DOCUMENT = {'message': 'Bonne année 🎉', 'contacts': ['+224622000001'], 'count': 2, 'ok': True, 'none': None}
+
+
+@pytest.fixture(params=available_codecs())
+def codec(request):
+    return get_codec(request.param)
+
+
+def test_dumps_is_compact_utf8(codec):
+    body = codec.dumps(DOCUMENT)
+    assert isinstance(body, bytes)
+    assert json.loads(body) == DOCUMENT
+    assert b', ' not in body and 'année'.encode('utf-8') in body
+
+
+def test_loads_accepts_bytes_and_str(codec):
+    text = json.dumps(DOCUMENT)
+    assert codec.loads(text) == DOCUMENT
+    assert codec.loads(text.encode('utf-8')) == DOCUMENT
+
+
+@pytest.mark.parametrize('body', [b'', b'<html>', b'{"a":'])
+def test_invalid_json_raises_value_error(codec, body):
+    with pytest.raises(ValueError):
+        codec.loads(body)
+
+
+def test_get_codec():
+    assert get_codec().name == available_codecs()[0]
+    instance = get_codec('json')
+    assert get_codec(instance) is instance
+    assert available_codecs()[-1] == 'json'
+    with pytest.raises(ValueError):
+        get_codec('yaml')
+
+
+def test_bulk_payload_matches_a_full_encoding(codec):
+    payload = BulkPayload('Bonne année 🎉 "quoted"', 'MyApp', codec)
+    body = payload.encode(['+224622000001', '+224622000002'])
+    assert json.loads(body) == {
+        'message': 'Bonne année 🎉 "quoted"', 'senderName': 'MyApp',
+        'contacts': ['+224622000001', '+224622000002'],
+    }
+
+
+def test_client_sends_with_its_codec(server):
+    class RecordingCodec(JSONCodec):
+        name = 'recording'
+
+        def __init__(self):
+            self.encoded = self.decoded = 0
+
+        def dumps(self, obj):
+            self.encoded += 1
+            return json.dumps(obj).encode()
+
+        def loads(self, data):
+            self.decoded += 1
+            return json.loads(data)
+
+    codec = RecordingCodec()
+    server.reply(200, {'status': 'success'})
+    with PassInfoSDKClient('test-key', 'test-client', base_url=server.url, codec=codec) as client:
+        assert client.send_message('Hi', '1', 'MyApp') == {'status': 'success'}
+    assert (codec.encoded, codec.decoded) == (1, 1)
+    assert json.loads(server.requests[0]['body'])['contact'] == '1'
+
+
+@pytest.mark.parametrize('status', [200, 400])
+def test_undecodable_responses_raise(server, status):
+    server.reply(status, b'<html>Bad gateway</html>')
+    with PassInfoSDKClient('test-key', 'test-client', base_url=server.url) as client:
+        with pytest.raises(PassInfoAPIError) as excinfo:
+            client._make_request('GET', 'v1/user/get_solde')
+    assert excinfo.value.status_code == (500 if status == 200 else status)
@@ -0,0 +1,85 @@
+import gzip
+import json
+
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.metrics import ClientMetrics
+from passinfo_sdk.retry import CircuitBreaker
+
+BULK = 'v1/message/send_bulk_contacts_messages'
+CONTACTS = [f'+224622{n:06d}' for n in range(2000)]
+
+
+def make_client(server, **options):
+    return PassInfoSDKClient('test-key', 'test-client', base_url=server.url, **options)
+
+
+def test_large_bodies_are_gzipped(server):
+    metrics = ClientMetrics()
+    with make_client(server, metrics=metrics) as client:
+        client.send_message_bulk('Hi', 'MyApp', CONTACTS)
+    request = server.requests[0]
+    assert request['headers']['Content-Encoding'] == 'gzip'
+    assert json.loads(request['body'])['contacts'] == CONTACTS
+    stats = metrics.endpoint(BULK)
+    assert stats.compressed == 1
+    assert stats.bytes_sent < len(request['body'])
+
+
+def test_small_bodies_are_sent_as_is(server):
+    with make_client(server) as client:
+        client.send_message('Hi', '1', 'MyApp')
+    assert 'Content-Encoding' not in server.requests[0]['headers']
+
+
+def test_compression_can_be_turned_off(server):
+    with make_client(server, compression=False) as client:
+        client.send_message_bulk('Hi', 'MyApp', CONTACTS)
+    headers = server.requests[0]['headers']
+    assert 'Content-Encoding' not in headers
+    assert headers['Accept-Encoding'] == 'identity'
+
+
+def test_415_falls_back_to_uncompressed_bodies(server):
+    server.reply(415, {'error': 'Unsupported Media Type'}).reply(200, {'successful_sends': 2000})
+    with make_client(server) as client:
+        assert client.send_message_bulk('Hi', 'MyApp', CONTACTS) == {'successful_sends': 2000}
+        client.send_message_bulk('Hi', 'MyApp', CONTACTS)
+    encodings = [request['headers'].get('Content-Encoding') for request in server.requests]
+    assert encodings == ['gzip', None, None]
+    assert json.loads(server.requests[1]['body'])['contacts'] == CONTACTS
+
+
+def test_415_without_compression_is_returned(server):
+    server.reply(415, {'error': 'Unsupported Media Type'})
+    with make_client(server) as client:
+        assert client.send_message('Hi', '1', 'MyApp') == {'error': 'Unsupported Media Type'}
+    assert len(server.requests) == 1
+
+
+def test_half_open_breaker_lets_the_fallback_through(server):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    server.reply(415, {}).reply(200, {'successful_sends': 2000})
+    with make_client(server, circuit_breaker=breaker) as client:
+        assert client.send_message_bulk('Hi', 'MyApp', CONTACTS) == {'successful_sends': 2000}
+    assert len(server.requests) == 2
+    assert breaker.state == 'closed'
+
+
+def test_compressed_responses_are_decoded_and_measured(server):
+    body = json.dumps({'groups': ['x' * 50] * 200}).encode()
+    server.reply(200, gzip.compress(body), {'Content-Encoding': 'gzip', 'Content-Type': 'application/json'})
+    metrics = ClientMetrics()
+    with make_client(server, metrics=metrics) as client:
+        assert client._make_request('GET', 'v1/groupe/get_all_my_groupes') == json.loads(body)
+    stats = metrics.endpoint('v1/groupe/get_all_my_groupes')
+    assert stats.response_bytes_saved == len(body) - stats.bytes_received > 0
+
+
+@pytest.mark.parametrize('level', [1, 9])
+def test_compression_level_is_applied(server, level):
+    with make_client(server, compression_level=level, compression_threshold=1) as client:
+        client.send_message_bulk('Hi', 'MyApp', CONTACTS[:10])
+    assert server.requests[0]['headers']['Content-Encoding'] == 'gzip'
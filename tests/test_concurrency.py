@@ -0,0 +1,69 @@
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.concurrency import AdaptiveConcurrencyLimiter
+from passinfo_sdk.exceptions import PassInfoAPIError
+from passinfo_sdk.retry import RetryPolicy
+
+
+def test_acquire_waits_while_the_limit_is_reached():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+    assert limiter.acquire() and limiter.acquire()
+    assert not limiter.acquire(timeout=0.05)
+    limiter.release(0.01)
+    assert limiter.acquire(timeout=0.05)
+
+
+def test_successes_under_load_raise_the_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=6, latency_tolerance=None)
+    for _ in range(20):
+        slots = limiter.limit
+        for _ in range(slots):
+            limiter.acquire()
+        for _ in range(slots):
+            limiter.release(0.01)
+    assert limiter.limit == 6
+    assert limiter.in_flight == 0
+
+
+def test_idle_successes_do_not_raise_the_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+    for _ in range(50):
+        limiter.acquire()
+        limiter.release(0.01)
+    assert limiter.limit == 8
+
+
+def test_congestion_cuts_the_limit_once_per_round_trip():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=16, min_limit=2)
+    for _ in range(3):
+        limiter.acquire()
+    for _ in range(3):
+        limiter.release(1.0, congested=True)
+    assert limiter.limit == 8
+    assert limiter.congestion_events == 1
+
+
+def test_limit_never_drops_below_min_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=3)
+    limiter.acquire()
+    limiter.release(0.0, congested=True)
+    assert limiter.limit == 3
+
+
+def test_rejects_an_invalid_decrease_factor():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(decrease_factor=1)
+
+
+def test_rate_limited_sends_count_as_congestion(server):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+    server.reply(429, {'error': 'slow down'})
+    with PassInfoSDKClient('test-key', 'test-client', base_url=server.url, concurrency_limiter=limiter,
+                           retry_policy=RetryPolicy(max_retries=0)) as client:
+        with pytest.raises(PassInfoAPIError):
+            client.send_message('Hello', '622000001', 'MyApp')
+        client.get_message_status('m1')
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+    assert limiter.completed == 1
@@ -0,0 +1,101 @@
+import itertools
+
+import pytest
+
+from passinfo_sdk.contact_import import (
+    CREATED, DUPLICATE, EXISTING, FAILED, INVALID, iter_contact_rows, phone_key,
+)
+from passinfo_sdk.exceptions import PassInfoAPIError
+from passinfo_sdk.models import Contact
+
+
+def created(start=1):
+    ids = itertools.count(start)
+    return lambda call: {'success': True, 'id': next(ids)}
+
+
+@pytest.mark.parametrize('value, key', [
+    ('+224 622-00.00(01)', '+224622000001'),
+    ('00224622000001', '+224622000001'),
+    ('622 00 00 01', '622000001'),
+    ('   ', None),
+    (None, None),
+])
+def test_phone_key(value, key):
+    assert phone_key(value) == key
+
+
+def test_rows_are_read_from_files_and_objects(tmp_path):
+    path = tmp_path / 'contacts.csv'
+    path.write_text('Prenom,Nom,Telephone\nJane,Doe, 622000001 \n', encoding='utf-8')
+    assert list(iter_contact_rows(str(path))) == [('Jane', 'Doe', '622000001')]
+    assert list(iter_contact_rows([
+        Contact('A', 'B', '1'), ('C', 'D', 2), {'phone': '3'}, '4',
+    ])) == [('A', 'B', '1'), ('C', 'D', '2'), ('', '', '3'), ('', '', '4')]
+
+
+def test_rows_get_a_status_each(api, fake_api):
+    fake_api.route('v1/contact/add_contact', created())
+    report = api.import_contacts(
+        [('A', 'A', '622000001'), ('B', 'B', '622 000 001'), ('C', 'C', ''), ('D', 'D', '622000002'),
+         ('E', 'E', '622000003')],
+        existing=['622000002'],
+    )
+    assert [row.status for row in report.rows] == [CREATED, DUPLICATE, INVALID, EXISTING, CREATED]
+    assert report.ok
+    assert report.stats()['created'] == 2
+    assert len(fake_api.endpoints('v1/contact/add_contact')) == 2
+
+
+@pytest.mark.parametrize('response', [{'error': 'Duplicate'}, {'success': False}, ['unexpected'], None])
+def test_rejected_creations_fail_their_row_only(api, fake_api, response):
+    fake_api.route('v1/contact/add_contact', response, {'success': True, 'id': 2})
+    report = api.import_contacts([('A', 'A', '622000001'), ('B', 'B', '622000002')],
+                                 skip_existing=False, max_workers=1)
+    assert [row.status for row in report.rows] == [FAILED, CREATED]
+    assert isinstance(report.rows[0].error, PassInfoAPIError)
+    assert not report.ok
+
+
+@pytest.mark.parametrize('response', [{'error': 'Unknown group'}, ['unexpected'], None])
+def test_rejected_group_adds_are_recorded(api, fake_api, response):
+    fake_api.route('v1/contact/add_contact', created())
+    fake_api.route('v1/groupe/add_contact_to_group', response, {'success': True})
+    report = api.import_contacts([('A', 'A', '622000001'), ('B', 'B', '622000002')],
+                                 group_id='g1', skip_existing=False, max_workers=1)
+    assert [row.status for row in report.rows] == [CREATED, CREATED]
+    assert [row.grouped for row in report.rows] == [False, True]
+    assert (report.grouped, report.group_failures) == (1, 1)
+
+
+def test_existing_contacts_with_an_id_are_grouped(api, fake_api):
+    fake_api.route('v1/groupe/add_contact_to_group', {'success': True})
+    report = api.import_contacts(['622000001', '622000002'], group_id='g1',
+                                 existing=[Contact('A', 'A', '622000001', '9'), '622000002'])
+    assert [(row.status, row.grouped) for row in report.rows] == [(EXISTING, True), (EXISTING, None)]
+    assert fake_api.calls[0]['data'] == {'contact_id': '9', 'group_id': 'g1'}
+
+
+def test_existing_contacts_are_downloaded(api, fake_api):
+    fake_api.route('v1/contact/all_my_contacts', {'contacts': [{'id': 1, 'phone_number': '622000001'}]})
+    fake_api.route('v1/contact/add_contact', created(2))
+    report = api.import_contacts(['622000001', '622000002'])
+    assert [row.status for row in report.rows] == [EXISTING, CREATED]
+
+
+@pytest.mark.parametrize('response', [{'error': 'Unauthorized'}, ['unexpected']])
+def test_failed_download_of_existing_contacts_aborts(api, fake_api, response):
+    fake_api.route('v1/contact/all_my_contacts', response)
+    with pytest.raises(PassInfoAPIError):
+        api.import_contacts(['622000001'])
+    assert not fake_api.endpoints('v1/contact/add_contact')
+
+
+def test_report_is_written_as_csv(api, fake_api, tmp_path):
+    fake_api.route('v1/contact/add_contact', {'error': 'Duplicate'})
+    report = api.import_contacts([('A', 'A', '622000001')], skip_existing=False)
+    path = tmp_path / 'report.csv'
+    report.write_csv(str(path))
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert lines[0].startswith('row,first_name')
+    assert lines[1].startswith('0,A,A,622000001,failed,,,')
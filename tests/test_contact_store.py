@@ -0,0 +1,96 @@
+import pytest
+
+from passinfo_sdk.contact_store import ContactStore
+from passinfo_sdk.exceptions import PassInfoAPIError
+from passinfo_sdk.models import Contact, PassInfoAPI
+
+
+def listing(*numbers):
+    return {'contacts': [
+        {'id': n, 'first_name': f'F{n}', 'last_name': f'L{n}', 'phone_number': f'62200000{n}'}
+        for n in numbers
+    ]}
+
+
+@pytest.fixture
+def store():
+    store = ContactStore(':memory:')
+    yield store
+    store.close()
+
+
+def test_first_sync_is_full_and_fills_the_store(api, fake_api, store):
+    fake_api.route('v1/contact/all_my_contacts', listing(1, 2, 3))
+    result = store.sync(api, page_size=10)
+    assert (result.full, result.fetched, result.removed, result.total) == (True, 3, 0, 3)
+    assert store.find_by_phone('622000002').contact_id == '2'
+    assert store.find_by_name(first_name='f3')[0].phone_number == '622000003'
+    assert store.last_sync is not None
+
+
+def test_full_sync_prunes_contacts_gone_from_the_account(api, fake_api, store):
+    fake_api.route('v1/contact/all_my_contacts', listing(1, 2, 3), listing(1, 3))
+    store.sync(api, page_size=10)
+    result = store.sync(api, full=True, page_size=10)
+    assert result.removed == 1
+    assert store.phone_numbers() == {'622000001', '622000003'}
+
+
+def test_error_listing_keeps_the_store(api, fake_api, store):
+    fake_api.route('v1/contact/all_my_contacts', listing(1), {'error': 'Unauthorized'})
+    store.sync(api, page_size=10)
+    with pytest.raises(PassInfoAPIError):
+        store.sync(api, full=True, page_size=10)
+    assert len(store) == 1
+
+
+def test_non_dict_listing_keeps_the_store(api, fake_api, store):
+    fake_api.route('v1/contact/all_my_contacts', listing(1), ['unexpected'])
+    store.sync(api, page_size=10)
+    with pytest.raises(PassInfoAPIError):
+        store.sync(api, full=True, page_size=10)
+    assert len(store) == 1
+
+
+def test_empty_listing_does_not_prune(api, fake_api, store):
+    fake_api.route('v1/contact/all_my_contacts', listing(1, 2), {'contacts': []})
+    store.sync(api, page_size=10)
+    result = store.sync(api, full=True, page_size=10)
+    assert (result.fetched, result.removed, result.total) == (0, 0, 2)
+
+
+def test_incremental_sync_resumes_from_the_last_page(api, fake_api, store):
+    def page(call):
+        numbers = {1: (1, 2), 2: (3, 4), 3: (5,)}.get(call['params']['page'], ())
+        return listing(*numbers)
+
+    fake_api.route('v1/contact/all_my_contacts', listing(1, 2), listing(3))
+    store.sync(api, page_size=2, window=0)
+    fake_api.route('v1/contact/all_my_contacts', page)
+    fake_api.calls.clear()
+    result = store.sync(api, page_size=2, window=0)
+    assert not result.full
+    assert [call['params']['page'] for call in fake_api.calls] == [2, 3]
+    assert len(store) == 5
+
+
+def test_write_through_from_the_api(fake_api, store):
+    api = PassInfoAPI('test-key', 'test-client', contact_store=store)
+    api.client._make_request = fake_api
+    fake_api.route('v1/contact/add_contact', {'success': True, 'id': 7}, {'error': 'Duplicate'})
+    fake_api.route('v1/groupe/add_contact_to_group', {'success': True})
+    try:
+        assert api.create_contact('Jane', 'Doe', '622000007').contact_id == '7'
+        assert api.create_contact('John', 'Doe', '622000008') is None
+        assert api.add_contact_to_group('7', 'g1') is True
+    finally:
+        api.close()
+    assert store.phone_numbers() == {'622000007'}
+    assert [c.first_name for c in store.find_by_group('g1')] == ['Jane']
+
+
+def test_upsert_keeps_a_known_id(store):
+    store.upsert(Contact('Jane', 'Doe', '622000001', '1'))
+    store.upsert(Contact('Janet', 'Doe', '622000001'))
+    contact = store.find_by_phone('622000001')
+    assert (contact.first_name, contact.contact_id) == ('Janet', '1')
@@ -0,0 +1,93 @@
+import pytest
+
+from passinfo_sdk.contact_table import ContactTable
+from passinfo_sdk.exceptions import PassInfoAPIError
+from passinfo_sdk.models import Contact
+
+ROWS = [
+    ('Jane', 'Doe', '+224622000001', 'a1'),
+    ('John', 'Doe', '+224655000002', None),
+    ('Jane', 'Roe', '+33612345678', 'c3'),
+    ('Awa', 'Diallo', '622 000 004', 'd4'),
+]
+
+
+@pytest.fixture
+def table():
+    return ContactTable(ROWS)
+
+
+def test_rows_round_trip(table):
+    assert list(table.rows()) == ROWS
+    assert table.phone_numbers() == [row[2] for row in ROWS]
+    assert table.contact_ids() == [row[3] for row in ROWS]
+    contact = table[-1]
+    assert isinstance(contact, Contact)
+    assert (contact.first_name, contact.phone_number, contact.contact_id) == ('Awa', '622 000 004', 'd4')
+    with pytest.raises(IndexError):
+        table[4]
+
+
+def test_records_of_every_shape_are_accepted():
+    table = ContactTable([
+        Contact('A', 'B', '+1555000001', '1'),
+        {'first_name': 'C', 'last_name': 'D', 'phone_number': '+1555000002', 'contact_id': 2},
+        '+1555000003',
+        ('E', 'F', '+1555000004'),
+    ])
+    assert list(table.rows()) == [
+        ('A', 'B', '+1555000001', '1'), ('C', 'D', '+1555000002', '2'),
+        ('', '', '+1555000003', None), ('E', 'F', '+1555000004', None),
+    ]
+
+
+@pytest.mark.parametrize('key', [slice(1, 3), slice(None, None, 2), slice(3, 1), slice(-2, None)])
+def test_slices_match_lists(table, key):
+    assert list(table[key].rows()) == ROWS[key]
+
+
+def test_take_keeps_the_requested_order(table):
+    assert list(table.take([3, 0]).rows()) == [ROWS[3], ROWS[0]]
+
+
+@pytest.mark.parametrize('conditions, expected', [
+    ({'first_name': 'Jane'}, [0, 2]),
+    ({'first_name': 'Nobody'}, []),
+    ({'last_name': 'Doe', 'first_name': 'John'}, [1]),
+    ({'phone_prefix': '+224'}, [0, 1]),
+    ({'phone_prefix': '622'}, [3]),
+    ({'has_id': False}, [1]),
+    ({'has_id': True, 'phone_prefix': '+2246'}, [0]),
+    ({'predicate': lambda contact: contact.last_name.endswith('oe')}, [0, 1, 2]),
+])
+def test_filter(table, conditions, expected):
+    assert list(table.filter(**conditions).rows()) == [ROWS[n] for n in expected]
+
+
+def test_file_is_loaded(tmp_path):
+    path = tmp_path / 'contacts.ndjson'
+    path.write_text('{"first_name": "Jane", "last_name": "Doe", "phone_number": "+224622000001", "id": 7}\n')
+    assert list(ContactTable.from_file(path).rows()) == [('Jane', 'Doe', '+224622000001', '7')]
+
+
+def test_table_is_smaller_than_contact_objects():
+    rows = [('Jane', 'Doe', f'+224622{n:06d}', f'id-{n:020d}') for n in range(5000)]
+    assert ContactTable(rows).nbytes < 5000 * 80
+
+
+def test_from_api_downloads_every_page(api, fake_api):
+    def page(call):
+        start = (call['params']['page'] - 1) * call['params']['limit']
+        return {'contacts': [{'id': n, 'first_name': 'F', 'phone_number': f'+22462200000{n}'}
+                             for n in range(start, min(5, start + call['params']['limit']))]}
+
+    fake_api.route('v1/contact/all_my_contacts', page)
+    table = ContactTable.from_api(api, page_size=2, window=2)
+    assert table.contact_ids() == ['0', '1', '2', '3', '4']
+
+
+@pytest.mark.parametrize('response', [{'error': 'Unauthorized'}, ['unexpected'], {'contacts': None}])
+def test_from_api_raises_on_bad_pages(api, fake_api, response):
+    fake_api.route('v1/contact/all_my_contacts', response)
+    with pytest.raises(PassInfoAPIError):
+        ContactTable.from_api(api)
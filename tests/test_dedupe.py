@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.dedupe import (
+    FLAG, BloomWindow, DuplicateSendFilter, ExactWindow, send_fingerprint,
+)
+from passinfo_sdk.exceptions import DuplicateSendError, PassInfoAPIError
+
+
+def test_fingerprints_cover_every_field():
+    base = send_fingerprint('single', 'Hi', '1', 'MyApp')
+    assert base == send_fingerprint('single', 'Hi', '1', 'MyApp')
+    assert len({base, send_fingerprint('bulk', 'Hi', '1', 'MyApp'), send_fingerprint('single', 'Ho', '1', 'MyApp'),
+                send_fingerprint('single', 'Hi', '2', 'MyApp'), send_fingerprint('single', 'Hi', '1', 'App')}) == 5
+
+
+def test_exact_window_expires_and_is_bounded():
+    window = ExactWindow(window=10, max_entries=2)
+    window.add(1, now=0)
+    window.add(2, now=5)
+    assert window.contains(1, now=9)
+    assert not window.contains(1, now=10)
+    window.add(3, now=11)
+    window.add(4, now=12)
+    assert not window.contains(2, now=12)
+    assert len(window) == 2
+
+
+def test_bloom_window_finds_recent_fingerprints_and_forgets_old_ones():
+    window = BloomWindow(window=10, capacity=1000)
+    fingerprints = [send_fingerprint('single', 'Hi', str(n), 'MyApp') for n in range(1000)]
+    for fingerprint in fingerprints:
+        window.add(fingerprint, now=0)
+    assert all(window.contains(fingerprint, now=5) for fingerprint in fingerprints)
+    others = [send_fingerprint('single', 'Hi', str(n), 'MyApp') for n in range(1000, 11000)]
+    assert sum(window.contains(fingerprint, now=5) for fingerprint in others) < 50
+    assert not window.contains(fingerprints[0], now=30)
+
+
+def test_large_filters_use_a_bloom_index():
+    assert isinstance(DuplicateSendFilter().index, ExactWindow)
+    assert isinstance(DuplicateSendFilter(max_entries=10 ** 6).index, BloomWindow)
+    with pytest.raises(ValueError):
+        DuplicateSendFilter(mode='drop')
+
+
+def test_concurrent_identical_sends_are_duplicates():
+    dedupe = DuplicateSendFilter()
+    fingerprint = dedupe.begin('single', 'Hi', '1', 'MyApp')
+    with pytest.raises(DuplicateSendError):
+        dedupe.begin('single', 'Hi', '1', 'MyApp')
+    dedupe.end(fingerprint, False)
+    dedupe.begin('single', 'Hi', '1', 'MyApp')
+
+
+@pytest.fixture
+def filtered(fake_api):
+    def make(**options):
+        client = PassInfoSDKClient('test-key', 'test-client', duplicate_filter=DuplicateSendFilter(**options))
+        client._make_request = fake_api
+        clients.append(client)
+        return client
+
+    clients = []
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_accepted_sends_suppress_repeats(filtered, fake_api):
+    client = filtered()
+    fake_api.route('v1/message/', {'status': 'success'})
+    client.send_message('Hi', '1', 'MyApp')
+    with pytest.raises(DuplicateSendError):
+        client.send_message('Hi', '1', 'MyApp')
+    client.send_message('Hi', '2', 'MyApp')
+    client.send_message_bulk('Hi', 'MyApp', ['1', '2'])
+    with pytest.raises(DuplicateSendError):
+        client.send_message_bulk('Hi', 'MyApp', ['1', '2'])
+    assert len(fake_api.calls) == 3
+
+
+@pytest.mark.parametrize('response', [
+    {'error': 'Unauthorized'}, {'success': False}, None, PassInfoAPIError(status_code=503, message='down'),
+])
+def test_rejected_sends_can_be_retried(filtered, fake_api, response):
+    client = filtered()
+    fake_api.route('v1/message/single_message', response, {'status': 'success'})
+    try:
+        client.send_message('Hi', '1', 'MyApp')
+    except PassInfoAPIError:
+        pass
+    assert client.send_message('Hi', '1', 'MyApp') == {'status': 'success'}
+
+
+def test_flag_mode_sends_duplicates(filtered, fake_api):
+    client = filtered(mode=FLAG)
+    fake_api.route('v1/message/', {'status': 'success'})
+    client.send_message('Hi', '1', 'MyApp')
+    client.send_message('Hi', '1', 'MyApp')
+    assert len(fake_api.calls) == 2
+    assert client.duplicate_filter.duplicates == 1
+
+
+def test_only_one_of_many_racing_sends_goes_through(filtered, fake_api):
+    client = filtered()
+    gate = threading.Event()
+    fake_api.route('v1/message/', lambda call: gate.wait(5) and {'status': 'success'})
+    outcomes = []
+
+    def send():
+        try:
+            outcomes.append(client.send_message('Hi', '1', 'MyApp'))
+        except DuplicateSendError as e:
+            outcomes.append(e)
+
+    threads = [threading.Thread(target=send) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while len(outcomes) < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    gate.set()
+    for thread in threads:
+        thread.join()
+    assert len(fake_api.calls) == 1
+    assert sum(isinstance(outcome, DuplicateSendError) for outcome in outcomes) == 7
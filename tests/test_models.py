@@ -0,0 +1,70 @@
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.metrics import ClientMetrics
+from passinfo_sdk.models import PassInfoAPI
+
+
+def test_calls_reuse_one_connection(server):
+    server.reply(200, []).reply(200, {'solde': 3})
+    with PassInfoAPI('test-key', 'test-client', base_url=server.url) as api:
+        api.get_user_groups()
+        api.get_sms_count()
+    assert len({request['peer'] for request in server.requests}) == 1
+
+
+def test_credentials_are_sent_and_follow_rotation(server):
+    with PassInfoAPI('test-key', 'test-client', base_url=server.url) as api:
+        api.get_user_groups()
+        api.api_key = 'new-key'
+        api.get_user_groups()
+    first, second = (request['headers'] for request in server.requests)
+    assert (first['Api-Key'], first['Client-Id']) == ('test-key', 'test-client')
+    assert (second['Api-Key'], second['Client-Id']) == ('new-key', 'test-client')
+
+
+def test_shared_client_sends_its_own_credentials(server):
+    client = PassInfoSDKClient('test-key', 'test-client', base_url=server.url)
+    api = PassInfoAPI(None, None, client=client)
+    try:
+        assert api.client is client
+        assert (api.api_key, api.client_id) == ('test-key', 'test-client')
+        api.get_user_groups()
+    finally:
+        client.close()
+    assert server.requests[0]['headers']['Client-Id'] == 'test-client'
+
+
+@pytest.mark.parametrize('api_key, client_id', [('other-key', None), (None, 'other-client')])
+def test_shared_client_rejects_conflicting_credentials(api_key, client_id):
+    client = PassInfoSDKClient('test-key', 'test-client')
+    try:
+        with pytest.raises(ValueError):
+            PassInfoAPI(api_key, client_id, client=client)
+        assert PassInfoAPI('test-key', 'test-client', client=client).client is client
+    finally:
+        client.close()
+
+
+def test_metrics_record_requests_errors_and_latency(server):
+    metrics = ClientMetrics()
+    server.reply(200, []).reply(400, {'error': 'Unauthorized'})
+    with PassInfoAPI('test-key', 'test-client', base_url=server.url, metrics=metrics) as api:
+        api.get_user_groups()
+        api.get_user_groups()
+    stats = metrics.endpoint('v1/groupe/get_all_my_groupes')
+    assert (stats.requests, stats.errors) == (2, 1)
+    assert stats.max_latency > 0
+    snapshot = metrics.snapshot()
+    assert snapshot['status_codes'] == {200: 1, 400: 1}
+    metrics.reset()
+    assert metrics.requests == 0
+
+
+def test_metrics_group_calls_by_operation():
+    metrics = ClientMetrics()
+    metrics.record_request('v1/message/get_single_status/1', 200, 0.1)
+    metrics.record_request('v1/message/get_single_status/2', None, 0.3)
+    stats = metrics.endpoint('v1/message/get_single_status/3')
+    assert (stats.requests, stats.errors) == (2, 1)
+    assert stats.mean_latency == pytest.approx(0.2)
@@ -0,0 +1,102 @@
+import pytest
+
+from passinfo_sdk.exceptions import PassInfoAPIError
+from passinfo_sdk.outbox import (
+    FAILED, PENDING, SENT, UNKNOWN, Outbox, idempotency_key, request_key_of,
+)
+
+BULK = 'v1/message/send_bulk_contacts_messages'
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = Outbox(str(tmp_path / 'outbox.db'), batch_size=2, synchronous='NORMAL')
+    yield outbox
+    outbox.close()
+
+
+def test_keys_are_deterministic():
+    assert idempotency_key('Hi', 'MyApp', '1') == idempotency_key('Hi', 'MyApp', '1')
+    assert idempotency_key('Hi', 'MyApp', '1') != idempotency_key('Hi', 'MyApp', '2')
+    assert idempotency_key('Hi', 'MyApp', '1', campaign='c1') == 'c1:1'
+    assert request_key_of(['b', 'a']) == request_key_of(['a', 'b'])
+
+
+def test_enqueueing_twice_stores_once(outbox):
+    assert outbox.enqueue_bulk('Hi', 'MyApp', ['1', '2', '3'], campaign='c1') == 3
+    assert outbox.enqueue_bulk('Hi', 'MyApp', ['2', '3', '4'], campaign='c1') == 1
+    assert outbox.enqueue('Hi', 'MyApp', '1') is True
+    assert outbox.enqueue('Hi', 'MyApp', '1') is False
+    assert (outbox.count(), outbox.count('c1')) == (5, 4)
+
+
+def test_drain_sends_in_batches_with_stable_keys(outbox, client, fake_api):
+    batches = iter(['b1', 'b2'])
+    fake_api.route(BULK, lambda call: {'batch_id': next(batches)})
+    outbox.enqueue_bulk('Hi', 'MyApp', ['1', '2', '3'], campaign='c1')
+    result = outbox.drain(client, max_workers=1)
+    assert (result.requests, result.sent, result.failed, result.unknown) == (2, 3, 0, 0)
+    assert [call['data']['contacts'] for call in fake_api.calls] == [['1', '2'], ['3']]
+    assert fake_api.calls[0]['headers']['Idempotency-Key'] == request_key_of(['c1:1', 'c1:2'])
+    assert outbox.batch_ids() == ['b1', 'b2']
+    assert outbox.get('c1:3').status == SENT
+    assert outbox.stats()[SENT] == 3
+
+
+@pytest.mark.parametrize('response', [{'error': 'Unauthorized'}, {'success': False}, None])
+def test_rejected_requests_are_failed(outbox, client, fake_api, response):
+    fake_api.route(BULK, response)
+    outbox.enqueue_bulk('Hi', 'MyApp', ['1'], campaign='c1')
+    result = outbox.drain(client, max_workers=1)
+    assert result.failed == 1
+    entry = outbox.get('c1:1')
+    assert (entry.status, entry.attempts) == (FAILED, 1)
+    assert 'Rejected by the API' in entry.error
+
+
+@pytest.mark.parametrize('status_code, outcome', [(503, UNKNOWN), (500, UNKNOWN), (400, FAILED)])
+def test_raised_errors_are_classified(outbox, client, fake_api, status_code, outcome):
+    fake_api.route(BULK, PassInfoAPIError(status_code=status_code, message='boom'))
+    outbox.enqueue_bulk('Hi', 'MyApp', ['1'], campaign='c1')
+    outbox.drain(client, max_workers=1)
+    assert outbox.get('c1:1').status == outcome
+
+
+def test_requeued_groups_keep_their_request_key(outbox, client, fake_api):
+    fake_api.route(BULK, PassInfoAPIError(status_code=503, message='timeout'), {'batch_id': 'b1'})
+    outbox.enqueue_bulk('Hi', 'MyApp', ['1', '2'], campaign='c1')
+    outbox.drain(client, max_workers=1)
+    assert outbox.requeue(UNKNOWN) == 2
+    outbox.drain(client, max_workers=1)
+    first, second = (call['headers']['Idempotency-Key'] for call in fake_api.calls)
+    assert first == second
+    assert outbox.get('c1:2').attempts == 2
+    with pytest.raises(ValueError):
+        outbox.requeue(PENDING)
+
+
+def test_entries_in_flight_at_close_are_unknown_on_reopen(tmp_path):
+    path = str(tmp_path / 'outbox.db')
+    outbox = Outbox(path)
+    outbox.enqueue_bulk('Hi', 'MyApp', ['1', '2'], campaign='c1')
+    outbox._claim()
+    outbox.close()
+    outbox = Outbox(path)
+    try:
+        assert outbox.recovered == 2
+        assert [entry.status for entry in outbox.entries()] == [UNKNOWN, UNKNOWN]
+    finally:
+        outbox.close()
+
+
+def test_sent_entries_can_be_purged(outbox, client, fake_api):
+    fake_api.route(BULK, {'batch_id': 'b1'})
+    outbox.enqueue('Hi', 'MyApp', '1')
+    outbox.drain(client)
+    assert outbox.purge() == 1
+    assert outbox.enqueue('Hi', 'MyApp', '1') is True
+
+
+def test_synchronous_is_validated(tmp_path):
+    with pytest.raises(ValueError):
+        Outbox(str(tmp_path / 'outbox.db'), synchronous='OFF')
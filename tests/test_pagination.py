@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from passinfo_sdk.exceptions import PassInfoAPIError
+from passinfo_sdk.pagination import iter_pages
+
+
+def pages_of(total, page_size):
+    def fetch(page):
+        start = (page - 1) * page_size
+        return list(range(start, min(total, start + page_size)))
+    return fetch
+
+
+@pytest.mark.parametrize('window', [0, 1, 4])
+@pytest.mark.parametrize('total', [0, 7, 9, 10])
+def test_iter_pages_yields_every_item_in_order(window, total):
+    pages = list(iter_pages(pages_of(total, 3), page_size=3, window=window))
+    assert [item for page in pages for item in page] == list(range(total))
+    assert all(pages)
+
+
+def test_iter_pages_propagates_errors():
+    def fetch(page):
+        if page == 2:
+            raise PassInfoAPIError(status_code=500, message='boom')
+        return [page] * 2
+
+    with pytest.raises(PassInfoAPIError):
+        list(iter_pages(fetch, page_size=2, window=2))
+
+
+def test_iter_pages_fetches_ahead_in_parallel():
+    # Both threads of the pool must be busy at once for the barrier to open.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fetch(page):
+        if page <= 2:
+            barrier.wait()
+            return [page]
+        return []
+
+    assert list(iter_pages(fetch, page_size=1, window=2)) == [[1], [2]]
+
+
+def contacts_page(call):
+    page, limit = call['params']['page'], call['params']['limit']
+    numbers = range((page - 1) * limit, min(5, page * limit))
+    return {'contacts': [{'id': n, 'first_name': f'F{n}', 'phone_number': f'62200000{n}'} for n in numbers]}
+
+
+def test_iter_contacts_walks_every_page(api, fake_api):
+    fake_api.route('v1/contact/all_my_contacts', contacts_page)
+    contacts = list(api.iter_contacts(page_size=2, window=2))
+    assert [(c.contact_id, c.first_name, c.phone_number) for c in contacts] == [
+        (str(n), f'F{n}', f'62200000{n}') for n in range(5)]
+
+
+@pytest.mark.parametrize('response, status_code', [
+    ({'error': 'Unauthorized'}, 400),
+    (['not', 'a', 'dict'], 502),
+    (None, 502),
+    ({'contacts': 'nope'}, 502),
+])
+def test_iter_contacts_raises_on_bad_pages(api, fake_api, response, status_code):
+    fake_api.route('v1/contact/all_my_contacts', response)
+    with pytest.raises(PassInfoAPIError) as excinfo:
+        list(api.iter_contacts(window=0))
+    assert excinfo.value.status_code == status_code
+
+
+def test_get_contacts_list_still_swallows_errors(api, fake_api):
+    fake_api.route('v1/contact/all_my_contacts', {'error': 'Unauthorized'})
+    assert api.get_contacts_list() == []
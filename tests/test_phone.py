@@ -0,0 +1,96 @@
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.exceptions import PassInfoAPIError
+from passinfo_sdk.phone import PhoneNormalizer, normalize_phone_number
+
+GUINEA = PhoneNormalizer(default_country_code='224', national_digits=9)
+
+SAMPLES = [
+    '622 12 34 56', '0622123456', '224622123456', '+224 622-12-34-56', '00224 (622) 12.34.56',
+    '+33 6 12 34 56 78', '612345678', '62212345', '+0224622123456', '+22462212345a',
+    '', ' ', 'n/a', '+', '00', '622 123 456', '+١٢٣٤٥٦٧٨٩', '+1234567890123456',
+]
+
+
+@pytest.mark.parametrize('number, canonical', [
+    ('622 12 34 56', '+224622123456'),
+    ('0622123456', '+224622123456'),
+    ('224622123456', '+224622123456'),
+    ('00224 622-12-34-56', '+224622123456'),
+    ('+33 6 12 34 56 78', '+33612345678'),
+    ('62212345', None),
+    ('+0224622123456', None),
+    ('+١٢٣٤٥٦٧٨٩', None),
+    ('n/a', None),
+    (None, None),
+])
+def test_normalize(number, canonical):
+    assert GUINEA.normalize(number) == canonical
+
+
+def test_national_numbers_need_a_country_code():
+    assert normalize_phone_number('622123456') is None
+    assert normalize_phone_number('+224622123456') == '+224622123456'
+    assert normalize_phone_number('622123456', '+224') == '+224622123456'
+
+
+def test_country_code_must_be_numeric():
+    with pytest.raises(ValueError):
+        PhoneNormalizer(default_country_code='GN')
+
+
+@pytest.mark.parametrize('normalizer', [
+    GUINEA,
+    PhoneNormalizer(default_country_code='224'),
+    PhoneNormalizer(default_country_code='224', trunk_prefix=''),
+    PhoneNormalizer(),
+])
+def test_batch_path_matches_normalize(normalizer):
+    samples = SAMPLES + [12345678, None]
+    assert normalizer.normalize_many(samples) == [normalizer.normalize(number) for number in samples]
+
+
+def test_numbers_with_newlines_fall_back_to_one_by_one():
+    assert GUINEA.normalize_many(['622123456', '622\n123456']) == ['+224622123456', '+224622123456']
+
+
+def test_dedupe_keeps_first_seen_order():
+    result = GUINEA.dedupe(['622000002', '622 000 001', 'n/a', '+224622000002', '622000001'])
+    assert result.numbers == ['+224622000002', '+224622000001']
+    assert result.invalid == ['n/a']
+    assert (result.duplicates, result.total) == (2, 5)
+
+
+def test_iter_unique_spans_batches():
+    numbers = ['622000001', '622000002', '622000001', 'x', '622000003', '622000002']
+    assert list(GUINEA.iter_unique(numbers, batch_size=2)) == [
+        '+224622000001', '+224622000002', '+224622000003']
+
+
+@pytest.fixture
+def normalizing_client(fake_api):
+    client = PassInfoSDKClient('test-key', 'test-client', phone_normalizer=GUINEA)
+    client._make_request = fake_api
+    yield client
+    client.close()
+
+
+def test_client_normalizes_single_sends(normalizing_client, fake_api):
+    fake_api.route('v1/message/single_message', {'status': 'success'})
+    normalizing_client.send_message('Hi', '622 12 34 56', 'MyApp')
+    assert fake_api.calls[0]['data']['contact'] == '+224622123456'
+    with pytest.raises(PassInfoAPIError):
+        normalizing_client.send_message('Hi', 'n/a', 'MyApp')
+    assert len(fake_api.calls) == 1
+
+
+def test_client_dedupes_bulk_sends(normalizing_client, fake_api):
+    fake_api.route('v1/message/send_bulk_contacts_messages', {'successful_sends': 2})
+    result = normalizing_client.send_message_bulk_chunked(
+        'Hi', 'MyApp', ['622000001', '+224 622 000 001', 'n/a', '622000002'])
+    assert fake_api.calls[0]['data']['contacts'] == ['+224622000001', '+224622000002']
+    assert result.normalization.invalid == ['n/a']
+    assert result.normalization.duplicates == 1
+    with pytest.raises(PassInfoAPIError):
+        normalizing_client.send_message_bulk('Hi', 'MyApp', ['n/a'])
@@ -0,0 +1,89 @@
+import pytest
+
+from passinfo_sdk.exceptions import PassInfoAPIError
+from passinfo_sdk.poller import BATCH, MESSAGE, StatusPoller
+
+
+@pytest.fixture
+def poller(client):
+    return StatusPoller(client, max_workers=4, initial_interval=0.01, max_interval=0.02, jitter=0)
+
+
+def statuses(fake_api, **sequences):
+    # Scripts the status endpoints: each ID answers its statuses in order,
+    # then keeps answering the last one.
+    sequences = {id: list(values) for id, values in sequences.items()}
+
+    def answer(call):
+        values = sequences[call['endpoint'].rsplit('/', 1)[1]]
+        value = values.pop(0) if len(values) > 1 else values[0]
+        if isinstance(value, BaseException):
+            raise value
+        return value if isinstance(value, (dict, list)) or value is None else {'status': value}
+
+    fake_api.route('v1/message/get_single_status/', answer)
+    fake_api.route('v1/message/get_bulk_status/', answer)
+
+
+def test_reports_each_change_until_terminal(poller, fake_api):
+    statuses(fake_api, m1=['pending', 'pending', 'SENT', 'delivered'], b1=['processing', 'completed'])
+    events = list(poller.poll(message_ids=['m1'], batch_ids=['b1'], timeout=5))
+    assert [(e.id, e.previous_status, e.status) for e in events if e.kind == MESSAGE] == [
+        ('m1', None, 'pending'), ('m1', 'pending', 'sent'), ('m1', 'sent', 'delivered')]
+    assert [(e.status, e.terminal) for e in events if e.kind == BATCH] == [
+        ('processing', False), ('completed', True)]
+    assert poller.pending == {}
+    assert len(fake_api.endpoints('v1/message/get_single_status/m1')) == 4
+
+
+def test_duplicate_ids_are_checked_once(poller, fake_api):
+    statuses(fake_api, m1=['delivered'])
+    assert len(list(poller.poll(message_ids=['m1', 'm1'], timeout=5))) == 1
+    assert len(fake_api.calls) == 1
+
+
+@pytest.mark.parametrize('response', [
+    {'error': 'Message not found'},
+    PassInfoAPIError(status_code=404, message='Not found'),
+])
+def test_unknown_ids_are_given_up_at_once(poller, fake_api, response):
+    statuses(fake_api, m1=[response])
+    events = list(poller.poll(message_ids=['m1'], timeout=5))
+    assert len(events) == 1
+    assert events[0].terminal and events[0].error is not None
+    assert poller.pending == {}
+
+
+@pytest.mark.parametrize('response', [
+    {'error': 'Unauthorized'},
+    ['not', 'a', 'dict'],
+    None,
+    {'status': None},
+    PassInfoAPIError(status_code=503, message='Service unavailable'),
+])
+def test_ids_are_given_up_after_max_failures(client, fake_api, response):
+    poller = StatusPoller(client, initial_interval=0.01, max_interval=0.01, jitter=0, max_failures=3)
+    statuses(fake_api, m1=[response])
+    events = list(poller.poll(message_ids=['m1'], timeout=5))
+    assert [event.terminal for event in events] == [False, False, True]
+    assert all(isinstance(event.error, PassInfoAPIError) for event in events)
+    assert len(fake_api.calls) == 3
+
+
+def test_a_success_resets_the_failure_count(client, fake_api):
+    poller = StatusPoller(client, initial_interval=0.01, max_interval=0.01, jitter=0, max_failures=2)
+    statuses(fake_api, m1=[{'error': 'busy'}, 'pending', {'error': 'busy'}, 'delivered'])
+    events = list(poller.poll(message_ids=['m1'], timeout=5))
+    assert events[-1].status == 'delivered' and events[-1].terminal
+
+
+def test_ids_left_pending_by_a_timeout_are_resumed(poller, fake_api):
+    state = {'status': 'pending'}
+    fake_api.route('v1/message/get_single_status/', lambda call: dict(state))
+    first = list(poller.poll(message_ids=['m1'], timeout=0.1))
+    assert [event.status for event in first] == ['pending']
+    assert poller.pending == {(MESSAGE, 'm1'): 'pending'}
+    state['status'] = 'delivered'
+    second = list(poller.poll(message_ids=['m1'], timeout=5))
+    assert [(event.previous_status, event.status) for event in second] == [('pending', 'delivered')]
+    assert poller.pending == {}
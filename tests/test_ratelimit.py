@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.exceptions import RateLimitError
+from passinfo_sdk.ratelimit import ACCOUNT, SEND, STATUS, FileTokenBucket, RateLimiter, TokenBucket, endpoint_family
+
+
+@pytest.mark.parametrize('endpoint, family', [
+    ('v1/message/single_message', SEND),
+    ('v1/message/send_message_to_group/g1', SEND),
+    ('v1/message/get_single_status/m1', STATUS),
+    ('v1/message/get_bulk_status/b1', STATUS),
+    ('v1/user/get_solde', ACCOUNT),
+    ('v1/contact/all_my_contacts', ACCOUNT),
+])
+def test_endpoint_family(endpoint, family):
+    assert endpoint_family(endpoint) == family
+
+
+def test_bucket_allows_a_burst_then_paces_requests():
+    bucket = TokenBucket(rate=20, capacity=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    wait = bucket.reserve()
+    assert 0 < wait <= 0.05
+    started = time.monotonic()
+    assert bucket.acquire()
+    assert time.monotonic() - started >= 0.03
+
+
+def test_bucket_acquire_gives_up_when_not_blocking_or_past_the_timeout():
+    bucket = TokenBucket(rate=1, capacity=1)
+    assert bucket.acquire()
+    assert not bucket.acquire(blocking=False)
+    assert not bucket.acquire(timeout=0.1)
+
+
+def test_rejects_a_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_families_have_separate_budgets():
+    limiter = RateLimiter(limits={SEND: 1, STATUS: 1, ACCOUNT: None}, blocking=False)
+    limiter.acquire('v1/message/single_message')
+    limiter.acquire('v1/message/get_single_status/m1')
+    for _ in range(10):
+        limiter.acquire('v1/user/get_solde')
+    with pytest.raises(RateLimitError) as excinfo:
+        limiter.acquire('v1/message/single_message')
+    assert excinfo.value.retry_after == pytest.approx(1.0)
+
+
+def test_file_buckets_share_one_budget(tmp_path):
+    first = FileTokenBucket(tmp_path / 'send.bucket', rate=1, capacity=2)
+    second = FileTokenBucket(tmp_path / 'send.bucket', rate=1, capacity=2)
+    try:
+        assert first.reserve() == 0
+        assert second.reserve() == 0
+        assert first.reserve() > 0
+        assert second.reserve() > 0
+    finally:
+        first.close()
+        second.close()
+
+
+def test_shared_dir_creates_one_file_per_family(tmp_path):
+    RateLimiter(shared_dir=tmp_path / 'limits').acquire('v1/message/single_message')
+    assert (tmp_path / 'limits' / 'send.bucket').exists()
+
+
+def test_client_refuses_without_contacting_the_api(server):
+    limiter = RateLimiter(limits={SEND: 1}, blocking=False)
+    with PassInfoSDKClient('test-key', 'test-client', base_url=server.url, rate_limiter=limiter) as client:
+        client.send_message('Hello', '622000001', 'MyApp')
+        with pytest.raises(RateLimitError):
+            client.send_message('Hello', '622000002', 'MyApp')
+    assert len(server.requests) == 1
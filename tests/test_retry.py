@@ -0,0 +1,100 @@
+import time
+from email.utils import formatdate
+
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.exceptions import CircuitOpenError, PassInfoAPIError
+from passinfo_sdk.retry import CircuitBreaker, RetryPolicy, parse_retry_after
+
+
+def test_sends_are_never_retried_after_a_server_error():
+    policy = RetryPolicy()
+    assert policy.should_retry(0, 'GET', 'v1/message/get_single_status/m1', status_code=503)
+    assert not policy.should_retry(0, 'POST', 'v1/message/single_message', status_code=503)
+    assert policy.should_retry(0, 'POST', 'v1/message/single_message', status_code=429)
+    assert policy.should_retry(0, 'POST', 'v1/groupe/add_contact_to_group', status_code=502)
+    assert not policy.should_retry(0, 'GET', 'v1/user/renew_api_key', status_code=503)
+    assert not policy.should_retry(0, 'GET', 'v1/message/get_single_status/m1', status_code=404)
+    assert not policy.should_retry(3, 'GET', 'v1/message/get_single_status/m1', status_code=503)
+
+
+def test_backoff_is_capped_and_honours_retry_after():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False, max_retry_after=10)
+    assert [policy.backoff(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+    assert policy.backoff(0, retry_after=7) == 7
+    assert policy.backoff(0, retry_after=11) is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('2.5') == 2.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert 8 <= parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+
+def test_breaker_opens_then_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    time.sleep(0.06)
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+@pytest.fixture
+def retrying_client(server):
+    client = PassInfoSDKClient('test-key', 'test-client', base_url=server.url,
+                               retry_policy=RetryPolicy(backoff_factor=0))
+    yield client
+    client.close()
+
+
+def test_reads_are_retried_until_they_succeed(server, retrying_client):
+    server.reply(503, {'error': 'busy'}).reply(502, {'error': 'busy'}).reply(200, {'status': 'delivered'})
+    assert retrying_client.get_message_status('m1') == {'status': 'delivered'}
+    assert len(server.requests) == 3
+
+
+def test_sends_are_not_repeated_after_a_server_error(server, retrying_client):
+    server.reply(503, {'error': 'busy'})
+    with pytest.raises(PassInfoAPIError) as excinfo:
+        retrying_client.send_message('Hello', '622000001', 'MyApp')
+    assert excinfo.value.status_code == 503
+    assert len(server.requests) == 1
+
+
+def test_rate_limited_sends_wait_for_retry_after(server, retrying_client):
+    server.reply(429, {'error': 'slow down'}, {'Retry-After': '0.1'})
+    started = time.monotonic()
+    assert retrying_client.send_message('Hello', '622000001', 'MyApp') == {'success': True}
+    assert time.monotonic() - started >= 0.1
+    assert len(server.requests) == 2
+
+
+def test_open_breaker_fails_fast_without_contacting_the_api(server):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    server.reply(500, {'error': 'down'})
+    with PassInfoSDKClient('test-key', 'test-client', base_url=server.url, circuit_breaker=breaker,
+                           retry_policy=RetryPolicy(max_retries=0)) as client:
+        with pytest.raises(PassInfoAPIError):
+            client.get_message_status('m1')
+        with pytest.raises(CircuitOpenError):
+            client.get_message_status('m1')
+    assert len(server.requests) == 1
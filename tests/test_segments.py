@@ -0,0 +1,96 @@
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.exceptions import BalanceUnknownError, InsufficientCreditsError
+from passinfo_sdk.segments import (
+    GSM_7, UCS_2, count_segments, estimate_cost, estimate_messages, message_cost, message_encoding,
+)
+
+
+@pytest.mark.parametrize('text, encoding, units, segments', [
+    ('', GSM_7, 0, 1),
+    ('Hello!', GSM_7, 6, 1),
+    ('a' * 160, GSM_7, 160, 1),
+    ('a' * 161, GSM_7, 161, 2),
+    ('a' * 306, GSM_7, 306, 2),
+    ('a' * 307, GSM_7, 307, 3),
+    ('€' * 80, GSM_7, 160, 1),
+    ('{' + 'a' * 159, GSM_7, 161, 2),
+    ('Bonne année à tous', GSM_7, 18, 1),
+    ('ç' + 'a' * 69, UCS_2, 70, 1),
+    ('ç' + 'a' * 70, UCS_2, 71, 2),
+    ('🎉' * 35, UCS_2, 70, 1),
+    ('🎉' * 36, UCS_2, 72, 2),
+])
+def test_message_cost(text, encoding, units, segments):
+    cost = message_cost(text)
+    assert (cost.encoding, cost.units, cost.segments) == (encoding, units, segments)
+    assert message_encoding(text) == encoding
+    assert count_segments(text) == segments
+
+
+def test_estimate_cost_scales_with_recipients():
+    estimate = estimate_cost('a' * 200, recipients=1000, credits_per_segment=0.5)
+    assert (estimate.messages, estimate.segments, estimate.credits) == (1000, 2000, 1000)
+    assert estimate.max_segments == 2
+    assert estimate.encodings == {GSM_7: 1000}
+
+
+def test_estimate_messages_sums_personalized_texts():
+    texts = (f'Hello {name}' for name in ['Jane', 'Zoé', 'Jane', 'Ayşe'] * 3)
+    estimate = estimate_messages(texts)
+    assert (estimate.messages, estimate.segments) == (12, 12)
+    assert estimate.encodings == {GSM_7: 9, UCS_2: 3}
+
+
+def test_estimate_messages_of_nothing_is_free():
+    estimate = estimate_messages([])
+    assert (estimate.messages, estimate.credits) == (0, 0)
+
+
+@pytest.fixture
+def checked_client(fake_api):
+    def make(mode, balance):
+        client = PassInfoSDKClient('test-key', 'test-client', balance_check=mode)
+        client._make_request = fake_api
+        fake_api.route('v1/user/get_solde', {'solde': balance})
+        fake_api.route('v1/message/', {'status': 'success'})
+        clients.append(client)
+        return client
+
+    clients = []
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_refuse_rejects_an_unaffordable_send_as_a_whole(checked_client, fake_api):
+    client = checked_client('refuse', 2)
+    with pytest.raises(InsufficientCreditsError) as excinfo:
+        client.send_message_bulk('Hi', 'MyApp', ['1', '2', '3'])
+    assert (excinfo.value.required, excinfo.value.available, excinfo.value.status_code) == (3, 2, 402)
+    assert not fake_api.endpoints('v1/message/')
+    client.send_message_bulk('Hi', 'MyApp', ['1', '2'])
+    assert len(fake_api.endpoints('v1/message/')) == 1
+
+
+def test_truncate_sends_what_the_balance_covers(checked_client, fake_api):
+    client = checked_client('truncate', 5)
+    result = client.send_message_bulk_chunked('a' * 200, 'MyApp', ['1', '2', '3', '4'])
+    assert fake_api.calls[-1]['data']['contacts'] == ['1', '2']
+    assert result.truncated is True
+    assert (result.estimate.messages, result.estimate.credits) == (2, 4)
+
+
+def test_truncate_refuses_when_not_even_one_message_fits(checked_client):
+    client = checked_client('truncate', 1)
+    with pytest.raises(InsufficientCreditsError):
+        client.send_message_bulk('a' * 200, 'MyApp', ['1'])
+
+
+def test_unknown_balance_blocks_checked_sends(checked_client, fake_api):
+    client = checked_client('refuse', None)
+    fake_api.route('v1/user/get_solde', {'error': 'Unauthorized'})
+    with pytest.raises(BalanceUnknownError):
+        client.send_message('Hi', '1', 'MyApp')
+    assert client.get_sms_count() == 0
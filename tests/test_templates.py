@@ -0,0 +1,99 @@
+import pytest
+
+from passinfo_sdk.client import PassInfoSDKClient
+from passinfo_sdk.exceptions import InsufficientCreditsError, PassInfoAPIError
+from passinfo_sdk.models import Contact
+from passinfo_sdk.phone import PhoneNormalizer
+from passinfo_sdk.templates import MessageTemplate, group_messages
+
+SINGLE = 'v1/message/single_message'
+BULK = 'v1/message/send_bulk_contacts_messages'
+
+RECIPIENTS = [
+    {'phone_number': '1', 'first_name': 'Awa'},
+    {'phone_number': '2', 'first_name': 'Jane'},
+    {'phone_number': '3', 'first_name': 'Awa'},
+    Contact('Awa', 'Diallo', '4'),
+]
+
+
+def test_template_fields_and_rendering():
+    template = MessageTemplate("Bonjour {first_name}, -{discount:.0f}% sur {order[id]} !", defaults={'discount': 20})
+    assert template.fields == ('first_name', 'discount', 'order')
+    assert template.render({'first_name': 'Awa', 'order': {'id': 'A1'}}) == 'Bonjour Awa, -20% sur A1 !'
+    assert template.render(Contact('Jane', 'Doe', '1'), {'discount': 5.4, 'order': {'id': 'B2'}}) == \
+        'Bonjour Jane, -5% sur B2 !'
+    with pytest.raises(KeyError):
+        template.render({'first_name': 'Awa'})
+
+
+@pytest.mark.parametrize('text', ['Hello {}', 'Hello {0}', 'Hello {name'])
+def test_malformed_templates_are_refused(text):
+    with pytest.raises(ValueError):
+        MessageTemplate(text)
+
+
+def test_render_many_handles_unhashable_values():
+    template = MessageTemplate('{items}')
+    assert template.render_many([{'items': [1]}, ({}, {'items': [1]}), {'items': 'x'}]) == ['[1]', '[1]', 'x']
+
+
+def test_recipients_are_grouped_by_message():
+    groups = group_messages('Bonjour {first_name}', RECIPIENTS + [{'first_name': 'Zoé'}, {'phone_number': '5'}])
+    assert groups == {'Bonjour Awa': ['1', '3', '4'], 'Bonjour Jane': ['2']}
+
+
+def test_grouping_normalizes_and_drops_repeats():
+    normalizer = PhoneNormalizer(default_country_code='224')
+    groups = group_messages('Hi', ['622000001', '+224 622 000 001', 'n/a', '622000002'], normalizer)
+    assert groups == {'Hi': ['+224622000001', '+224622000002']}
+
+
+def test_send_uses_bulk_for_shared_texts_and_single_for_others(client, fake_api):
+    fake_api.route(SINGLE, {'status': 'success'})
+    fake_api.route(BULK, {'successful_sends': 2})
+    result = client.send_message_templated('Bonjour {first_name}', 'MyApp', RECIPIENTS, chunk_size=2)
+    assert (result.recipients, result.texts, result.requests, result.sent_contacts) == (4, 2, 3, 4)
+    assert result.ok
+    bulk_calls = [call['data'] for call in fake_api.calls if call['endpoint'] == BULK]
+    assert sorted(data['contacts'] for data in bulk_calls) == [['1', '3'], ['4']]
+    assert [call['data']['message'] for call in fake_api.calls if call['endpoint'] == SINGLE] == ['Bonjour Jane']
+
+
+@pytest.mark.parametrize('response', [
+    {'error': 'Unauthorized'}, {'success': False}, None, PassInfoAPIError(status_code=503, message='down'),
+])
+def test_rejected_requests_are_failures(client, fake_api, response):
+    fake_api.route('v1/message/', response)
+    result = client.send_message_templated('Bonjour {first_name}', 'MyApp', RECIPIENTS)
+    assert result.sent_contacts == 0
+    assert not result.ok
+    assert sorted(phones for _, phones, _ in result.failures) == [['1', '3', '4'], ['2']]
+    assert all(isinstance(error, PassInfoAPIError) for _, _, error in result.failures)
+
+
+def test_balance_is_checked_once_for_the_whole_send(fake_api):
+    client = PassInfoSDKClient('test-key', 'test-client', balance_check='refuse')
+    client._make_request = fake_api
+    fake_api.route('v1/user/get_solde', {'solde': 4})
+    fake_api.route('v1/message/', {'status': 'success'})
+    try:
+        result = client.send_message_templated('Bonjour {first_name}', 'MyApp', RECIPIENTS)
+        assert result.estimate.credits == 4
+        assert len(fake_api.endpoints('v1/user/get_solde')) == 1
+        fake_api.calls.clear()
+        with pytest.raises(InsufficientCreditsError):
+            client.send_message_templated('Bonjour {first_name}', 'MyApp',
+                                          RECIPIENTS + [{'phone_number': '5', 'first_name': 'Ann'}])
+        assert fake_api.endpoints() == ['v1/user/get_solde']
+    finally:
+        client.close()
+
+
+def test_invalid_recipients_are_reported(client, fake_api):
+    fake_api.route('v1/message/', {'status': 'success'})
+    result = client.send_message_templated('Hi {first_name}', 'MyApp', [{'phone_number': '1'}, {'first_name': 'A'}])
+    assert [reason for _, reason in result.invalid] == ["missing variable 'first_name'", 'no phone number']
+    assert result.requests == 0
+    with pytest.raises(PassInfoAPIError):
+        client.send_message_templated('Hi', None, [])
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from passinfo_sdk import bulk
+from passinfo_sdk.utils import detect_file_format, iter_records
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+@pytest.mark.parametrize('name, format', [
+    ('a.csv', 'csv'), ('a.TSV', 'csv'), ('a.ndjson', 'ndjson'), ('a.jsonl', 'ndjson'), ('a.json', 'json'),
+])
+def test_detect_file_format(name, format):
+    assert detect_file_format(name) == format
+
+
+def test_detect_file_format_refuses_unknown_extensions():
+    with pytest.raises(ValueError):
+        detect_file_format('recipients.xlsx')
+
+
+def test_csv_with_header_yields_dicts(tmp_path):
+    path = write(tmp_path, 'r.csv', 'name,phone_number\nAda,622000001\nBob,622000002\n')
+    assert list(iter_records(path)) == [
+        {'name': 'Ada', 'phone_number': '622000001'},
+        {'name': 'Bob', 'phone_number': '622000002'},
+    ]
+
+
+def test_csv_without_header_yields_values(tmp_path):
+    path = write(tmp_path, 'r.csv', '622000001\n+224 622 000 002\n')
+    assert list(iter_records(path, column='phone_number')) == ['622000001', '+224 622 000 002']
+
+
+def test_csv_header_without_the_column_raises(tmp_path):
+    path = write(tmp_path, 'r.csv', 'name,mobile\nAda,622000001\n')
+    with pytest.raises(ValueError):
+        list(iter_records(path, column='phone_number'))
+
+
+def test_ndjson_skips_blank_lines(tmp_path):
+    path = write(tmp_path, 'r.ndjson', '{"phone_number": "622000001"}\n\n"622000002"\n')
+    assert list(iter_records(path)) == [{'phone_number': '622000001'}, '622000002']
+
+
+def test_json_must_hold_an_array(tmp_path):
+    path = write(tmp_path, 'r.json', json.dumps(['622000001', {'phone_number': '622000002'}]))
+    assert list(iter_records(path)) == ['622000001', {'phone_number': '622000002'}]
+    path = write(tmp_path, 'o.json', json.dumps({'phone_number': '622000001'}))
+    with pytest.raises(ValueError):
+        list(iter_records(path))
+
+
+def test_iter_recipients_accepts_mixed_records():
+    class Person:
+        phone_number = '622000004'
+
+    records = ['622000001', {'phone_number': ' 622000002 '}, ('622000003', 'Ada'), Person(), {'name': 'x'}, '  ']
+    assert list(bulk.iter_recipients(records)) == ['622000001', '622000002', '622000003', '622000004']
+
+
+def test_stream_reads_recipients_from_a_file(tmp_path, client, fake_api):
+    path = write(tmp_path, 'r.csv', 'phone_number,name\n622000001,Ada\n622000002,Bob\n622000003,Eve\n')
+    fake_api.route('v1/message/send_bulk', {'success': True})
+    batches = list(client.stream_message_bulk('Hello', 'MyApp', path, batch_size=2, max_workers=1))
+    assert [batch.size for batch in sorted(batches, key=lambda batch: batch.index)] == [2, 1]
+    assert all(batch.ok for batch in batches)
+    assert sorted(c for call in fake_api.calls for c in call['data']['contacts']) == [
+        '622000001', '622000002', '622000003']
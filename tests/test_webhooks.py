@@ -0,0 +1,109 @@
+import asyncio
+import json
+import queue
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from passinfo_sdk.exceptions import WebhookError
+from passinfo_sdk.webhooks import (
+    AsyncWebhookReceiver, DeliveryReceipt, WebhookReceiver, parse_receipts, post_receipts, sign_body,
+)
+
+RECEIPT = {'message_id': 'm1', 'status': 'DELIVERED', 'contact': '622000001'}
+
+
+def raw_post(port, head):
+    # Sends a request without a body, which requests cannot do without a Content-Length.
+    with socket.create_connection(('127.0.0.1', port), timeout=5) as sock:
+        sock.sendall(head)
+        return sock.recv(4096).split(b'\r\n', 1)[0]
+
+
+@pytest.mark.parametrize('payload', [RECEIPT, [RECEIPT], {'receipts': [RECEIPT]}])
+def test_parse_receipts_accepts_every_layout(payload):
+    receipts = parse_receipts(json.dumps(payload).encode())
+    assert [(r.message_id, r.status, r.contact) for r in receipts] == [('m1', 'delivered', '622000001')]
+
+
+def test_parse_receipts_checks_the_signature():
+    body = json.dumps(RECEIPT).encode()
+    assert parse_receipts(body, 's3cret', sign_body(body, 's3cret'))
+    for signature in (None, 'bad', sign_body(body, 'other')):
+        with pytest.raises(WebhookError) as excinfo:
+            parse_receipts(body, 's3cret', signature)
+        assert excinfo.value.status_code == 401
+
+
+@pytest.mark.parametrize('body', [
+    b'not json', b'"a string"', b'[1]', b'{"message_id": "m1"}', b'{"status": "delivered"}',
+])
+def test_parse_receipts_rejects_invalid_bodies(body):
+    with pytest.raises(WebhookError) as excinfo:
+        parse_receipts(body)
+    assert excinfo.value.status_code == 400
+
+
+def test_receiver_passes_receipts_to_handlers_and_queue():
+    seen, received = [], queue.Queue()
+    with WebhookReceiver(handler=seen.append, queue=received, secret='s3cret') as receiver:
+        response = post_receipts(receiver.url, [RECEIPT, DeliveryReceipt('m2', None, 'failed')], secret='s3cret')
+        assert response.status_code == 200
+        assert post_receipts(receiver.url, [RECEIPT], secret='wrong').status_code == 401
+        assert (receiver.received, receiver.rejected) == (2, 1)
+    assert [r.message_id for r in seen] == ['m1', 'm2']
+    assert received.qsize() == 2
+
+
+def test_receiver_answers_500_when_a_handler_fails():
+    def handler(receipt):
+        raise RuntimeError('database down')
+
+    with WebhookReceiver(handler=handler) as receiver:
+        assert post_receipts(receiver.url, [RECEIPT]).status_code == 500
+        assert receiver.received == 0
+
+
+def test_receiver_rejects_bad_requests():
+    with WebhookReceiver(max_body_size=100) as receiver:
+        assert requests.post(receiver.url + '/other', data=b'{}').status_code == 404
+        assert requests.get(receiver.url).status_code == 405
+        assert requests.post(receiver.url, data=b'x' * 101).status_code == 413
+        assert raw_post(receiver.port, b'POST /webhooks/passinfo HTTP/1.1\r\nHost: x\r\n\r\n').endswith(b' 411 Length Required')
+
+
+def test_receiver_counts_concurrent_callbacks():
+    with WebhookReceiver(handler=lambda receipt: None) as receiver:
+        with ThreadPoolExecutor(16) as executor:
+            codes = list(executor.map(lambda _: post_receipts(receiver.url, [RECEIPT, RECEIPT]).status_code, range(100)))
+        assert codes == [200] * 100
+        assert receiver.received == 200
+
+
+def test_async_receiver_supports_coroutine_handlers_and_keep_alive():
+    async def main():
+        seen = []
+
+        async def handler(receipt):
+            seen.append(receipt.message_id)
+
+        loop = asyncio.get_running_loop()
+        async with AsyncWebhookReceiver(handler=handler) as receiver:
+            with requests.Session() as session:
+                codes = [
+                    (await loop.run_in_executor(None, post_receipts, receiver.url, [RECEIPT], None,
+                                                'X-PassInfo-Signature', session)).status_code
+                    for _ in range(3)
+                ]
+            missing_length = await loop.run_in_executor(
+                None, raw_post, receiver.port, b'POST /webhooks/passinfo HTTP/1.1\r\nHost: x\r\n\r\n')
+            invalid = await loop.run_in_executor(None, lambda: requests.post(receiver.url, data=b'nope'))
+            return seen, codes, missing_length, invalid.status_code, receiver.received, receiver.rejected
+
+    seen, codes, missing_length, invalid, received, rejected = asyncio.run(main())
+    assert seen == ['m1'] * 3
+    assert codes == [200] * 3
+    assert missing_length.endswith(b' 411 Length Required')
+    assert (invalid, received, rejected) == (400, 3, 1)